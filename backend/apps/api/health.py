@@ -0,0 +1,202 @@
+"""
+Background dependency probes for the health endpoints.
+
+Load balancers and compose poll the health endpoints every few seconds from
+several places. Instead of touching the database on every poll, a daemon
+thread in each worker probes the dependencies every HEALTH_PROBE_INTERVAL
+seconds and the views serve the last snapshot from memory.
+
+Set HEALTH_PROBE_INTERVAL to 0 to probe inline on every request instead
+(no background thread), which is what the tests use.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from asgiref.sync import sync_to_async
+
+logger = logging.getLogger(__name__)
+
+
+def _elapsed_ms(start):
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+def check_database():
+    """Run SELECT 1 and report the round-trip latency."""
+    connection = connections[DEFAULT_DB_ALIAS]
+    engine = connection.settings_dict["ENGINE"]
+    try:
+        # Drop a connection the server has closed so we don't report a stale error
+        connection.close_if_unusable_or_obsolete()
+        start = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+        return {"ok": True, "connected": True, "engine": engine, "latency_ms": _elapsed_ms(start)}
+    except Exception as e:
+        return {"ok": False, "connected": False, "engine": engine, "error": str(e)}
+    finally:
+        # Give a pooled connection back, or the prober thread holds a slot
+        # of the worker's pool until its next probe
+        if connection.settings_dict["OPTIONS"].get("pool"):
+            connection.close()
+
+
+def check_cache():
+    """Write and read back a key in the default cache."""
+    key = f"health-probe:{os.getpid()}"
+    try:
+        start = time.perf_counter()
+        cache.set(key, "ok", 30)
+        ok = cache.get(key) == "ok"
+        return {
+            "ok": ok,
+            "backend": settings.CACHES["default"]["BACKEND"],
+            "latency_ms": _elapsed_ms(start),
+        }
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+
+def check_smtp():
+    """Open a TCP connection to the SMTP server (no SMTP conversation)."""
+    if settings.EMAIL_BACKEND != "django.core.mail.backends.smtp.EmailBackend":
+        return {"ok": True, "skipped": True, "backend": settings.EMAIL_BACKEND}
+    try:
+        start = time.perf_counter()
+        with socket.create_connection(
+            (settings.EMAIL_HOST, settings.EMAIL_PORT),
+            timeout=getattr(settings, "EMAIL_TIMEOUT", None) or 5,
+        ):
+            pass
+        return {"ok": True, "host": settings.EMAIL_HOST, "latency_ms": _elapsed_ms(start)}
+    except OSError as e:
+        return {"ok": False, "host": settings.EMAIL_HOST, "error": str(e)}
+
+
+def check_migrations():
+    """Report whether every migration known to this code is applied."""
+    from django.db.migrations.executor import MigrationExecutor
+
+    try:
+        executor = MigrationExecutor(connections[DEFAULT_DB_ALIAS])
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        return {"ok": not plan, "pending": len(plan)}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+
+def connection_pool_stats():
+    """
+    Describe how the default database connection is pooled.
+
+    Reports the pool's own statistics when the backend has a native pool
+    (psycopg 3 with the "pool" option, or the apps.core.dbpool backends),
+    otherwise the persistent-connection setting that governs reuse.
+    """
+    connection = connections[DEFAULT_DB_ALIAS]
+    stats = connection.pool_stats() if hasattr(connection, "pool_stats") else None
+    if stats is not None:
+        return stats
+    pool = getattr(connection, "pool", None)
+    if pool is not None and hasattr(pool, "get_stats"):
+        return {"type": type(pool).__name__, **pool.get_stats()}
+    return {
+        "type": "persistent" if connection.settings_dict.get("CONN_MAX_AGE") else "none",
+        "conn_max_age": connection.settings_dict.get("CONN_MAX_AGE"),
+    }
+
+
+CHECKS = {
+    "database": check_database,
+    "cache": check_cache,
+    "smtp": check_smtp,
+    "migrations": check_migrations,
+}
+
+
+class HealthProber:
+    """
+    Probe dependencies in a background thread and keep the latest results.
+
+    The thread starts on first use rather than at import time, so it is
+    created inside each gunicorn worker after the fork.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._thread = None
+        self._pid = None
+
+    @property
+    def interval(self):
+        return getattr(settings, "HEALTH_PROBE_INTERVAL", 10)
+
+    def probe(self):
+        """Run every check once and return the results."""
+        critical = getattr(settings, "HEALTH_CRITICAL_CHECKS", ["database", "migrations"])
+        checks = {name: check() for name, check in CHECKS.items()}
+        return {
+            "ready": all(checks[name]["ok"] for name in critical if name in checks),
+            "checks": checks,
+            "pool": connection_pool_stats(),
+            "checked_at": time.time(),
+        }
+
+    def snapshot(self):
+        """Return the latest results, probing inline if there are none yet."""
+        if self.interval <= 0:
+            return self.probe()
+
+        self._ensure_thread()
+        with self._lock:
+            snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.probe()
+            with self._lock:
+                self._snapshot = snapshot
+        return snapshot
+
+    async def asnapshot(self):
+        """snapshot() for async views: a probe, when one is needed, runs in a thread."""
+        thread = self._thread
+        if self.interval > 0 and self._pid == os.getpid() and thread and thread.is_alive():
+            with self._lock:
+                snapshot = self._snapshot
+            if snapshot is not None:
+                return snapshot
+        return await sync_to_async(self.snapshot)()
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._snapshot = None
+            self._thread = threading.Thread(target=self._run, name="health-prober", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(max(self.interval, 1))
+            try:
+                snapshot = self.probe()
+            except Exception:
+                logger.exception("Health probe failed")
+                continue
+            with self._lock:
+                self._snapshot = snapshot
+
+
+prober = HealthProber()
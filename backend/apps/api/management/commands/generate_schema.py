@@ -0,0 +1,25 @@
+"""
+Management command to pre-generate the cached OpenAPI schema.
+Usage: python manage.py generate_schema
+
+Run at deploy, after collectstatic, so no request pays for generating it.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.api.schema import code_version, prune_schemas, write_schemas
+
+
+class Command(BaseCommand):
+    help = "Generate the OpenAPI schema into SCHEMA_CACHE_DIR for the current code version"
+
+    def handle(self, *args, **options):
+        contents = write_schemas()
+        prune_schemas()
+        sizes = ", ".join(f"{fmt} {len(content)} bytes" for fmt, content in contents.items())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"OpenAPI schema {code_version()} written to {settings.SCHEMA_CACHE_DIR} ({sizes})"
+            )
+        )
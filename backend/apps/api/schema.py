@@ -0,0 +1,163 @@
+"""
+Cached OpenAPI schema.
+
+drf-spectacular introspects every view and serializer to build the schema,
+hundreds of milliseconds of CPU, and SpectacularAPIView does it on every
+request (the Swagger and ReDoc pages included). The schema only changes
+with the code, so it is generated once per code version, stored on disk in
+SCHEMA_CACHE_DIR (by `manage.py generate_schema` at deploy, or on first
+request) and kept in memory precompressed, served with an ETag. If the
+directory can't be written, each process keeps the schema it generated in
+memory only.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+
+import django
+from django.conf import settings
+
+import rest_framework
+
+import drf_spectacular
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SpectacularAPIView
+
+from apps.core.compression import Precompressed
+
+logger = logging.getLogger(__name__)
+
+RENDERERS = {"yaml": OpenApiYamlRenderer, "json": OpenApiJsonRenderer}
+
+# Source directories that can't affect the schema
+_SKIP_DIRS = {"__pycache__", "node_modules", "venv", "migrations"}
+
+
+@functools.lru_cache(maxsize=None)
+def code_version():
+    """
+    Identify the code the schema is generated from.
+
+    APP_VERSION (e.g. the deployed git commit) if set, otherwise a hash of
+    the backend's Python source, the schema settings and library versions.
+    """
+    if settings.APP_VERSION:
+        return settings.APP_VERSION
+
+    digest = hashlib.sha256()
+    libraries = (django.__version__, rest_framework.VERSION, drf_spectacular.__version__)
+    digest.update(json.dumps([libraries, settings.SPECTACULAR_SETTINGS], default=str).encode())
+    for root, dirs, files in os.walk(settings.BASE_DIR):
+        dirs[:] = sorted(d for d in dirs if d not in _SKIP_DIRS and not d.startswith("."))
+        for name in sorted(files):
+            if name.endswith(".py"):
+                path = os.path.join(root, name)
+                digest.update(os.path.relpath(path, settings.BASE_DIR).encode())
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def schema_path(schema_format, version=None):
+    return os.path.join(
+        settings.SCHEMA_CACHE_DIR, f"openapi-{version or code_version()}.{schema_format}"
+    )
+
+
+def generate_schemas():
+    """Generate the schema and return it rendered in every format, {format: bytes}."""
+    generator_class = spectacular_settings.DEFAULT_GENERATOR_CLASS
+    generator = generator_class(urlconf=spectacular_settings.SERVE_URLCONF)
+    data = generator.get_schema(request=None, public=spectacular_settings.SERVE_PUBLIC)
+    return {
+        schema_format: renderer_class().render(data, renderer_context={})
+        for schema_format, renderer_class in RENDERERS.items()
+    }
+
+
+def write_schemas(contents=None):
+    """Write every format to disk, generating them unless given, and return {format: bytes}."""
+    if contents is None:
+        contents = generate_schemas()
+
+    os.makedirs(settings.SCHEMA_CACHE_DIR, exist_ok=True)
+    for schema_format in RENDERERS:
+        path = schema_path(schema_format)
+        # A temporary file of its own, as other workers and threads may be
+        # writing the same schema; the dot keeps prune_schemas() off it
+        with tempfile.NamedTemporaryFile(
+            dir=settings.SCHEMA_CACHE_DIR, prefix=f".{os.path.basename(path)}.", delete=False
+        ) as f:
+            f.write(contents[schema_format])
+        os.chmod(f.name, 0o644)
+        os.replace(f.name, path)
+    return contents
+
+
+def prune_schemas():
+    """Remove schema files left by other code versions."""
+    current = {os.path.basename(schema_path(schema_format)) for schema_format in RENDERERS}
+    for name in os.listdir(settings.SCHEMA_CACHE_DIR):
+        if name.startswith("openapi-") and name not in current:
+            os.remove(os.path.join(settings.SCHEMA_CACHE_DIR, name))
+
+
+_schemas = {}
+_schemas_lock = threading.Lock()
+
+
+def get_schema(schema_format):
+    """Return the Precompressed schema in a format, from memory, disk or generated."""
+    version = code_version()
+    cached = _schemas.get(schema_format)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _schemas_lock:
+        cached = _schemas.get(schema_format)
+        if cached is None or cached[0] != version:
+            try:
+                with open(schema_path(schema_format), "rb") as f:
+                    content = f.read()
+            except OSError:
+                contents = generate_schemas()
+                try:
+                    write_schemas(contents)
+                except OSError:
+                    logger.exception(
+                        "Could not write the OpenAPI schema to %s", settings.SCHEMA_CACHE_DIR
+                    )
+                content = contents[schema_format]
+            cached = _schemas[schema_format] = (version, Precompressed(content))
+    return cached[1]
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """SpectacularAPIView serving the cached schema when the request allows it."""
+
+    def _get_schema_response(self, request):
+        renderer = request.accepted_renderer
+        cacheable = (
+            renderer.format in RENDERERS
+            and not (settings.USE_I18N and request.GET.get("lang"))
+            and not (self.api_version or request.version or self._get_version_parameter(request))
+            and self.urlconf is None
+            and self.custom_settings is None
+        )
+        if not cacheable:
+            return super()._get_schema_response(request)
+
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+        return get_schema(renderer.format).serve(
+            request,
+            content_type,
+            {"Content-Disposition": f'inline; filename="{self._get_filename(request, None)}"'},
+        )
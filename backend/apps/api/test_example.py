@@ -6,6 +6,7 @@ This file shows how to test:
 - CRUD operations
 - Permissions
 - Data validation
+- Query budgets (apps.core.testing.QueryBudgetMixin)
 """
 
 from django.contrib.auth import get_user_model
@@ -13,10 +14,12 @@ from django.contrib.auth import get_user_model
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from apps.core.testing import QueryBudgetMixin
+
 User = get_user_model()
 
 
-class AuthenticationTestCase(APITestCase):
+class AuthenticationTestCase(QueryBudgetMixin, APITestCase):
     """Test authentication endpoints."""
 
     def setUp(self):
@@ -45,7 +48,8 @@ class AuthenticationTestCase(APITestCase):
             "username_or_email": self.user_data["email"],
             "password": self.user_data["password"],
         }
-        response = self.client.post(url, data, format="json")
+        with self.assertQueryBudget(11):
+            response = self.client.post(url, data, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn("user", response.data)
@@ -90,7 +94,8 @@ class AuthenticationTestCase(APITestCase):
 
         # Then get user info (session should be active)
         url = "/api/auth/user/"
-        response = self.client.get(url)
+        with self.assertQueryBudget(2):
+            response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["email"], self.user_data["email"])
@@ -185,6 +190,34 @@ class ExampleModelTestCase(APITestCase):
         pass
 
 
+class UserListQueryTestCase(QueryBudgetMixin, APITestCase):
+    """Test that the admin user list doesn't run a query per user."""
+
+    def setUp(self):
+        """Create and log in an admin."""
+        self.admin = User.objects.create_superuser(
+            username="admin", email="admin@purdue.edu", password="TestPass123!"
+        )
+        self.client.force_login(self.admin)
+
+    def test_list_users_query_budget(self):
+        """Test that listing users stays within its query budget."""
+        with self.assertQueryBudget(4):
+            response = self.client.get("/api/auth/users/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_users_queries_independent_of_page_size(self):
+        """Test that a full page of users costs no more queries than one user."""
+
+        def grow():
+            User.objects.bulk_create(
+                User(username=f"user{i}", email=f"user{i}@purdue.edu") for i in range(25)
+            )
+
+        self.assertConstantQueries(lambda: self.client.get("/api/auth/users/"), grow)
+
+
 class PermissionTestCase(APITestCase):
     """Test permission-based access control."""
 
@@ -1,9 +1,16 @@
 """Basic health check test to verify test setup works."""
 
+from unittest import mock
+
+from django.test import override_settings
+
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from .health import HealthProber, check_database
 
+
+@override_settings(HEALTH_PROBE_INTERVAL=0)
 class HealthCheckTestCase(APITestCase):
     """Test the health check endpoint."""
 
@@ -18,3 +25,54 @@ class HealthCheckTestCase(APITestCase):
         self.assertIn("django_version", response.data)
         self.assertIn("python_version", response.data)
         self.assertTrue(response.data["database"]["connected"])
+
+    def test_liveness_does_no_io(self):
+        """Test that the liveness endpoint never touches the database."""
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/health/live/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "alive")
+
+    def test_readiness_reports_dependencies(self):
+        """Test that readiness reports each check, DB latency and pool stats."""
+        response = self.client.get("/api/health/ready/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "ready")
+        self.assertEqual(set(response.data["checks"]), {"database", "cache", "smtp", "migrations"})
+        self.assertIn("latency_ms", response.data["checks"]["database"])
+        self.assertIn("type", response.data["pool"])
+
+    @override_settings(HEALTH_CRITICAL_CHECKS=["database", "cache"])
+    def test_readiness_fails_on_critical_check(self):
+        """Test that a failing critical check returns 503."""
+        with mock.patch.dict(
+            "apps.api.health.CHECKS", {"cache": lambda: {"ok": False, "error": "down"}}
+        ):
+            response = self.client.get("/api/health/ready/")
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.data["status"], "not_ready")
+
+    @override_settings(HEALTH_PROBE_INTERVAL=30)
+    def test_readiness_is_served_from_memory(self):
+        """Test that polls between probes are answered without any queries."""
+        prober = HealthProber()
+        with (
+            mock.patch("apps.api.views.prober", prober),
+            mock.patch.object(HealthProber, "_ensure_thread"),
+        ):
+            self.client.get("/api/health/ready/")
+            with self.assertNumQueries(0):
+                response = self.client.get("/api/health/ready/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_database_probe_returns_pooled_connection(self):
+        """Test that the probe closes a pooled connection (back to the pool) but keeps others."""
+        for options, closes in (({"pool": True}, True), ({}, False)):
+            connection = mock.MagicMock(settings_dict={"ENGINE": "pooled", "OPTIONS": options})
+            with mock.patch("apps.api.health.connections", {"default": connection}):
+                self.assertTrue(check_database()["ok"])
+            self.assertEqual(connection.close.called, closes, options)
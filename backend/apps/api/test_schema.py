@@ -0,0 +1,96 @@
+"""
+Tests for the cached OpenAPI schema
+"""
+
+import gzip
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import override_settings
+
+from rest_framework.test import APITestCase
+
+from . import schema
+
+
+class CachedSchemaTestCase(APITestCase):
+    """Test serving the OpenAPI schema from the cache."""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        override = override_settings(SCHEMA_CACHE_DIR=self.cache_dir, APP_VERSION="v1")
+        override.enable()
+        self.addCleanup(override.disable)
+        schema.code_version.cache_clear()
+        self.addCleanup(schema.code_version.cache_clear)
+        schema._schemas.clear()
+        self.addCleanup(schema._schemas.clear)
+
+    def test_generated_once(self):
+        """Test that the schema is generated on first request and reused after."""
+        with mock.patch.object(schema, "write_schemas", wraps=schema.write_schemas) as write:
+            first = self.client.get("/api/schema/")
+            second = self.client.get("/api/schema/")
+
+        self.assertEqual(write.call_count, 1)
+        self.assertEqual(first.content, second.content)
+        self.assertIn(b"openapi:", first.content)
+        self.assertTrue(os.path.exists(os.path.join(self.cache_dir, "openapi-v1.json")))
+
+    def test_unwritable_cache_dir(self):
+        """Test that the schema is still served when the cache directory can't be written."""
+        target = os.path.join(self.cache_dir, "file")
+        open(target, "w").close()
+
+        with override_settings(SCHEMA_CACHE_DIR=os.path.join(target, "schema")):
+            with self.assertLogs("apps.api.schema", "ERROR"):
+                response = self.client.get("/api/schema/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"openapi:", response.content)
+
+    def test_etag_and_compression(self):
+        """Test that the schema is served compressed and revalidates with a 304."""
+        response = self.client.get(
+            "/api/schema/?format=json", HTTP_ACCEPT_ENCODING="gzip", HTTP_ACCEPT="application/json"
+        )
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn(b'"openapi"', gzip.decompress(response.content))
+
+        repeat = self.client.get(
+            "/api/schema/?format=json",
+            HTTP_ACCEPT_ENCODING="gzip",
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+        self.assertEqual(repeat.status_code, 304)
+
+    def test_command_prunes_other_versions(self):
+        """Test that generate_schema writes this version and removes old ones."""
+        stale = os.path.join(self.cache_dir, "openapi-v0.yaml")
+        open(stale, "w").close()
+
+        call_command("generate_schema", stdout=open(os.devnull, "w"))
+
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), ["openapi-v1.json", "openapi-v1.yaml"])
+
+    def test_writes_use_own_temporary_files(self):
+        """Test that each write goes through a temporary file of its own and leaves none behind."""
+        opened = []
+        real_open = tempfile.NamedTemporaryFile
+
+        def named_temporary_file(*args, **kwargs):
+            file = real_open(*args, **kwargs)
+            opened.append(file.name)
+            return file
+
+        with mock.patch.object(schema.tempfile, "NamedTemporaryFile", named_temporary_file):
+            schema.write_schemas()
+            schema.write_schemas()
+
+        self.assertEqual(len(set(opened)), 4)
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), ["openapi-v1.json", "openapi-v1.yaml"])
@@ -6,7 +6,7 @@ from django.urls import include, path
 
 from rest_framework.routers import DefaultRouter
 
-from .views import HealthCheckView
+from .views import HealthCheckView, LivenessView, ReadinessView
 
 app_name = "api"
 
@@ -16,5 +16,7 @@ router = DefaultRouter()
 
 urlpatterns = [
     path("health/", HealthCheckView.as_view(), name="health-check"),
+    path("health/live/", LivenessView.as_view(), name="health-live"),
+    path("health/ready/", ReadinessView.as_view(), name="health-ready"),
     path("", include(router.urls)),
 ]
@@ -3,64 +3,83 @@ API views
 """
 
 import sys
+import time
 
+import django
 from django.conf import settings
-from django.db import connection
 
+from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.core.asyncviews import AsyncAPIView
 
-class HealthCheckView(APIView):
+from .health import prober
+
+# Static for the life of the process, so build them once
+DJANGO_VERSION = django.get_version()
+PYTHON_VERSION = sys.version
+
+
+class HealthCheckView(AsyncAPIView):
     """
     Health check endpoint for monitoring
+
+    Dependency results come from the background prober, so polling this
+    endpoint does no I/O of its own (and under ASGI never leaves the event loop).
     """
 
     permission_classes = [AllowAny]
+    authentication_classes = []
 
-    def get(self, request):
+    async def get(self, request):
         """
         Check application health
         """
+        snapshot = await prober.asnapshot()
         health_status = {
-            "status": "healthy",
-            "database": self._check_database(),
-            "django_version": self._get_django_version(),
-            "python_version": sys.version,
+            "status": "healthy" if snapshot["ready"] else "unhealthy",
+            "database": snapshot["checks"]["database"],
+            "django_version": DJANGO_VERSION,
+            "python_version": PYTHON_VERSION,
             "auth_method": settings.AUTH_METHOD,
             "debug_mode": settings.DEBUG,
         }
+        return Response(health_status)
 
-        # Determine overall health
-        if not health_status["database"]["connected"]:
-            health_status["status"] = "unhealthy"
 
-        return Response(health_status)
+class LivenessView(APIView):
+    """
+    Liveness probe: the process is up and serving requests (no I/O)
+    """
 
-    def _check_database(self):
-        """
-        Check database connectivity
-        """
-        try:
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
-                cursor.fetchone()
-            return {
-                "connected": True,
-                "engine": settings.DATABASES["default"]["ENGINE"],
-            }
-        except Exception as e:
-            return {
-                "connected": False,
-                "error": str(e),
-                "engine": settings.DATABASES["default"]["ENGINE"],
-            }
-
-    def _get_django_version(self):
-        """
-        Get Django version
-        """
-        import django
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def get(self, request):
+        return Response({"status": "alive"})
+
+
+class ReadinessView(APIView):
+    """
+    Readiness probe: dependencies are reachable and migrations are applied
+
+    Returns 503 when a critical check fails, so load balancers stop routing
+    to this instance.
+    """
 
-        return django.get_version()
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def get(self, request):
+        snapshot = prober.snapshot()
+        return Response(
+            {
+                "status": "ready" if snapshot["ready"] else "not_ready",
+                "checks": snapshot["checks"],
+                "pool": snapshot["pool"],
+                "age_seconds": round(time.time() - snapshot["checked_at"], 1),
+            },
+            status=status.HTTP_200_OK if snapshot["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
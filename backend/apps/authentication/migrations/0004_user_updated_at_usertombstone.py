@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0003_alter_user_managers"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("user_id", models.BigIntegerField()),
+                ("deleted_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                "verbose_name": "User Tombstone",
+                "verbose_name_plural": "User Tombstones",
+                "db_table": "auth_user_tombstone",
+                "ordering": ["deleted_at"],
+            },
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
@@ -73,6 +73,11 @@ class User(AbstractUser):
         help_text="Designates whether this user has verified their email address.",
     )
 
+    # Last change, for delta sync of the user list (?since=, apps.core.sync).
+    # Also written by saves with update_fields (see save()); QuerySet.update()
+    # bypasses it, so bulk updates must set it themselves.
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
     # Optional: Add Purdue-specific fields here in the future
     # puid = models.CharField(max_length=20, blank=True, null=True, unique=True)
     # department = models.CharField(max_length=100, blank=True)
@@ -91,6 +96,23 @@ class User(AbstractUser):
         """String representation of the user."""
         return self.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember the email as loaded, so the email-change signal can compare
+        against it instead of re-reading the row on every save.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_email = instance.__dict__.get("email")
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Count partial saves (e.g. the last_login update) as changes too."""
+        update_fields = kwargs.get("update_fields")
+        if update_fields and "updated_at" not in update_fields:
+            kwargs["update_fields"] = {*update_fields, "updated_at"}
+        super().save(*args, **kwargs)
+
     def get_full_name(self):
         """
         Return the first_name plus the last_name, with a space in between.
@@ -107,6 +129,25 @@ class User(AbstractUser):
         return self.first_name or self.username
 
 
+class UserTombstone(models.Model):
+    """
+    Record of a deleted user, so delta sync clients can drop it.
+    Kept for SYNC_TOMBSTONE_DAYS; older cursors must reload the full list.
+    """
+
+    user_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        db_table = "auth_user_tombstone"
+        verbose_name = "User Tombstone"
+        verbose_name_plural = "User Tombstones"
+        ordering = ["deleted_at"]
+
+    def __str__(self):
+        return f"User {self.user_id} deleted at {self.deleted_at}"
+
+
 class EmailVerificationToken(models.Model):
     """
     Token for email verification.
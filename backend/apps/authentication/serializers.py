@@ -7,10 +7,14 @@ from django.contrib.auth.password_validation import validate_password
 
 from rest_framework import serializers
 
+from asgiref.sync import sync_to_async
+
+from apps.core.timing import TimedRepresentationMixin
+
 from .models import User
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     """
     Serializer for user details
     """
@@ -120,6 +124,16 @@ class LoginSerializer(serializers.Serializer):
         else:
             raise serializers.ValidationError('Must include "username_or_email" and "password"')
 
+    async def ais_valid(self):
+        """
+        is_valid() for async views.
+
+        Checking the password is CPU-bound hashing, which Django's
+        aauthenticate() would run on the event loop, stalling every other
+        request. So validation runs in one thread, lookups included.
+        """
+        return await sync_to_async(self.is_valid)()
+
 
 class RegisterSerializer(serializers.ModelSerializer):
     """
@@ -2,22 +2,65 @@
 Signals for authentication app
 """
 
-from django.db.models.signals import pre_save
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.core.events import publish
 
-from .models import User
+from .models import User, UserTombstone
 
 
 @receiver(pre_save, sender=User)
-def reset_email_verification_on_email_change(sender, instance, **kwargs):
+def reset_email_verification_on_email_change(sender, instance, update_fields=None, **kwargs):
     """
     Reset is_email_verified to False when user changes their email address.
     This ensures users must verify their new email address.
+
+    Compares against the email the instance was loaded with (User.from_db),
+    so ordinary saves such as the last_login update on login cost no query.
     """
+    if update_fields is not None and "email" not in update_fields:
+        return
+
     if instance.pk:  # Only for existing users (not new registrations)
-        try:
-            old_user = User.objects.get(pk=instance.pk)
-            if old_user.email != instance.email:
-                instance.is_email_verified = False
-        except User.DoesNotExist:
-            pass
+        old_email = getattr(instance, "_loaded_email", None)
+        if old_email is None:
+            # Built by hand or loaded with email deferred: read the stored value
+            old_email = User.objects.filter(pk=instance.pk).values_list("email", flat=True).first()
+        if old_email is not None and old_email != instance.email:
+            instance.is_email_verified = False
+
+    instance._loaded_email = instance.email
+
+
+@receiver(post_delete, sender=User)
+def record_user_tombstone(sender, instance, **kwargs):
+    """
+    Record the deletion for delta sync clients, pruning tombstones older
+    than any cursor still accepted.
+    """
+    UserTombstone.objects.create(user_id=instance.pk)
+    cutoff = timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_DAYS)
+    UserTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+
+
+@receiver(post_save, sender=User)
+def publish_user_saved(sender, instance, created, **kwargs):
+    """Push the saved user to admin pages (apps.core.events)."""
+    # Imported here so that loading the app (every management command) doesn't import DRF
+    from .serializers import UserSerializer
+
+    publish(
+        "users",
+        {"type": "created" if created else "updated", "user": UserSerializer(instance).data},
+    )
+
+
+@receiver(post_delete, sender=User)
+def publish_user_deleted(sender, instance, **kwargs):
+    """Push the deletion to admin pages."""
+    publish("users", {"type": "deleted", "id": instance.pk})
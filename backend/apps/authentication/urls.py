@@ -25,6 +25,7 @@ urlpatterns = [
     path("resend-verification/", views.resend_verification_view, name="resend-verification"),
     # User management endpoints (admin only)
     path("users/", views.UserListView.as_view(), name="user-list"),
+    path("users/events/", views.user_events_view, name="user-events"),
     path("users/<int:pk>/", views.UserDetailView.as_view(), name="user-detail"),
     # SAML endpoints
     path("saml/login/", views.saml_login_view, name="saml-login"),
@@ -5,7 +5,9 @@ Views for authentication app
 import logging
 
 from django.conf import settings
-from django.contrib.auth import login, logout
+from django.contrib.auth import alogin, alogout, login
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect
 from django.views.decorators.csrf import csrf_exempt
 
@@ -14,7 +16,14 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
-from .models import EmailVerificationToken, User
+from asgiref.sync import sync_to_async
+
+from apps.core.asyncviews import AsyncViewMixin, async_api_view
+from apps.core.events import event_stream
+from apps.core.projection import SparseFieldsMixin
+from apps.core.sync import DeltaSyncMixin
+
+from .models import EmailVerificationToken, User, UserTombstone
 from .serializers import (
     AdminUserCreateSerializer,
     EmailVerificationSerializer,
@@ -29,9 +38,12 @@ from .serializers import (
 logger = logging.getLogger(__name__)
 
 
-class CurrentUserView(generics.RetrieveUpdateAPIView):
+class CurrentUserView(SparseFieldsMixin, AsyncViewMixin, generics.RetrieveUpdateAPIView):
     """
-    Get or update current user information
+    Get or update current user information (GET takes ?fields= / ?omit=)
+
+    Async: the user comes from the session via the async ORM. Updates run
+    validation (uniqueness queries) and the save in one thread.
     """
 
     serializer_class = UserSerializer
@@ -40,10 +52,19 @@ class CurrentUserView(generics.RetrieveUpdateAPIView):
     def get_object(self):
         return self.request.user
 
+    async def get(self, request, *args, **kwargs):
+        return self.retrieve(request, *args, **kwargs)
 
-@api_view(["POST"])
+    async def put(self, request, *args, **kwargs):
+        return await sync_to_async(self.update)(request, *args, **kwargs)
+
+    async def patch(self, request, *args, **kwargs):
+        return await sync_to_async(self.partial_update)(request, *args, **kwargs)
+
+
+@async_api_view(["POST"])
 @permission_classes([AllowAny])
-def login_view(request):
+async def login_view(request):
     """
     Login endpoint for email/password authentication
     """
@@ -54,9 +75,9 @@ def login_view(request):
         )
 
     serializer = LoginSerializer(data=request.data)
-    if serializer.is_valid():
+    if await serializer.ais_valid():
         user = serializer.validated_data["user"]
-        login(request, user)
+        await alogin(request, user)
         user_serializer = UserSerializer(user)
         return Response({"user": user_serializer.data, "message": "Login successful"})
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -138,13 +159,13 @@ def register_view(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-@api_view(["POST"])
+@async_api_view(["POST"])
 @permission_classes([IsAuthenticated])
-def logout_view(request):
+async def logout_view(request):
     """
     Logout endpoint - clears session and ensures cookies are deleted
     """
-    logout(request)
+    await alogout(request)
     response = Response({"message": "Logout successful"})
 
     # Delete session cookie to ensure clean logout
@@ -347,20 +368,25 @@ def resend_verification_view(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-@api_view(["GET"])
+def get_auth_config():
+    """
+    Authentication configuration, shared by the API and the SPA bootstrap
+    """
+    return {
+        "auth_method": settings.AUTH_METHOD,
+        "saml_login_url": "/saml/login/" if settings.AUTH_METHOD == "saml" else None,
+        "allow_registration": settings.AUTH_METHOD != "saml",
+        "require_email_verification": settings.REQUIRE_EMAIL_VERIFICATION,
+    }
+
+
+@async_api_view(["GET"])
 @permission_classes([AllowAny])
-def auth_config_view(request):
+async def auth_config_view(request):
     """
     Get authentication configuration
     """
-    return Response(
-        {
-            "auth_method": settings.AUTH_METHOD,
-            "saml_login_url": "/saml/login/" if settings.AUTH_METHOD == "saml" else None,
-            "allow_registration": settings.AUTH_METHOD != "saml",
-            "require_email_verification": settings.REQUIRE_EMAIL_VERIFICATION,
-        }
-    )
+    return Response(get_auth_config())
 
 
 # SAML Views (placeholders - would need full implementation)
@@ -399,9 +425,13 @@ def saml_metadata_view(request):
     return HttpResponse("<EntityDescriptor>...</EntityDescriptor>", content_type="text/xml")
 
 
-class UserListView(generics.ListCreateAPIView):
+class UserListView(SparseFieldsMixin, DeltaSyncMixin, generics.ListCreateAPIView):
     """
     List all users or create a new user (admin only)
+
+    Lists are built from values_list() rows (apps.core.projection), with the
+    same output as UserSerializer, take ?fields= / ?omit=, and ?since=<cursor>
+    for just the changes since an earlier response (apps.core.sync).
     """
 
     queryset = User.objects.all()
@@ -413,6 +443,9 @@ class UserListView(generics.ListCreateAPIView):
             return AdminUserCreateSerializer
         return UserSerializer
 
+    def get_deleted(self, since):
+        return UserTombstone.objects.filter(deleted_at__gte=since).values_list("user_id", flat=True)
+
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -422,9 +455,31 @@ class UserListView(generics.ListCreateAPIView):
         return Response(user_serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
 
-class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
+async def user_events_view(request):
+    """
+    Stream user create, update and delete events as Server-Sent Events (admin only)
+
+    Needs the ASGI server (config/asgi.py): a WSGI worker would be tied up
+    for as long as the page stays open, so there it answers 503.
+    """
+    user = await request.auser()
+    if not user.is_staff:
+        return JsonResponse(
+            {"detail": "You do not have permission to perform this action."}, status=403
+        )
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({"detail": "Event streams need the ASGI server."}, status=503)
+
+    response = StreamingHttpResponse(event_stream("users"), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Tell nginx not to buffer the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+class UserDetailView(SparseFieldsMixin, generics.RetrieveUpdateDestroyAPIView):
     """
-    Retrieve, update or delete a specific user (admin only)
+    Retrieve, update or delete a specific user (admin only; GET takes ?fields= / ?omit=)
     """
 
     queryset = User.objects.all()
@@ -2,6 +2,7 @@
 Serializers for contact app
 """
 
+import logging
 import time
 
 from django.conf import settings
@@ -10,8 +11,12 @@ from django.utils import timezone
 
 from rest_framework import serializers
 
+from apps.core.email import asend_mail
+
 from .models import ContactMessage
 
+logger = logging.getLogger(__name__)
+
 # Minimum time (in seconds) that must pass between form load and submission
 MIN_SUBMISSION_TIME_SECONDS = 3
 
@@ -76,6 +81,24 @@ class ContactMessageSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         """Create contact message and send email"""
+        contact_message = super().create(self._prepare(validated_data))
+
+        # Send email notification
+        self._send_email_notification(contact_message)
+
+        return contact_message
+
+    async def asave(self):
+        """save() for async views: async ORM insert and async SMTP"""
+        contact_message = await ContactMessage.objects.acreate(
+            **self._prepare(dict(self.validated_data))
+        )
+        await self._asend_email_notification(contact_message)
+        self.instance = contact_message
+        return contact_message
+
+    def _prepare(self, validated_data):
+        """Model fields for the record: spam fields dropped, client details added"""
         # Remove spam protection fields (they're not in the model)
         validated_data.pop("website", None)
         validated_data.pop("form_loaded_at", None)
@@ -89,17 +112,32 @@ class ContactMessageSerializer(serializers.ModelSerializer):
             else:
                 validated_data["ip_address"] = request.META.get("REMOTE_ADDR")
             validated_data["user_agent"] = request.META.get("HTTP_USER_AGENT", "")
-
-        # Create the contact message record
-        contact_message = super().create(validated_data)
-
-        # Send email notification
-        self._send_email_notification(contact_message)
-
-        return contact_message
+        return validated_data
 
     def _send_email_notification(self, contact_message):
         """Send email notification to configured recipient(s)"""
+        try:
+            send_mail(*self._notification(contact_message), fail_silently=False)
+            contact_message.email_sent = True
+            contact_message.email_sent_at = timezone.now()
+            contact_message.save(update_fields=["email_sent", "email_sent_at"])
+        except Exception as e:
+            # Log the error but don't fail the request
+            logger.error(f"Failed to send contact form email: {e}")
+            # The contact message is still saved in the database for manual follow-up
+
+    async def _asend_email_notification(self, contact_message):
+        """_send_email_notification() without blocking the event loop"""
+        try:
+            await asend_mail(*self._notification(contact_message), fail_silently=False)
+            contact_message.email_sent = True
+            contact_message.email_sent_at = timezone.now()
+            await contact_message.asave(update_fields=["email_sent", "email_sent_at"])
+        except Exception as e:
+            logger.error(f"Failed to send contact form email: {e}")
+
+    def _notification(self, contact_message):
+        """(subject, body, from address, recipients) of the notification email"""
         # Get recipient email(s) from settings
         recipient_email = getattr(settings, "CONTACT_EMAIL", settings.DEFAULT_FROM_EMAIL)
         # Ensure recipient_email is a list
@@ -127,22 +165,4 @@ IP Address: {contact_message.ip_address or 'N/A'}
 
 This message was submitted at {contact_message.submitted_url or 'Unknown URL'}
 """
-
-        try:
-            send_mail(
-                subject,
-                message_body,
-                settings.DEFAULT_FROM_EMAIL,
-                recipient_email,
-                fail_silently=False,
-            )
-            contact_message.email_sent = True
-            contact_message.email_sent_at = timezone.now()
-            contact_message.save(update_fields=["email_sent", "email_sent_at"])
-        except Exception as e:
-            # Log the error but don't fail the request
-            import logging
-
-            logger = logging.getLogger(__name__)
-            logger.error(f"Failed to send contact form email: {e}")
-            # The contact message is still saved in the database for manual follow-up
+        return subject, message_body, settings.DEFAULT_FROM_EMAIL, recipient_email
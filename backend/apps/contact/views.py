@@ -5,13 +5,14 @@ Views for contact app
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
-from rest_framework.views import APIView
+
+from apps.core.asyncviews import AsyncAPIView
+from apps.core.throttling import AtomicAnonRateThrottle, AtomicUserRateThrottle
 
 from .serializers import ContactMessageSerializer
 
 
-class ContactRateThrottle(AnonRateThrottle):
+class ContactRateThrottle(AtomicAnonRateThrottle):
     """
     Custom throttle for contact form submissions.
     Limits anonymous users to prevent spam.
@@ -20,21 +21,23 @@ class ContactRateThrottle(AnonRateThrottle):
     scope = "contact"
 
 
-class ContactView(APIView):
+class ContactView(AsyncAPIView):
     """
     API view for contact form submissions.
     Open to all users (no authentication required).
+    Async: the record is saved with the async ORM and the notification
+    goes out over async SMTP (apps.core.email.asend_mail).
     """
 
     permission_classes = [AllowAny]
-    throttle_classes = [ContactRateThrottle, UserRateThrottle]
+    throttle_classes = [ContactRateThrottle, AtomicUserRateThrottle]
 
-    def post(self, request):
+    async def post(self, request):
         """Handle contact form submission"""
         serializer = ContactMessageSerializer(data=request.data, context={"request": request})
 
         if serializer.is_valid():
-            serializer.save()
+            await serializer.asave()
             return Response(
                 {"message": "Thank you for your message. We will get back to you soon."},
                 status=status.HTTP_201_CREATED,
@@ -0,0 +1,19 @@
+"""
+Core app configuration
+"""
+
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+from .querywrappers import install
+
+
+class CoreConfig(AppConfig):
+    """Configuration for the core app"""
+
+    name = "apps.core"
+    verbose_name = "Core"
+
+    def ready(self):
+        """Let request-scoped execute wrappers see queries on every thread's connection"""
+        connection_created.connect(install, dispatch_uid="apps.core.querywrappers")
@@ -0,0 +1,127 @@
+"""
+Async-native DRF views for the ASGI server.
+
+DRF's APIView.dispatch is synchronous, so under ASGI Django runs every DRF
+view in a worker thread and blocks that thread on each database or SMTP
+wait. AsyncViewMixin replaces dispatch with a coroutine that keeps DRF's
+request handling (negotiation, authentication, permissions, throttles,
+exception handling) and awaits `async def` handlers on the event loop:
+
+- the session user is loaded with the async ORM before DRF's
+  authenticators read it, so authentication itself does no I/O
+- throttles are the only checks that may touch a shared store (Redis,
+  SQLite or the cache); they run in one sync_to_async call, and only for
+  views that have throttles
+
+Handlers do their own I/O with the async ORM (aget, acreate, alogin, ...).
+Under WSGI the same views still work: Django runs them with async_to_sync.
+
+Usage:
+    class ThingView(AsyncAPIView):
+        async def get(self, request):
+            ...
+
+    @async_api_view(["POST"])
+    @permission_classes([AllowAny])
+    async def thing_view(request):
+        ...
+"""
+
+import asyncio
+
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.views import APIView
+
+from asgiref.sync import sync_to_async
+
+# Attributes the rest_framework.decorators (permission_classes, ...) set on a function
+_POLICY_ATTRIBUTES = (
+    "renderer_classes",
+    "parser_classes",
+    "authentication_classes",
+    "throttle_classes",
+    "permission_classes",
+    "content_negotiation_class",
+    "metadata_class",
+    "versioning_class",
+    "schema",
+)
+
+
+class AsyncViewMixin:
+    """Dispatch an APIView's `async def` handlers on the event loop."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            # options() and http_method_not_allowed() stay synchronous
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs):
+        """APIView.initial() without blocking the event loop."""
+        django_request = request._request
+        session_auth = any(
+            issubclass(auth, SessionAuthentication) for auth in self.authentication_classes
+        )
+        if session_auth and hasattr(django_request, "auser"):
+            # AuthenticationMiddleware's lazy request.user reads this cache,
+            # so SessionAuthentication finds the user without a query
+            django_request._cached_user = await django_request.auser()
+
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+
+        self.perform_authentication(request)
+        self.check_permissions(request)
+        if self.throttle_classes:
+            await sync_to_async(self.check_throttles)(request)
+
+
+class AsyncAPIView(AsyncViewMixin, APIView):
+    """APIView whose handlers are coroutines."""
+
+
+def async_api_view(http_method_names):
+    """
+    Like rest_framework.decorators.api_view, for `async def` function views.
+
+    Put it above the policy decorators (@permission_classes and friends),
+    as with api_view.
+    """
+
+    def decorator(func):
+        async def handler(self, *args, **kwargs):
+            return await func(*args, **kwargs)
+
+        attrs = {"__doc__": func.__doc__, "__module__": func.__module__}
+        attrs.update(
+            {name: getattr(func, name) for name in _POLICY_ATTRIBUTES if hasattr(func, name)}
+        )
+        methods = [method.lower() for method in http_method_names]
+        attrs.update({method: handler for method in methods})
+        attrs["http_method_names"] = methods + ["options"]
+
+        view_class = type(func.__name__, (AsyncAPIView,), attrs)
+        return view_class.as_view()
+
+    return decorator
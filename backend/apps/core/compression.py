@@ -0,0 +1,68 @@
+"""
+Precompressed responses for content that changes once per deploy.
+
+Precompressed holds the bytes with gzip and brotli variants and a strong
+ETag per encoding, computed once; serve() negotiates Accept-Encoding and
+answers If-None-Match with a 304. Used for the SPA shell and the OpenAPI
+schema.
+"""
+
+import gzip
+import hashlib
+
+from django.http import HttpResponse, HttpResponseNotModified
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+def etag_for(content, encoding):
+    return f'"{hashlib.sha256(content).hexdigest()[:16]}-{encoding}"'
+
+
+def negotiate(accept_encoding, available):
+    """Pick the best of `available` encodings that the client accepts."""
+    accepted = {part.split(";")[0].strip() for part in accept_encoding.lower().split(",") if part}
+    for encoding in ("br", "gzip"):
+        if encoding in accepted and encoding in available:
+            return encoding
+    return "identity"
+
+
+class Precompressed:
+    """Content bytes and their compressed variants, keyed by encoding."""
+
+    def __init__(self, content):
+        self.content = content
+        self.variants = {"identity": content}
+        self.variants["gzip"] = gzip.compress(content, compresslevel=9, mtime=0)
+        if brotli is not None:
+            self.variants["br"] = brotli.compress(content)
+        self.etags = {encoding: etag_for(content, encoding) for encoding in self.variants}
+
+    def negotiate(self, accept_encoding):
+        return negotiate(accept_encoding, self.variants)
+
+    def serve(self, request, content_type, headers=None):
+        encoding = self.negotiate(request.headers.get("Accept-Encoding", ""))
+        return serve(
+            request, self.variants[encoding], encoding, self.etags[encoding], content_type, headers
+        )
+
+
+def serve(request, content, encoding, etag, content_type, headers=None):
+    """Respond with already-encoded content, or 304 if the client has it."""
+    if_none_match = request.headers.get("If-None-Match", "")
+    if etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(content, content_type=content_type)
+        if encoding != "identity":
+            response["Content-Encoding"] = encoding
+    response["ETag"] = etag
+    response["Vary"] = "Accept-Encoding"
+    for name, value in (headers or {}).items():
+        response[name] = value
+    return response
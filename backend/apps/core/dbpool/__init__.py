@@ -0,0 +1,167 @@
+"""
+Connection pools for the Oracle and SQL Server backends (DB_POOL).
+
+PostgreSQL gets Django's own pool (psycopg_pool). These backends extend
+the stock ones in the same shape, a pool per worker process that a request
+borrows a connection from and returns it to on close:
+
+- apps.core.dbpool.oracle: Django's python-oracledb session pool, with the
+  generic DB_POOL_* sizes translated to create_pool()'s arguments
+- apps.core.dbpool.mssql: mssql-django has no pool, so a SQLAlchemy
+  QueuePool (ConnectionPool below) holds its pyodbc connections
+
+Both time each borrow (django_db_pool_wait_seconds), count failures
+(django_db_pool_errors_total) and publish the pool's open and busy
+connections (django_db_pool_connections); /health/?verbose=1 reports
+pool_stats(). The helpers here take the pool or a connection factory, so
+they run against fakes without Oracle or SQL Server.
+"""
+
+import time
+
+from django.db.utils import OperationalError
+
+from apps.core.metrics import DB_POOL_CONNECTIONS, DB_POOL_ERRORS, DB_POOL_WAIT
+
+# Without CONN_HEALTH_CHECKS, oracledb still pings a borrowed connection
+# that has been idle for longer than this (its default)
+ORACLE_PING_INTERVAL = 60
+
+
+def oracle_pool_options(options, health_checks, timedwait):
+    """
+    oracledb.create_pool() arguments for a DB_POOL options dict.
+
+    `timedwait` is oracledb.POOL_GETMODE_TIMEDWAIT: wait up to `timeout`
+    seconds for a free connection rather than forever. With health checks
+    every borrowed connection is pinged (ping_interval=0).
+    """
+    return {
+        "min": options.get("min_size", 1),
+        "max": options.get("max_size", 4),
+        "increment": 1,
+        "getmode": timedwait,
+        "wait_timeout": int(options.get("timeout", 10) * 1000),
+        "timeout": int(options.get("max_idle", 300)),
+        "ping_interval": 0 if health_checks else ORACLE_PING_INTERVAL,
+    }
+
+
+def oracle_pool_stats(pool):
+    """pool_stats() for an oracledb ConnectionPool."""
+    return {
+        "type": type(pool).__name__,
+        "size": pool.opened,
+        "in_use": pool.busy,
+        "idle": pool.opened - pool.busy,
+        "min": pool.min,
+        "max": pool.max,
+    }
+
+
+# Waited for a free pooled connection until the pool's wait_timeout
+ORACLE_TIMEOUT_CODES = {"DPY-4005", "ORA-24457"}
+
+
+def oracle_error_reason(error):
+    """The django_db_pool_errors_total reason for an oracledb error from acquire()."""
+    error_obj = error.args[0] if error.args else None
+    return "timeout" if getattr(error_obj, "full_code", None) in ORACLE_TIMEOUT_CODES else "connect"
+
+
+def record_stats(vendor, stats):
+    DB_POOL_CONNECTIONS.labels(vendor, "in_use").set(stats["in_use"])
+    DB_POOL_CONNECTIONS.labels(vendor, "idle").set(stats["idle"])
+
+
+def record_wait(vendor, started):
+    DB_POOL_WAIT.labels(vendor).observe(time.perf_counter() - started)
+
+
+class ConnectionPool:
+    """
+    A SQLAlchemy QueuePool of DB-API connections made by `creator`.
+
+    Keeps up to `min_size` connections open between requests; under load it
+    opens up to `max_size`, closing the extra ones as they are returned.
+    Borrowing waits up to `timeout` seconds, then raises OperationalError.
+    With `health_checks`, a borrowed connection runs SELECT 1 first and is
+    replaced if that fails. Idle connections are used most recent first.
+    """
+
+    def __init__(
+        self,
+        creator,
+        vendor,
+        min_size=1,
+        max_size=4,
+        timeout=10,
+        health_checks=True,
+    ):
+        # SQLAlchemy is a production dependency, needed only with DB_POOL
+        from sqlalchemy import event
+        from sqlalchemy.pool import QueuePool
+
+        self.vendor = vendor
+        self.max_size = max(max_size, min_size)
+        self._pool = QueuePool(
+            creator,
+            pool_size=min_size,
+            max_overflow=self.max_size - min_size,
+            timeout=timeout,
+            use_lifo=True,
+            reset_on_return="rollback",
+        )
+        if health_checks:
+            event.listen(self._pool, "checkout", self._check)
+
+    def _check(self, dbapi_connection, connection_record, connection_proxy):
+        from sqlalchemy.exc import DisconnectionError
+
+        try:
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            finally:
+                cursor.close()
+        except Exception as error:
+            DB_POOL_ERRORS.labels(self.vendor, "health_check").inc()
+            # The pool closes this connection and borrows (or opens) another
+            raise DisconnectionError(str(error)) from error
+
+    def acquire(self):
+        """Borrow a connection; close() on the result returns it to the pool."""
+        from sqlalchemy.exc import TimeoutError
+
+        started = time.perf_counter()
+        try:
+            pooled = self._pool.connect()
+        except TimeoutError as error:
+            DB_POOL_ERRORS.labels(self.vendor, "timeout").inc()
+            raise OperationalError(f"No pooled {self.vendor} connection free: {error}") from error
+        except Exception:
+            DB_POOL_ERRORS.labels(self.vendor, "connect").inc()
+            raise
+        record_wait(self.vendor, started)
+        record_stats(self.vendor, self.stats())
+        return pooled
+
+    def release(self, pooled):
+        pooled.close()
+        record_stats(self.vendor, self.stats())
+
+    def stats(self):
+        idle, in_use = self._pool.checkedin(), self._pool.checkedout()
+        return {
+            "type": type(self._pool).__name__,
+            "size": idle + in_use,
+            "in_use": in_use,
+            "idle": idle,
+            "min": self._pool.size(),
+            "max": self.max_size,
+        }
+
+    def close(self):
+        """Close the idle connections; borrowed ones close when returned."""
+        self._pool.dispose()
@@ -0,0 +1,80 @@
+"""
+mssql-django with a pool of its pyodbc connections (DB_POOL).
+
+Modelled on Django's pooled backends: with OPTIONS["pool"] (True or a
+min_size/max_size/timeout dict), connect() borrows from a per-process
+ConnectionPool and close() returns the connection to it. The backend still
+opens each connection itself, so its driver options, retries and
+converters apply unchanged.
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+
+from mssql.base import DatabaseWrapper as MSSQLDatabaseWrapper
+
+from .. import ConnectionPool
+
+
+class DatabaseWrapper(MSSQLDatabaseWrapper):
+    _connection_pools = {}
+    # The pool's proxy for the connection this wrapper has borrowed
+    _pooled = None
+
+    @property
+    def is_pool(self):
+        return bool(self.settings_dict["OPTIONS"].get("pool", False))
+
+    @property
+    def pool(self):
+        if not self.is_pool:
+            return None
+
+        if self.settings_dict.get("CONN_MAX_AGE", 0) != 0:
+            raise ImproperlyConfigured("Pooling doesn't support persistent connections.")
+
+        if self.alias not in self._connection_pools:
+            conn_params = self.get_connection_params()
+            pool_options = self.settings_dict["OPTIONS"]["pool"]
+            if pool_options is True:
+                pool_options = {}
+            pool = ConnectionPool(
+                lambda: MSSQLDatabaseWrapper.get_new_connection(self, conn_params),
+                "mssql",
+                min_size=pool_options.get("min_size", 1),
+                max_size=pool_options.get("max_size", 4),
+                timeout=pool_options.get("timeout", 10),
+                health_checks=self.settings_dict["CONN_HEALTH_CHECKS"],
+            )
+            self._connection_pools.setdefault(self.alias, pool)
+
+        return self._connection_pools[self.alias]
+
+    def close_pool(self):
+        if self.pool:
+            self.pool.close()
+            del self._connection_pools[self.alias]
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params["OPTIONS"] = {
+            key: value for key, value in conn_params["OPTIONS"].items() if key != "pool"
+        }
+        return conn_params
+
+    def get_new_connection(self, conn_params):
+        if not self.pool:
+            return super().get_new_connection(conn_params)
+        self._pooled = self.pool.acquire()
+        # The backend sets attributes (autocommit, timeout) on the connection
+        # itself, so it gets pyodbc's and the proxy stays here for close()
+        return self._pooled.dbapi_connection
+
+    def _close(self):
+        if self._pooled is None:
+            return super()._close()
+        pooled, self._pooled = self._pooled, None
+        with self.wrap_database_errors:
+            self.pool.release(pooled)
+
+    def pool_stats(self):
+        return self.pool.stats() if self.pool else None
@@ -0,0 +1,57 @@
+"""
+Django's Oracle backend with its python-oracledb pool sized from DB_POOL_*.
+
+The stock backend passes OPTIONS["pool"] to oracledb.create_pool() as is;
+this one takes the same min_size/max_size/timeout/max_idle dict as the
+PostgreSQL pool, and adds metrics and pool_stats().
+"""
+
+import time
+
+from django.db.backends.oracle.base import Database
+from django.db.backends.oracle.base import DatabaseWrapper as OracleDatabaseWrapper
+
+from apps.core.metrics import DB_POOL_ERRORS
+
+from .. import (
+    oracle_error_reason,
+    oracle_pool_options,
+    oracle_pool_stats,
+    record_stats,
+    record_wait,
+)
+
+
+class DatabaseWrapper(OracleDatabaseWrapper):
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        if isinstance(conn_params.get("pool"), dict):
+            # A cx_Oracle connect() option; oracledb pools are thread-safe
+            conn_params.pop("threaded", None)
+            conn_params["pool"] = oracle_pool_options(
+                conn_params["pool"],
+                self.settings_dict["CONN_HEALTH_CHECKS"],
+                Database.POOL_GETMODE_TIMEDWAIT,
+            )
+        return conn_params
+
+    def get_new_connection(self, conn_params):
+        if not self.pool:
+            return super().get_new_connection(conn_params)
+        started = time.perf_counter()
+        try:
+            connection = super().get_new_connection(conn_params)
+        except Database.Error as error:
+            DB_POOL_ERRORS.labels("oracle", oracle_error_reason(error)).inc()
+            raise
+        record_wait("oracle", started)
+        record_stats("oracle", oracle_pool_stats(self.pool))
+        return connection
+
+    def _close(self):
+        super()._close()
+        if self.pool:
+            record_stats("oracle", oracle_pool_stats(self.pool))
+
+    def pool_stats(self):
+        return oracle_pool_stats(self.pool) if self.pool else None
@@ -7,10 +7,20 @@ Centralizes email sending logic to avoid duplication across views.
 import logging
 
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, send_mail
+from django.core.mail.message import sanitize_address
+
+from asgiref.sync import sync_to_async
+
+try:
+    import aiosmtplib
+except ImportError:
+    aiosmtplib = None
 
 logger = logging.getLogger(__name__)
 
+SMTP_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+
 
 def send_templated_email(
     email_type: str,
@@ -48,6 +58,44 @@ def send_templated_email(
         return False
 
 
+async def asend_mail(subject, message, from_email, recipient_list, fail_silently=False):
+    """
+    send_mail() for async views.
+
+    With the SMTP backend and aiosmtplib installed, the message goes out on
+    an asyncio connection, so waiting on the mail server holds no thread.
+    Other backends (console in development, locmem in tests) are called in
+    a worker thread.
+
+    Returns the number of messages sent (0 or 1).
+    """
+    if aiosmtplib is None or settings.EMAIL_BACKEND != SMTP_BACKEND:
+        return await sync_to_async(send_mail, thread_sensitive=False)(
+            subject, message, from_email, recipient_list, fail_silently=fail_silently
+        )
+
+    email = EmailMessage(subject, message, from_email, recipient_list)
+    encoding = email.encoding or settings.DEFAULT_CHARSET
+    try:
+        await aiosmtplib.send(
+            email.message(),
+            sender=sanitize_address(email.from_email, encoding),
+            recipients=[sanitize_address(addr, encoding) for addr in email.recipients()],
+            hostname=settings.EMAIL_HOST,
+            port=settings.EMAIL_PORT,
+            username=settings.EMAIL_HOST_USER or None,
+            password=settings.EMAIL_HOST_PASSWORD or None,
+            start_tls=settings.EMAIL_USE_TLS,
+            use_tls=settings.EMAIL_USE_SSL,
+            timeout=settings.EMAIL_TIMEOUT,
+        )
+    except Exception:
+        if not fail_silently:
+            raise
+        return 0
+    return 1
+
+
 def _get_email_content(email_type: str, context: dict) -> tuple[str, str]:
     """
     Get email subject and message body based on email type.
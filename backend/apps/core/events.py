@@ -0,0 +1,199 @@
+"""
+Server push: publish events from anywhere, stream them to browsers as
+Server-Sent Events from async views (under ASGI).
+
+publish() sends a JSON message on a named channel after the current
+transaction commits. The transport carries it to every server process:
+
+- "local": straight to this process's subscribers (single-process servers
+  and tests)
+- "redis": Redis pub/sub, so events published by one worker reach the
+  subscribers connected to every other; each process listens in one
+  background thread, started on its first subscriber
+
+Select it with settings.EVENTS_BACKEND. Within a process the Broadcaster
+fans messages out to subscribers, one bounded asyncio queue per open
+stream. A subscriber that falls EVENTS_QUEUE_SIZE messages behind is
+dropped; its client reconnects and catches up with a delta sync.
+"""
+
+import asyncio
+import contextlib
+import functools
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """One open stream's queue of messages from a channel."""
+
+    def __init__(self, loop, maxsize):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def put(self, message):
+        """Queue a message (on the subscriber's event loop)."""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout=None):
+        """The next message, or None if none arrived within `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Broadcaster:
+    """Deliver messages to this process's subscribers, from any thread."""
+
+    def __init__(self):
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def deliver(self, channel, message):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, message)
+            except RuntimeError:  # Loop already closed; unsubscribe will follow
+                pass
+
+    def add(self, channel, subscription):
+        with self._lock:
+            self._subscriptions[channel].add(subscription)
+
+    def remove(self, channel, subscription):
+        with self._lock:
+            self._subscriptions[channel].discard(subscription)
+            if not self._subscriptions[channel]:
+                del self._subscriptions[channel]
+
+    def subscriber_count(self, channel):
+        with self._lock:
+            return len(self._subscriptions.get(channel, ()))
+
+
+class LocalTransport:
+    """Deliver in this process only."""
+
+    def __init__(self, broadcaster):
+        self.broadcaster = broadcaster
+
+    def publish(self, channel, message):
+        self.broadcaster.deliver(channel, message)
+
+    def start(self):
+        pass
+
+
+class RedisTransport:
+    """Publish through Redis pub/sub; a listener thread delivers to this process."""
+
+    def __init__(self, url, broadcaster, prefix="events:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.broadcaster = broadcaster
+        self.prefix = prefix
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        self.client.publish(self.prefix + channel, message)
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._listen, name="events-redis", daemon=True
+                )
+                self._thread.start()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(f"{self.prefix}*")
+                for item in pubsub.listen():
+                    channel = item["channel"].decode()[len(self.prefix) :]
+                    self.broadcaster.deliver(channel, item["data"])
+            except Exception:
+                logger.exception("Event listener lost its Redis connection; reconnecting")
+                time.sleep(1)
+
+
+broadcaster = Broadcaster()
+
+
+@functools.lru_cache(maxsize=None)
+def _build_transport(backend, redis_url):
+    if backend == "redis":
+        return RedisTransport(redis_url, broadcaster)
+    if backend == "local":
+        return LocalTransport(broadcaster)
+    raise ValueError(f"Unsupported EVENTS_BACKEND: {backend}")
+
+
+def get_transport():
+    return _build_transport(
+        getattr(settings, "EVENTS_BACKEND", "local"), getattr(settings, "EVENTS_REDIS_URL", None)
+    )
+
+
+def publish(channel, data):
+    """Send `data` (JSON-serializable) to a channel's subscribers once the transaction commits."""
+    # Imported here: this module loads with the models' signals, before DRF is needed
+    from .renderers import ORJSONRenderer
+
+    message = ORJSONRenderer().render(data)
+    transport = get_transport()
+
+    def send():
+        try:
+            transport.publish(channel, message)
+        except Exception:
+            # Pushes are best effort; clients still catch up by delta sync
+            logger.exception("Could not publish event on %s", channel)
+
+    transaction.on_commit(send)
+
+
+@contextlib.asynccontextmanager
+async def subscribe(channel):
+    """Subscribe the running event loop to a channel for the block's duration."""
+    get_transport().start()
+    subscription = Subscription(asyncio.get_running_loop(), settings.EVENTS_QUEUE_SIZE)
+    broadcaster.add(channel, subscription)
+    try:
+        yield subscription
+    finally:
+        broadcaster.remove(channel, subscription)
+
+
+async def event_stream(channel, heartbeat=None):
+    """
+    Server-Sent Events text for a channel: a retry hint, then one `data:`
+    event per message, with comment lines every `heartbeat` seconds so
+    proxies don't time out an idle stream.
+    """
+    heartbeat = heartbeat or settings.EVENTS_HEARTBEAT
+    async with subscribe(channel) as subscription:
+        yield b"retry: 5000\n\n"
+        while not subscription.overflowed:
+            message = await subscription.get(timeout=heartbeat)
+            if message is None:
+                yield b": ping\n\n"
+            else:
+                yield b"data: " + message + b"\n\n"
@@ -0,0 +1,65 @@
+"""
+Parse and summarize Python's `-X importtime` output.
+
+Used by `manage.py import_profile`. With -X importtime the interpreter
+writes one line to stderr per module it imports, after the module has
+finished importing, so a module's dependencies come before it:
+
+    import time: self [us] | cumulative | imported package
+    import time:       374 |        374 |     yaml.error
+    import time:       627 |      18926 |   yaml
+
+The indentation is the import depth; "self" leaves out the time spent
+importing dependencies, "cumulative" includes it. A module imported
+earlier costs nothing the second time and is not listed again.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@dataclass
+class Import:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse(text):
+    """The imports in `-X importtime` output, in the order they finished."""
+    imports = []
+    for line in text.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            imports.append(Import(module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return imports
+
+
+def group(module):
+    """Who a module belongs to: "apps.<app>", "config", or its top-level package."""
+    parts = module.split(".")
+    if parts[0] == "apps" and len(parts) > 1:
+        return ".".join(parts[:2])
+    return parts[0]
+
+
+def by_group(imports):
+    """Self time in microseconds per group, largest first."""
+    totals = Counter()
+    for entry in imports:
+        totals[group(entry.module)] += entry.self_us
+    return totals.most_common()
+
+
+def top_level(imports):
+    """The imports made directly by the profiled code, slowest first."""
+    return sorted(
+        (entry for entry in imports if entry.depth == 0),
+        key=lambda entry: entry.cumulative_us,
+        reverse=True,
+    )
@@ -0,0 +1,79 @@
+"""
+Views and modules imported on first use instead of at startup.
+
+Every worker imports the URLconf as it starts (so do management commands
+such as check), so a view module imported there costs all of them, even
+when nobody requests it.
+lazy_view() defers the import of a rarely used view (the API docs pull in
+drf-spectacular, PyYAML and their dependencies) to its first request.
+
+DRF's @api_view copies APIView.schema onto each view it wraps, which
+imports DEFAULT_SCHEMA_CLASS while the URLconf loads; LazyAutoSchema stands
+in for drf-spectacular's AutoSchema until schema generation asks a view
+instance for its schema.
+"""
+
+import sys
+import threading
+
+from django.utils.module_loading import import_string
+
+from rest_framework.schemas.inspectors import ViewInspector
+
+
+def lazy_view(dotted_path, **initkwargs):
+    """
+    A view for the class-based view at `dotted_path`, imported on first request.
+
+    Usage: path("api/swagger/", lazy_view("drf_spectacular.views.SpectacularSwaggerView",
+    url_name="schema"))
+    """
+    view = None
+    lock = threading.Lock()
+
+    def load():
+        nonlocal view
+        with lock:
+            if view is None:
+                view = import_string(dotted_path).as_view(**initkwargs)
+        return view
+
+    def lazy(request, *args, **kwargs):
+        return (view or load())(request, *args, **kwargs)
+
+    lazy.__name__ = lazy.__qualname__ = dotted_path.rpartition(".")[2]
+    lazy.__module__ = dotted_path.rpartition(".")[0]
+    # Like the DRF views these load (CsrfViewMiddleware reads this before the import)
+    lazy.csrf_exempt = True
+    return lazy
+
+
+class LazyAutoSchema(ViewInspector):
+    """
+    DEFAULT_SCHEMA_CLASS that imports `schema_class` when a view's schema is read.
+
+    Views built by @api_view keep one instance as a class attribute, which
+    hands each view instance a real `schema_class`. Other views build a new
+    DEFAULT_SCHEMA_CLASS per instance; that is a `schema_class` once its
+    module is imported, as schema generation (drf_spectacular.generators)
+    does first.
+
+    drf-spectacular's @extend_schema subclasses DEFAULT_SCHEMA_CLASS, so views
+    that use it should set `schema = AutoSchema()` themselves.
+    """
+
+    schema_class = "drf_spectacular.openapi.AutoSchema"
+
+    def __new__(cls, *args, **kwargs):
+        if cls.schema_class.rpartition(".")[0] in sys.modules:
+            return import_string(cls.schema_class)(*args, **kwargs)
+        return super().__new__(cls)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        if instance in self.instance_schemas:
+            return self.instance_schemas[instance]
+        schema = import_string(self.schema_class)()
+        schema.view = instance
+        return schema
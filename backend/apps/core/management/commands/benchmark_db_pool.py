@@ -0,0 +1,229 @@
+"""
+Management command to compare PostgreSQL connection handling under bursty load.
+Usage: python manage.py benchmark_db_pool [--variants persistent,pool,pool-prepared]
+       [--pgbouncer-port 6432] [--workers 2] [--threads 8] [--bursts 10]
+       [--burst-size 32] [--idle 3]
+
+Needs psycopg 3 (requirements/postgres-pool.txt), DATABASE_ENGINE=postgresql
+and DB_* for a database this benchmark may migrate and that nothing else
+uses: it counts the database's connections in pg_stat_activity. Each variant
+starts gunicorn (gthread workers, production settings) on that database with:
+
+- persistent: CONN_MAX_AGE=600, one connection kept per worker thread
+- pool: DB_POOL, psycopg 3's pool (DB_POOL_MAX_SIZE defaults to --threads)
+- pool-prepared: the pool with DB_SERVER_SIDE_BINDING and prepared statements
+- pgbouncer: persistent connections to PgBouncer at --pgbouncer-port
+  (transaction mode, DB_PGBOUNCER); the count is PgBouncer's server connections
+
+and sends --bursts bursts of --burst-size simultaneous GET /api/auth/user/
+(session and user lookups: a few short queries), --idle seconds apart.
+Reports latency percentiles and the connections held at the bursts' peak
+and after each idle gap.
+"""
+
+import asyncio
+import math
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from .benchmark_servers import free_port, request, run_manage, server_env, wait_for
+
+VARIANTS = {
+    "persistent": {"CONN_MAX_AGE": "600"},
+    "pool": {"DB_POOL": "True"},
+    "pool-prepared": {
+        "DB_POOL": "True",
+        "DB_SERVER_SIDE_BINDING": "True",
+        "DB_PREPARE_THRESHOLD": "2",
+    },
+    "pgbouncer": {"CONN_MAX_AGE": "600", "DB_PGBOUNCER": "True"},
+}
+
+BENCHMARK_USER = "pool-benchmark"
+
+# Prints a session key for the benchmark user (runs in `manage.py shell`)
+LOGIN = """
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+from django.contrib.sessions.backends.db import SessionStore
+
+user, _ = get_user_model().objects.get_or_create(
+    username="{user}", defaults={{"email": "{user}@example.edu"}}
+)
+session = SessionStore()
+session[SESSION_KEY] = str(user.pk)
+session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+session.create()
+print(session.session_key)
+"""
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class ConnectionSampler:
+    """Count the database's other client connections every `interval` seconds, in a thread."""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.samples = []
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="pg-sampler", daemon=True)
+
+    def count(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*) FROM pg_stat_activity WHERE datname = current_database() "
+                "AND backend_type = 'client backend' AND pid <> pg_backend_pid()"
+            )
+            return cursor.fetchone()[0]
+
+    def _run(self):
+        try:
+            while not self.stop.wait(self.interval):
+                self.samples.append(self.count())
+        finally:
+            connection.close()
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop.set()
+        self.thread.join()
+
+    def take(self):
+        """The samples since the last take()."""
+        samples, self.samples = self.samples, []
+        return samples
+
+
+class Command(BaseCommand):
+    help = "Compare connections held and p99 latency: persistent connections, pools, PgBouncer"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--variants",
+            default="persistent,pool,pool-prepared",
+            help=f"Of: {', '.join(VARIANTS)}",
+        )
+        parser.add_argument(
+            "--pgbouncer-port", type=int, help="PgBouncer in front of the same database"
+        )
+        parser.add_argument("--workers", type=int, default=2, help="gunicorn workers")
+        parser.add_argument("--threads", type=int, default=8, help="Threads per worker")
+        parser.add_argument("--bursts", type=int, default=10, help="Bursts per variant")
+        parser.add_argument("--burst-size", type=int, default=32, help="Requests per burst")
+        parser.add_argument("--idle", type=float, default=3, help="Seconds between bursts")
+        parser.add_argument(
+            "--settings-module",
+            default="config.settings.production",
+            help="Settings for the servers (default: config.settings.production)",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Needs DATABASE_ENGINE=postgresql")
+        variants = options["variants"].split(",")
+        for variant in variants:
+            if variant not in VARIANTS:
+                raise CommandError(f"Unknown variant: {variant}")
+        if "pgbouncer" in variants and not options["pgbouncer_port"]:
+            raise CommandError("The pgbouncer variant needs --pgbouncer-port")
+
+        with tempfile.TemporaryDirectory() as scratch:
+            env = server_env(Path(scratch), options["settings_module"])
+            env.update(
+                {
+                    "DATABASE_ENGINE": "postgresql",
+                    "DB_NAME": settings.DATABASES["default"]["NAME"],
+                    "DB_POOL_MAX_SIZE": str(options["threads"]),
+                    # So that the pool shrinks between bursts
+                    "DB_POOL_MAX_IDLE": str(max(1, options["idle"] / 2)),
+                }
+            )
+            run_manage(env, "migrate", "--verbosity", "0")
+            session_key = self.login(env)
+            self.stdout.write(
+                f"{'variant':<14} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7} "
+                f"{'peak conns':>10} {'idle conns':>10}"
+            )
+            for variant in variants:
+                variant_env = {**env, **VARIANTS[variant]}
+                if variant == "pgbouncer":
+                    variant_env["DB_PORT"] = str(options["pgbouncer_port"])
+                self.measure(variant, variant_env, session_key, options)
+
+    def login(self, env):
+        result = subprocess.run(
+            [sys.executable, "manage.py", "shell", "--verbosity", "0", "-c"]
+            + [LOGIN.format(user=BENCHMARK_USER)],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout.split()[-1]
+
+    def measure(self, variant, env, session_key, options):
+        port = free_port()
+        command = [sys.executable, "-m", "gunicorn", "--bind", f"127.0.0.1:{port}"]
+        command += ["--config", "python:config.gunicorn_hooks", "--log-level", "warning"]
+        command += ["--workers", str(options["workers"]), "--worker-class", "gthread"]
+        command += ["--threads", str(options["threads"]), "config.wsgi:application"]
+        server = subprocess.Popen(command, cwd=settings.BASE_DIR, env=env)
+        try:
+            wait_for(port, server)
+            latencies, errors, peaks, idles = [], 0, [], []
+            with ConnectionSampler() as sampler:
+                for _ in range(options["bursts"]):
+                    sampler.take()
+                    burst, burst_errors = asyncio.run(
+                        self.burst(port, session_key, options["burst_size"])
+                    )
+                    latencies += burst
+                    errors += burst_errors
+                    peaks.append(max(sampler.take(), default=0))
+                    time.sleep(options["idle"])
+                    idles.append((sampler.take() or [0])[-1])
+        finally:
+            server.terminate()
+            server.wait(30)
+
+        if not latencies:
+            raise CommandError(f"{variant}: every request failed")
+        self.stdout.write(
+            f"{variant:<14} {percentile(latencies, 0.5) * 1000:>8.1f} "
+            f"{percentile(latencies, 0.99) * 1000:>8.1f} {max(latencies) * 1000:>8.1f} "
+            f"{errors:>7} {max(peaks):>10} {max(idles):>10}"
+        )
+
+    async def burst(self, port, session_key, size):
+        headers = {"Cookie": f"{settings.SESSION_COOKIE_NAME}={session_key}"}
+        results = await asyncio.gather(
+            *(
+                request(port, "GET", "/api/auth/user/", None, "127.0.0.1", headers)
+                for _ in range(size)
+            ),
+            return_exceptions=True,
+        )
+        latencies, errors = [], 0
+        for result in results:
+            if isinstance(result, BaseException) or result[0] != 200:
+                errors += 1
+            else:
+                latencies.append(result[1])
+        return latencies, errors
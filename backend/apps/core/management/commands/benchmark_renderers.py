@@ -0,0 +1,93 @@
+"""
+Management command to compare API renderers on pages of serialized users.
+Usage: python manage.py benchmark_renderers [--sizes 20,100,1000] [--repeat N]
+
+Users are built in memory (no database), serialized once with
+UserSerializer into the paginated response shape, then rendered and parsed
+with DRF's JSONRenderer/JSONParser, orjson and (if installed) msgpack.
+"""
+
+import io
+import timeit
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.authentication.serializers import UserSerializer
+from apps.core import renderers
+
+
+def user_page(size):
+    """A page of `size` users as the paginated list endpoint returns it."""
+    User = get_user_model()
+    now = timezone.now()
+    users = [
+        User(
+            id=i,
+            username=f"user{i}",
+            email=f"user{i}@example.edu",
+            first_name="Zoë",
+            last_name=f"Boilermaker {i}",
+            date_joined=now - timedelta(days=i),
+            last_login=now if i % 2 else None,
+        )
+        for i in range(1, size + 1)
+    ]
+    return {
+        "count": size,
+        "next": None,
+        "previous": None,
+        "results": UserSerializer(users, many=True).data,
+    }
+
+
+class Command(BaseCommand):
+    help = "Benchmark JSON/MessagePack rendering of user list pages"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="20,100,1000",
+            help="Comma-separated page sizes (default: 20,100,1000)",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Timing runs per case; the best is kept"
+        )
+
+    def handle(self, *args, **options):
+        pairs = [
+            ("drf-json", JSONRenderer(), JSONParser()),
+            ("orjson", renderers.ORJSONRenderer(), renderers.ORJSONParser()),
+        ]
+        if renderers.msgpack is not None:
+            pairs.append(
+                ("msgpack", renderers.MessagePackRenderer(), renderers.MessagePackParser())
+            )
+
+        self.stdout.write(
+            f"{'size':>6} {'renderer':<10} {'bytes':>9} {'render µs':>10} {'parse µs':>10} "
+            f"{'speedup':>8}"
+        )
+        for size in (int(size) for size in options["sizes"].split(",")):
+            data = user_page(size)
+            baseline = None
+            for name, renderer, parser in pairs:
+                content = renderer.render(data)
+                render = self.best(lambda: renderer.render(data), options["repeat"])
+                parse = self.best(lambda: parser.parse(io.BytesIO(content)), options["repeat"])
+                baseline = baseline or render
+                self.stdout.write(
+                    f"{size:>6} {name:<10} {len(content):>9} {render:>10.1f} {parse:>10.1f} "
+                    f"{baseline / render:>7.1f}x"
+                )
+
+    def best(self, func, repeat):
+        """Best time per call in microseconds."""
+        timer = timeit.Timer(func)
+        number, _ = timer.autorange()
+        return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
@@ -0,0 +1,299 @@
+"""
+Management command to compare requests served per gunicorn worker, sync vs ASGI.
+Usage: python manage.py benchmark_servers [--modes sync,asgi] [--endpoints health,contact]
+       [--concurrency 1,16,64] [--requests 200] [--smtp-delay 0.1]
+
+Starts one gunicorn worker per mode on a scratch SQLite database, as the
+generated configs would run it:
+
+- sync: the default of deployment/templates/gunicorn.conf.template
+  (sync worker, config.wsgi)
+- gthread: sync views on a threaded worker (--threads)
+- asgi: deployment/templates/gunicorn-asgi.conf.template (uvicorn worker,
+  config.asgi, async views)
+
+and drives each endpoint at each concurrency level. "contact" submits the
+contact form to a local SMTP server that takes --smtp-delay seconds to
+accept each message, standing in for a real mail server; each request
+carries its own X-Forwarded-For so the rate limit doesn't cut the run short.
+"""
+
+import asyncio
+import itertools
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from orjson import dumps
+
+ENDPOINTS = {
+    "health": ("GET", "/api/health/", None),
+    "config": ("GET", "/api/auth/config/", None),
+    "contact": (
+        "POST",
+        "/api/contact/",
+        {
+            "name": "Benchmark",
+            "email": "benchmark@example.edu",
+            "subject": "Benchmark",
+            "message": "A benchmark message, long enough to validate.",
+        },
+    ),
+}
+
+# Client addresses, unique across runs so the contact form's rate limit never applies
+_clients = itertools.count()
+
+MODES = {
+    "sync": ["--worker-class", "sync", "config.wsgi:application"],
+    "gthread": ["--worker-class", "gthread", "config.wsgi:application"],
+    "asgi": ["--worker-class", "config.asgi_worker.DjangoUvicornWorker", "config.asgi:application"],
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_env(scratch, settings_module, smtp_port=None):
+    """Environment for a production-settings server on a scratch SQLite database."""
+    env = dict(os.environ)
+    env.update(
+        {
+            "DJANGO_SETTINGS_MODULE": settings_module,
+            "DEBUG": "False",
+            "SECRET_KEY": "benchmark-servers-not-secret",
+            "ALLOWED_HOSTS": "127.0.0.1",
+            "SECURE_SSL_REDIRECT": "False",
+            "DATABASE_ENGINE": "sqlite",
+            "DB_NAME": str(scratch / "db.sqlite3"),
+            "CONN_MAX_AGE": "0",
+            "THROTTLE_SQLITE_PATH": str(scratch / "throttle.sqlite3"),
+            "PROMETHEUS_MULTIPROC_DIR": str(scratch),
+        }
+    )
+    if smtp_port is not None:
+        env.update(
+            {
+                "EMAIL_BACKEND": "django.core.mail.backends.smtp.EmailBackend",
+                "EMAIL_HOST": "127.0.0.1",
+                "EMAIL_PORT": str(smtp_port),
+                "EMAIL_USE_TLS": "False",
+                "EMAIL_HOST_USER": "",
+                "EMAIL_HOST_PASSWORD": "",
+            }
+        )
+    return env
+
+
+def run_manage(env, *args):
+    subprocess.run([sys.executable, "manage.py", *args], cwd=settings.BASE_DIR, env=env, check=True)
+
+
+class SlowSMTPServer:
+    """An SMTP server that accepts every message, `delay` seconds after its data ends."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.port = free_port()
+        self.loop = asyncio.new_event_loop()
+        self.ready = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, name="smtp-sink", daemon=True).start()
+        self.ready.wait(5)
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        server = asyncio.start_server(self._session, "127.0.0.1", self.port)
+        self.loop.run_until_complete(server)
+        self.ready.set()
+        self.loop.run_forever()
+
+    async def _session(self, reader, writer):
+        try:
+            await self._converse(reader, writer)
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def _converse(self, reader, writer):
+        writer.write(b"220 benchmark ESMTP\r\n")
+        in_data = False
+        while line := await reader.readline():
+            if in_data:
+                if line == b".\r\n":
+                    in_data = False
+                    await asyncio.sleep(self.delay)
+                    writer.write(b"250 OK\r\n")
+                    await writer.drain()
+                continue
+            command = line[:4].upper()
+            if command == b"EHLO":
+                writer.write(b"250-benchmark\r\n250 8BITMIME\r\n")
+            elif command == b"DATA":
+                writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                in_data = True
+            elif command == b"QUIT":
+                writer.write(b"221 Bye\r\n")
+                await writer.drain()
+                break
+            else:
+                writer.write(b"250 OK\r\n")
+            await writer.drain()
+
+
+async def request(port, method, path, body, forwarded_for, headers=None):
+    """One request on its own connection; returns (status, seconds)."""
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    payload = dumps(body) if body is not None else b""
+    extra = "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+    head = (
+        f"{method} {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n"
+        f"X-Forwarded-For: {forwarded_for}\r\nAccept: application/json\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n{extra}\r\n"
+    )
+    writer.write(head.encode() + payload)
+    await writer.drain()
+    status_line = await reader.readline()
+    await reader.read()
+    writer.close()
+    return int(status_line.split()[1]), time.perf_counter() - started
+
+
+def wait_for(port, server):
+    """Wait until the gunicorn `server` (a Popen) answers on `port`."""
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise CommandError(f"gunicorn exited with status {server.returncode}")
+        try:
+            status, _ = asyncio.run(request(port, "GET", "/api/health/live/", None, "127.0.0.1"))
+        except OSError:
+            time.sleep(0.2)
+            continue
+        if status == 200:
+            return
+    raise CommandError("gunicorn did not start within 30 seconds")
+
+
+async def drive(port, endpoint, concurrency, total):
+    """Send `total` requests, `concurrency` at a time; returns (seconds, latencies, errors)."""
+    method, path, body = ENDPOINTS[endpoint]
+    remaining = iter(range(total))
+    latencies = []
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        for _ in remaining:
+            n = next(_clients)
+            forwarded_for = f"10.{n // 65536 % 256}.{n // 256 % 256}.{n % 256}"
+            try:
+                status, seconds = await request(port, method, path, body, forwarded_for)
+            except OSError:
+                errors += 1
+                continue
+            if status >= 400:
+                errors += 1
+            latencies.append(seconds)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - started, sorted(latencies), errors
+
+
+class Command(BaseCommand):
+    help = "Benchmark concurrency per gunicorn worker: sync vs uvicorn (ASGI) workers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--modes", default="sync,asgi", help="Of: sync, gthread, asgi")
+        parser.add_argument(
+            "--endpoints", default="health,contact", help="Of: health, config, contact"
+        )
+        parser.add_argument("--concurrency", default="1,16,64", help="Concurrent clients per run")
+        parser.add_argument("--requests", type=int, default=200, help="Requests per run")
+        parser.add_argument("--threads", type=int, default=8, help="Threads for the gthread mode")
+        parser.add_argument(
+            "--smtp-delay",
+            type=float,
+            default=0.1,
+            help="Seconds the SMTP server takes per message",
+        )
+        parser.add_argument(
+            "--settings-module",
+            default="config.settings.production",
+            help="Settings for the servers (default: config.settings.production)",
+        )
+
+    def handle(self, *args, **options):
+        modes = options["modes"].split(",")
+        endpoints = options["endpoints"].split(",")
+        for name in modes:
+            if name not in MODES:
+                raise CommandError(f"Unknown mode: {name}")
+        for name in endpoints:
+            if name not in ENDPOINTS:
+                raise CommandError(f"Unknown endpoint: {name}")
+        levels = [int(level) for level in options["concurrency"].split(",")]
+
+        smtp = SlowSMTPServer(options["smtp_delay"])
+        smtp.start()
+        try:
+            with tempfile.TemporaryDirectory() as scratch:
+                env = server_env(Path(scratch), options["settings_module"], smtp.port)
+                run_manage(env, "migrate", "--verbosity", "0")
+                self.stdout.write(
+                    f"{'mode':<8} {'endpoint':<8} {'clients':>7} {'req/s':>8} {'p50 ms':>8} "
+                    f"{'p95 ms':>8} {'errors':>6}"
+                )
+                for mode in modes:
+                    self.bench_mode(mode, endpoints, levels, env, options)
+        finally:
+            smtp.stop()
+
+    def bench_mode(self, mode, endpoints, levels, env, options):
+        port = free_port()
+        command = [sys.executable, "-m", "gunicorn", "--bind", f"127.0.0.1:{port}"]
+        command += ["--workers", "1", "--timeout", "120", "--log-level", "warning"]
+        command += ["--backlog", "2048"]
+        if mode == "gthread":
+            command += ["--threads", str(options["threads"])]
+        command += MODES[mode]
+        server = subprocess.Popen(command, cwd=settings.BASE_DIR, env=env)
+        try:
+            wait_for(port, server)
+            for endpoint in endpoints:
+                for concurrency in levels:
+                    seconds, latencies, errors = asyncio.run(
+                        drive(port, endpoint, concurrency, options["requests"])
+                    )
+                    self.report(mode, endpoint, concurrency, seconds, latencies, errors)
+        finally:
+            server.terminate()
+            server.wait(30)
+
+    def report(self, mode, endpoint, concurrency, seconds, latencies, errors):
+        if latencies:
+            p50 = latencies[len(latencies) // 2] * 1000
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000
+        else:
+            p50 = p95 = float("nan")
+        self.stdout.write(
+            f"{mode:<8} {endpoint:<8} {concurrency:>7} {len(latencies) / seconds:>8.1f} "
+            f"{p50:>8.1f} {p95:>8.1f} {errors:>6}"
+        )
@@ -0,0 +1,164 @@
+"""
+Management command to get the database and files ready before the server starts.
+Usage: python manage.py bootstrap [--wait 60] [--static auto|always|never] [--no-superuser]
+
+docker-entrypoint.sh runs this before the server. It does in one process
+what used to take a Python process per step, each setting Django up again:
+
+1. wait for the database, retrying with backoff (0.1 s, doubling up to 2 s)
+   instead of probing once a second
+2. migrate, only when the migration plan is not empty
+3. create the superuser "admin" when there is none, with the password in
+   DEFAULT_SUPERUSER_PASSWORD (default: admin123)
+4. collectstatic and generate_schema: with --static auto (the default) only
+   when DEBUG is off, as with the production settings
+5. print the app's URLs and the default admin's login
+"""
+
+import os
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, OperationalError, connections
+from django.db.migrations.executor import MigrationExecutor
+
+DEFAULT_ADMIN_EMAIL = "admin@example.com"
+DEFAULT_ADMIN_PASSWORD = "admin123"
+
+
+def wait_for_database(connection, timeout, sleep=time.sleep, clock=time.monotonic):
+    """Connect, retrying with backoff; returns the number of attempts."""
+    deadline = clock() + timeout
+    delay = 0.1
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            connection.ensure_connection()
+            return attempts
+        except OperationalError as error:
+            if clock() + delay > deadline:
+                raise CommandError(f"Database unavailable after {timeout:g}s: {error}")
+        sleep(delay)
+        delay = min(delay * 2, 2)
+
+
+def migration_plan(connection):
+    """The migrations `migrate` would apply, in order."""
+    executor = MigrationExecutor(connection)
+    return executor.migration_plan(executor.loader.graph.leaf_nodes())
+
+
+class Command(BaseCommand):
+    help = "Wait for the database, migrate, create the default admin and collect static files"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--wait",
+            type=float,
+            default=60,
+            help="Seconds to wait for the database (default: 60)",
+        )
+        parser.add_argument(
+            "--static",
+            choices=["auto", "always", "never"],
+            default="auto",
+            help="collectstatic and generate_schema: auto runs them when DEBUG is off",
+        )
+        parser.add_argument(
+            "--no-superuser",
+            action="store_true",
+            help="Don't create the default superuser",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        started = time.perf_counter()
+
+        self.stdout.write(self.style.WARNING("⏳ Waiting for database..."))
+        attempts = wait_for_database(connection, options["wait"])
+        retries = f" (after {attempts - 1} retries)" if attempts > 1 else ""
+        self.stdout.write(self.style.SUCCESS(f"✅ Database is ready!{retries}"))
+
+        plan = migration_plan(connection)
+        if plan:
+            self.stdout.write(self.style.WARNING(f"📚 Applying {len(plan)} migrations..."))
+            call_command(
+                "migrate",
+                database=options["database"],
+                interactive=False,
+                verbosity=options["verbosity"],
+            )
+        self.stdout.write(self.style.SUCCESS("✅ Database tables ready!"))
+
+        if not options["no_superuser"]:
+            self.ensure_superuser()
+
+        if options["static"] == "always" or (options["static"] == "auto" and not settings.DEBUG):
+            self.stdout.write(self.style.WARNING("📦 Collecting static files..."))
+            call_command("collectstatic", interactive=False, verbosity=options["verbosity"])
+            call_command("generate_schema")
+            self.stdout.write(self.style.SUCCESS("✅ Static files collected!"))
+
+        self.stdout.write(
+            self.style.SUCCESS(f"🎉 Setup complete in {time.perf_counter() - started:.1f}s!")
+        )
+        self.banner()
+
+    def ensure_superuser(self):
+        self.stdout.write(self.style.WARNING("👤 Checking for admin users..."))
+        User = get_user_model()
+        try:
+            admin_count = User.objects.filter(is_superuser=True).count()
+            if admin_count:
+                self.stdout.write(
+                    self.style.SUCCESS(f"✅ Found {admin_count} admin user(s) already configured")
+                )
+                return
+            password = os.environ.get("DEFAULT_SUPERUSER_PASSWORD", DEFAULT_ADMIN_PASSWORD)
+            User.objects.create_superuser("admin", DEFAULT_ADMIN_EMAIL, password)
+        except DatabaseError as error:
+            self.stdout.write(self.style.WARNING(f"Note: Admin user setup skipped ({error})"))
+            return
+        self.stdout.write(self.style.SUCCESS("✅ Created default admin user"))
+        self.stdout.write("   Username: admin")
+        self.stdout.write(f"   Email: {DEFAULT_ADMIN_EMAIL}")
+        self.stdout.write(f"   Password: {password}")
+        if password == DEFAULT_ADMIN_PASSWORD:
+            self.stdout.write(
+                self.style.WARNING(
+                    "   ⚠️  Using default password! Change DEFAULT_SUPERUSER_PASSWORD in .env"
+                )
+            )
+
+    def banner(self):
+        port = os.environ.get("FRONTEND_PORT", "5173")
+        self.stdout.write(self.style.SUCCESS("━" * 40))
+        self.stdout.write(self.style.SUCCESS("🌐 Application URLs:"))
+        self.stdout.write(f"   Frontend: http://localhost:{port}")
+        self.stdout.write(f"   Backend API: http://localhost:{port}/api/")
+        self.stdout.write(f"   Admin Panel: http://localhost:{port}/admin/")
+        self.stdout.write("")
+        try:
+            admin = (
+                get_user_model()
+                .objects.filter(email=DEFAULT_ADMIN_EMAIL, is_active=True)
+                .only("username")
+                .first()
+            )
+        except DatabaseError:
+            admin = None
+        if admin:
+            self.stdout.write("📧 Default Admin Credentials:")
+            self.stdout.write(f"   Username: {admin.username}")
+            self.stdout.write(f"   Email: {DEFAULT_ADMIN_EMAIL}")
+            self.stdout.write(
+                f"   Password: {DEFAULT_ADMIN_PASSWORD} "
+                "(or check DEFAULT_SUPERUSER_PASSWORD in .env)"
+            )
+            self.stdout.write("")
+        self.stdout.write(self.style.SUCCESS("━" * 40))
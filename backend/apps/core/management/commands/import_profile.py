@@ -0,0 +1,117 @@
+"""
+Management command to profile startup: import time per module and per app.
+Usage: python manage.py import_profile [--settings-module config.settings.production]
+       [--application wsgi|asgi|none] [--top 15] [--repeat 3]
+
+Starts a fresh interpreter with `-X importtime` (a warm one has its modules
+imported already) that goes through Django's startup in phases, timing each:
+
+- settings: importing the settings module (and reading .env)
+- apps ready: django.setup(), importing every app's models and AppConfig
+- application: config.wsgi/config.asgi, which loads the middleware (what a
+  gunicorn worker does next); --application none stops at apps ready, like
+  a management command
+- URLconf: the URL patterns and every view module they import
+
+Then prints the self time of the imports per group ("apps.<app>", "config",
+or the top-level package of a dependency) and the slowest imports made
+directly by that startup, cumulative. --repeat starts that many
+interpreters and reports the fastest phases (the tree is the last run's).
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...importtime import by_group, parse, top_level
+
+# Runs in the profiled interpreter; prints each phase's seconds as JSON
+PROBE = """
+import json, sys, time
+from importlib import import_module
+
+phases = {}
+started = time.perf_counter()
+
+def phase(name):
+    global started
+    now = time.perf_counter()
+    phases[name] = now - started
+    started = now
+
+import django
+from django.conf import settings
+settings.INSTALLED_APPS
+phase("settings")
+django.setup()
+phase("apps ready")
+if sys.argv[1] != "none":
+    import_module("config." + sys.argv[1])
+    phase("application")
+from django.urls import get_resolver
+get_resolver().url_patterns
+phase("URLconf")
+print(json.dumps(phases))
+"""
+
+
+class Command(BaseCommand):
+    help = "Report import time per module and per app for a cold start"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--settings-module",
+            default=os.environ.get("DJANGO_SETTINGS_MODULE"),
+            help="Settings to start with (default: this command's)",
+        )
+        parser.add_argument(
+            "--application",
+            choices=["wsgi", "asgi", "none"],
+            default="wsgi",
+            help="Entry point to load after django.setup() (default: wsgi)",
+        )
+        parser.add_argument("--top", type=int, default=15, help="Rows per table")
+        parser.add_argument("--repeat", type=int, default=3, help="Interpreters to start")
+
+    def handle(self, *args, **options):
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": options["settings_module"]}
+        command = [sys.executable, "-X", "importtime", "-c", PROBE, options["application"]]
+        fastest, totals = {}, []
+        for _ in range(options["repeat"]):
+            started = time.perf_counter()
+            result = subprocess.run(
+                command, cwd=settings.BASE_DIR, env=env, capture_output=True, text=True
+            )
+            totals.append(time.perf_counter() - started)
+            if result.returncode:
+                raise CommandError(f"Startup failed:\n{result.stderr[-2000:]}")
+            phases = json.loads(result.stdout.splitlines()[-1])
+            for name, seconds in phases.items():
+                fastest[name] = min(seconds, fastest.get(name, seconds))
+        imports = parse(result.stderr)
+        self.report(options, fastest, min(totals), imports)
+
+    def report(self, options, phases, total, imports):
+        top = options["top"]
+        self.stdout.write(f"{options['settings_module']}, fastest of {options['repeat']}")
+        self.stdout.write(f"{'phase':<14} {'ms':>8}")
+        for name, seconds in phases.items():
+            self.stdout.write(f"{name:<14} {seconds * 1000:>8.1f}")
+        self.stdout.write(
+            f"{'process':<14} {total * 1000:>8.1f}  (with interpreter start and exit)"
+        )
+
+        self.stdout.write("")
+        self.stdout.write(f"{'group':<32} {'self ms':>8}")
+        for name, self_us in by_group(imports)[:top]:
+            self.stdout.write(f"{name:<32} {self_us / 1000:>8.1f}")
+
+        self.stdout.write("")
+        self.stdout.write(f"{'import':<48} {'cumulative ms':>13}")
+        for entry in top_level(imports)[:top]:
+            self.stdout.write(f"{entry.module:<48} {entry.cumulative_us / 1000:>13.1f}")
@@ -0,0 +1,52 @@
+"""
+Management command to merge the worker sampler's stack files.
+Usage: python manage.py merge_profiles [--since MINUTES] [--output FILE]
+
+The output is collapsed-stack text for flamegraph.pl, speedscope or inferno.
+"""
+
+import glob
+import os
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.core.profiling import format_collapsed, parse_collapsed
+
+
+class Command(BaseCommand):
+    help = "Merge per-worker collapsed stack files into one flamegraph input"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dir", default=None, help="Directory of stack files (default: PROFILING_DIR)"
+        )
+        parser.add_argument(
+            "--since", type=float, default=None, help="Only merge files from the last N minutes"
+        )
+        parser.add_argument("--output", "-o", default=None, help="Write to a file, not stdout")
+
+    def handle(self, *args, **options):
+        directory = options["dir"] or settings.PROFILING_DIR
+        paths = glob.glob(os.path.join(directory, "*.folded"))
+        if options["since"] is not None:
+            cutoff = time.time() - options["since"] * 60
+            paths = [path for path in paths if os.path.getmtime(path) >= cutoff]
+
+        stacks = Counter()
+        for path in paths:
+            with open(path) as f:
+                parse_collapsed(f.read(), into=stacks)
+
+        output = format_collapsed(stacks)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output)
+        else:
+            self.stdout.write(output, ending="")
+        self.stderr.write(
+            f"Merged {len(paths)} files, {sum(stacks.values())} samples, "
+            f"{len(stacks)} distinct stacks"
+        )
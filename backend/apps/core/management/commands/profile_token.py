@@ -0,0 +1,19 @@
+"""
+Management command to create a token for profiling one request.
+Usage: curl -H "X-Profile-Token: $(python manage.py profile_token)" https://.../api/...
+
+The response body is the request's collapsed stacks instead of its content.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.core.profiling import make_profile_token
+
+
+class Command(BaseCommand):
+    help = "Print a signed X-Profile-Token header value for profiling requests"
+
+    def handle(self, *args, **options):
+        self.stdout.write(make_profile_token())
+        self.stderr.write(f"Valid for {settings.PROFILING_TOKEN_MAX_AGE} seconds")
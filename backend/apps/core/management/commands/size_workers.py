@@ -0,0 +1,230 @@
+"""
+Management command to size gunicorn's workers for this host and this app.
+Usage: python manage.py size_workers [--mix login=1,config=4,health=2,contact=1]
+       [--requests 20] [--cpus N] [--memory-mb N] [--write gunicorn_config.py | --format env]
+
+Reads the CPUs and memory available here (cgroup limits included, see
+apps.core.sizing), then runs one sync gunicorn worker on a scratch SQLite
+database and measures, per endpoint, how much of each request's wall time
+the worker spends on CPU: login is password hashing, contact waits on the
+database and an SMTP server that takes --smtp-delay seconds. The mix
+weights say how common each endpoint is. It also reads the worker's memory
+and how much it grows per request.
+
+Prints the recommended worker class, workers, threads and max_requests;
+--write updates them in a gunicorn config file (generate-config.sh does
+this with GUNICORN_SIZING="measure"; a config with the ASGI uvicorn worker
+keeps its worker class), --format env prints them as GUNICORN_* lines for a
+deploy config.
+
+Run it where the app will run, or pass --cpus/--memory-mb for the target
+(e.g. the service's CPUQuota/MemoryMax when this shell is not in its cgroup).
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from config.rolling_reload import children
+
+from ...sizing import apply_to_config, cpu_limit, memory_limit, recommend
+from .benchmark_servers import (
+    ENDPOINTS,
+    SlowSMTPServer,
+    free_port,
+    request,
+    run_manage,
+    server_env,
+    wait_for,
+)
+from .worker_memory import memory
+
+SIZING_USER = "sizing"
+SIZING_PASSWORD = "Sizing-not-secret-1"
+
+WORKLOAD = {
+    **ENDPOINTS,
+    "login": (
+        "POST",
+        "/api/auth/login/",
+        {"username_or_email": SIZING_USER, "password": SIZING_PASSWORD},
+    ),
+}
+
+
+def cpu_seconds(pid):
+    """User plus system CPU time of a process so far."""
+    with open(f"/proc/{pid}/stat") as stat:
+        fields = stat.read().rpartition(")")[2].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+class Command(BaseCommand):
+    help = "Recommend gunicorn worker class, workers, threads and max_requests for this host"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--mix",
+            default="login=1,config=4,health=2,contact=1",
+            help=f"Relative frequency of endpoints, of: {', '.join(WORKLOAD)}",
+        )
+        parser.add_argument("--requests", type=int, default=20, help="Requests per endpoint")
+        parser.add_argument("--cpus", type=float, help="CPUs available (default: detected)")
+        parser.add_argument("--memory-mb", type=int, help="Memory available (default: detected)")
+        parser.add_argument(
+            "--memory-fraction",
+            type=float,
+            default=0.75,
+            help="Share of the memory gunicorn may use (default: 0.75)",
+        )
+        parser.add_argument(
+            "--smtp-delay",
+            type=float,
+            default=0.1,
+            help="Seconds the SMTP server takes per message",
+        )
+        parser.add_argument("--write", metavar="CONFIG", help="Update this gunicorn config file")
+        parser.add_argument("--format", choices=["text", "env"], default="text")
+        parser.add_argument(
+            "--settings-module",
+            default="config.settings.production",
+            help="Settings for the server (default: config.settings.production)",
+        )
+
+    def handle(self, *args, **options):
+        if not os.path.exists("/proc/self/smaps_rollup"):
+            raise CommandError("Needs Linux's /proc")
+        mix = {}
+        for item in options["mix"].split(","):
+            name, _, weight = item.partition("=")
+            if name not in WORKLOAD:
+                raise CommandError(f"Unknown endpoint: {name}")
+            mix[name] = float(weight or 1)
+
+        cpus = options["cpus"] or cpu_limit()
+        memory_bytes = options["memory_mb"] * 2**20 if options["memory_mb"] else memory_limit()
+        measured = self.measure(mix, options)
+
+        # Weigh by time: the fraction of all worker time, across the mix, spent on CPU
+        cpu = sum(mix[name] * measured["endpoints"][name][0] for name in mix)
+        wall = sum(mix[name] * measured["endpoints"][name][1] for name in mix)
+        cpu_fraction = cpu / wall
+        recommendation = recommend(
+            cpus,
+            memory_bytes,
+            measured["master"],
+            measured["worker"],
+            measured["growth"],
+            cpu_fraction,
+            memory_fraction=options["memory_fraction"],
+        )
+
+        if options["format"] == "env":
+            self.stdout.write(f'GUNICORN_WORKER_CLASS="{recommendation.worker_class}"')
+            self.stdout.write(f'GUNICORN_WORKERS="{recommendation.workers}"')
+            self.stdout.write(f'GUNICORN_THREADS="{recommendation.threads}"')
+            self.stdout.write(f'GUNICORN_MAX_REQUESTS="{recommendation.max_requests}"')
+            self.stdout.write(
+                f'GUNICORN_MAX_REQUESTS_JITTER="{recommendation.max_requests_jitter}"'
+            )
+        else:
+            self.report(cpus, memory_bytes, measured, cpu_fraction, recommendation)
+
+        if options["write"]:
+            path = Path(options["write"])
+            path.write_text(apply_to_config(path.read_text(), recommendation))
+            self.stderr.write(f"Updated {path}")
+
+    def measure(self, mix, options):
+        smtp = SlowSMTPServer(options["smtp_delay"])
+        smtp.start()
+        try:
+            with tempfile.TemporaryDirectory() as scratch:
+                env = server_env(Path(scratch), options["settings_module"], smtp.port)
+                run_manage(env, "migrate", "--verbosity", "0")
+                run_manage(
+                    env,
+                    "shell",
+                    "--verbosity",
+                    "0",
+                    "-c",
+                    "from django.contrib.auth import get_user_model; "
+                    f"get_user_model().objects.create_user({SIZING_USER!r}, "
+                    f"'{SIZING_USER}@example.edu', {SIZING_PASSWORD!r})",
+                )
+                return self.run_worker(mix, env, options["requests"])
+        finally:
+            smtp.stop()
+
+    def run_worker(self, mix, env, requests):
+        port = free_port()
+        command = [sys.executable, "-m", "gunicorn", "--bind", f"127.0.0.1:{port}"]
+        command += ["--config", "python:config.gunicorn_hooks", "--log-level", "warning"]
+        command += ["--workers", "1", "--worker-class", "sync", "--timeout", "120"]
+        command.append("config.wsgi:application")
+        server = subprocess.Popen(command, cwd=settings.BASE_DIR, env=env)
+        try:
+            wait_for(port, server)
+            (worker,) = children(server.pid)
+            # One round first, so lazy imports don't count as per-request work
+            for name in mix:
+                self.send(port, name, 2)
+            rss_before = memory(worker)[0]
+            endpoints = {}
+            for name in mix:
+                cpu_before, started = cpu_seconds(worker), time.perf_counter()
+                self.send(port, name, requests)
+                endpoints[name] = (
+                    (cpu_seconds(worker) - cpu_before) / requests,
+                    (time.perf_counter() - started) / requests,
+                )
+            rss_after, worker_pss, _ = memory(worker)
+            return {
+                "endpoints": endpoints,
+                "master": memory(server.pid)[1] * 1024,
+                "worker": worker_pss * 1024,
+                "growth": max(0, rss_after - rss_before) * 1024 / (requests * len(mix)),
+            }
+        finally:
+            server.terminate()
+            server.wait(30)
+
+    def send(self, port, name, count):
+        method, path, body = WORKLOAD[name]
+
+        async def run():
+            for n in range(count):
+                status, _ = await request(port, method, path, body, f"10.2.{n // 256}.{n % 256}")
+                if status >= 400:
+                    raise CommandError(f"{method} {path} answered {status}")
+
+        asyncio.run(run())
+
+    def report(self, cpus, memory_bytes, measured, cpu_fraction, recommendation):
+        self.stdout.write(f"CPUs: {cpus:g}   memory: {memory_bytes / 2**20:.0f} MB")
+        self.stdout.write(
+            f"master: {measured['master'] / 2**20:.1f} MB   worker: "
+            f"{measured['worker'] / 2**20:.1f} MB, growing "
+            f"{measured['growth'] / 1024:.1f} kB per request"
+        )
+        self.stdout.write(f"{'endpoint':<8} {'CPU ms':>8} {'wall ms':>8} {'CPU %':>6}")
+        for name, (cpu, wall) in measured["endpoints"].items():
+            self.stdout.write(
+                f"{name:<8} {cpu * 1000:>8.1f} {wall * 1000:>8.1f} {cpu / wall * 100:>6.0f}"
+            )
+        self.stdout.write(f"mix: {cpu_fraction * 100:.0f}% CPU")
+        self.stdout.write("")
+        self.stdout.write(f'worker_class = "{recommendation.worker_class}"')
+        self.stdout.write(f"workers = {recommendation.workers}")
+        self.stdout.write(f"threads = {recommendation.threads}")
+        self.stdout.write(f"max_requests = {recommendation.max_requests}")
+        self.stdout.write(f"max_requests_jitter = {recommendation.max_requests_jitter}")
+        for note in recommendation.notes:
+            self.stdout.write(f"# {note}")
@@ -0,0 +1,134 @@
+"""
+Management command to report gunicorn worker memory with preload_app off and on.
+Usage: python manage.py worker_memory [--workers 4] [--requests 200] [--preload off,on]
+
+Starts gunicorn with the deployment's server hooks (config.gunicorn_hooks,
+which warm the app and freeze the GC before each fork when preloading) on a
+scratch SQLite database, sends some traffic so every worker has served
+requests, then reads each process's /proc/<pid>/smaps_rollup (Linux only):
+
+- RSS counts every page the process maps, shared or not; summed across
+  workers it overstates the pool
+- PSS splits each shared page between the processes sharing it; summed it
+  is what the pool really costs
+- private is what the process alone holds (what killing it would free)
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from config.rolling_reload import children
+
+from .benchmark_servers import free_port, request, run_manage, server_env, wait_for
+
+# (method, path) pairs cycled through to warm every worker
+TRAFFIC = [
+    ("GET", "/"),
+    ("GET", "/api/health/"),
+    ("GET", "/api/auth/config/"),
+]
+
+
+def memory(pid):
+    """(rss, pss, private) of a process in kB."""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as rollup:
+        for line in rollup:
+            name, _, rest = line.partition(":")
+            if rest.strip().endswith("kB"):
+                values[name] = int(rest.split()[0])
+    return values["Rss"], values["Pss"], values["Private_Clean"] + values["Private_Dirty"]
+
+
+async def traffic(port, total, concurrency):
+    queue = iter(range(total))
+
+    async def client():
+        for n in queue:
+            method, path = TRAFFIC[n % len(TRAFFIC)]
+            await request(port, method, path, None, f"10.1.{n // 256 % 256}.{n % 256}")
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+
+
+class Command(BaseCommand):
+    help = "Report RSS/PSS per gunicorn worker with preload_app off and on"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4, help="Workers per server")
+        parser.add_argument("--requests", type=int, default=200, help="Warm-up requests")
+        parser.add_argument("--preload", default="off,on", help="Of: off, on")
+        parser.add_argument(
+            "--settings-module",
+            default="config.settings.production",
+            help="Settings for the servers (default: config.settings.production)",
+        )
+
+    def handle(self, *args, **options):
+        if not os.path.exists("/proc/self/smaps_rollup"):
+            raise CommandError("Needs Linux's /proc/<pid>/smaps_rollup")
+        variants = options["preload"].split(",")
+        for variant in variants:
+            if variant not in ("off", "on"):
+                raise CommandError(f"Unknown preload setting: {variant}")
+
+        with tempfile.TemporaryDirectory() as scratch:
+            env = server_env(Path(scratch), options["settings_module"])
+            run_manage(env, "migrate", "--verbosity", "0")
+            self.stdout.write(
+                f"{'preload':<8} {'process':<8} {'ready s':>8} {'RSS MB':>8} {'PSS MB':>8} "
+                f"{'private MB':>10}"
+            )
+            for variant in variants:
+                self.measure(variant == "on", env, options)
+
+    def measure(self, preload, env, options):
+        port = free_port()
+        command = [sys.executable, "-m", "gunicorn", "--bind", f"127.0.0.1:{port}"]
+        command += ["--config", "python:config.gunicorn_hooks", "--log-level", "warning"]
+        command += ["--workers", str(options["workers"]), "--worker-class", "sync"]
+        if preload:
+            command.append("--preload")
+        command.append("config.wsgi:application")
+
+        started = time.perf_counter()
+        server = subprocess.Popen(command, cwd=settings.BASE_DIR, env=env)
+        try:
+            wait_for(port, server)
+            ready = time.perf_counter() - started
+            asyncio.run(traffic(port, options["requests"], options["workers"] * 2))
+            time.sleep(1)
+            workers = children(server.pid)
+            self.report(preload, server.pid, workers, ready)
+        finally:
+            server.terminate()
+            server.wait(30)
+
+    def report(self, preload, master, workers, ready):
+        label = "on" if preload else "off"
+        rss, pss, private = memory(master)
+        self.stdout.write(
+            f"{label:<8} {'master':<8} {ready:>8.2f} {rss / 1024:>8.1f} {pss / 1024:>8.1f} "
+            f"{private / 1024:>10.1f}"
+        )
+        totals = [rss, pss, private]
+        for pid in workers:
+            rss, pss, private = memory(pid)
+            totals = [total + value for total, value in zip(totals, (rss, pss, private))]
+            self.stdout.write(
+                f"{label:<8} {pid:<8} {'':>8} {rss / 1024:>8.1f} {pss / 1024:>8.1f} "
+                f"{private / 1024:>10.1f}"
+            )
+        rss, pss, private = totals
+        self.stdout.write(
+            f"{label:<8} {'total':<8} {'':>8} {rss / 1024:>8.1f} {pss / 1024:>8.1f} "
+            f"{private / 1024:>10.1f}"
+        )
@@ -0,0 +1,200 @@
+"""
+Prometheus metrics shared across the apps.
+
+Request latency per URL name and cache hit/miss counts come from
+django-prometheus (enabled in production settings). This module adds the
+application-level metrics it doesn't cover and the /metrics export view.
+
+Under gunicorn, PROMETHEUS_MULTIPROC_DIR is set by config/gunicorn_hooks.py
+so every worker writes its samples to a shared directory and any worker can
+answer a scrape with the totals for the whole pool.
+
+prometheus_client is a production dependency; without it every metric here
+is a no-op so the apps import cleanly in development.
+"""
+
+import hmac
+import os
+import time
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+try:
+    import prometheus_client
+    from prometheus_client import Counter, Gauge, Histogram
+except ImportError:  # pragma: no cover - exercised only without prometheus_client
+    prometheus_client = None
+
+
+class _NoopMetric:
+    """Stand-in that accepts metric calls when prometheus_client is missing."""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, amount=1):
+        pass
+
+    def observe(self, amount):
+        pass
+
+    def set(self, value):
+        pass
+
+
+if prometheus_client is not None:
+    DB_QUERIES_PER_REQUEST = Histogram(
+        "django_db_queries_per_request",
+        "Number of database queries run while handling a request",
+        ["view"],
+        buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, float("inf")),
+    )
+    DB_TIME_PER_REQUEST = Histogram(
+        "django_db_query_seconds_per_request",
+        "Total time spent in database queries while handling a request",
+        ["view"],
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, float("inf")),
+    )
+    THROTTLE_REJECTIONS = Counter(
+        "django_throttle_rejections_total",
+        "Requests rejected by a DRF throttle",
+        ["scope"],
+    )
+    WORKER_RECYCLES = Counter(
+        "gunicorn_worker_recycles_total",
+        "Gunicorn workers that exited, by reason",
+        ["reason"],
+    )
+    DB_POOL_WAIT = Histogram(
+        "django_db_pool_wait_seconds",
+        "Time spent borrowing a connection from a database pool",
+        ["vendor"],
+        buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf")),
+    )
+    DB_POOL_ERRORS = Counter(
+        "django_db_pool_errors_total",
+        "Failures borrowing a pooled database connection, by reason",
+        ["vendor", "reason"],
+    )
+    # Summed over live workers in multiprocess mode
+    DB_POOL_CONNECTIONS = Gauge(
+        "django_db_pool_connections",
+        "Connections open in each worker's database pool, by state",
+        ["vendor", "state"],
+        multiprocess_mode="livesum",
+    )
+else:
+    DB_QUERIES_PER_REQUEST = _NoopMetric()
+    DB_TIME_PER_REQUEST = _NoopMetric()
+    THROTTLE_REJECTIONS = _NoopMetric()
+    WORKER_RECYCLES = _NoopMetric()
+    DB_POOL_WAIT = _NoopMetric()
+    DB_POOL_ERRORS = _NoopMetric()
+    DB_POOL_CONNECTIONS = _NoopMetric()
+
+
+class EmailQueueCollector:
+    """
+    Report contact messages whose notification email has not been sent.
+
+    Email is sent inline, so these are the messages that failed and are
+    waiting for manual follow-up. Evaluated only when scraped, and the count
+    is cached so frequent scrapes cost at most one query per interval.
+    """
+
+    cache_seconds = 60
+
+    def __init__(self):
+        self._value = None
+        self._checked_at = 0.0
+
+    def collect(self):
+        from prometheus_client.core import GaugeMetricFamily
+
+        from apps.contact.models import ContactMessage
+
+        now = time.monotonic()
+        if self._value is None or now - self._checked_at > self.cache_seconds:
+            self._value = ContactMessage.objects.filter(email_sent=False).count()
+            self._checked_at = now
+
+        yield GaugeMetricFamily(
+            "contact_email_queue_depth",
+            "Contact form messages whose notification email has not been sent",
+            value=self._value,
+        )
+
+
+_export_registry = None
+
+
+def get_export_registry():
+    """
+    Return the registry served by /metrics, built once per process.
+
+    In multiprocess mode this aggregates the files written by every worker
+    instead of only this process's in-memory values.
+    """
+    global _export_registry
+    if _export_registry is None:
+        if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            from prometheus_client import multiprocess
+
+            registry = prometheus_client.CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = prometheus_client.REGISTRY
+        registry.register(EmailQueueCollector())
+        _export_registry = registry
+    return _export_registry
+
+
+def metrics_view(request):
+    """
+    Export metrics in the Prometheus text format.
+
+    If METRICS_BEARER_TOKEN is set, scrapers must send it as
+    "Authorization: Bearer <token>".
+    """
+    token = getattr(settings, "METRICS_BEARER_TOKEN", "")
+    if token:
+        supplied = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            return HttpResponseForbidden()
+
+    if prometheus_client is None:
+        return HttpResponse("prometheus_client is not installed\n", status=501)
+
+    output = prometheus_client.generate_latest(get_export_registry())
+    return HttpResponse(output, content_type=prometheus_client.CONTENT_TYPE_LATEST)
+
+
+def compact_dead_process(pid, path=None):
+    """
+    Fold a dead worker's counter and histogram files into shared archives.
+
+    Every recycled worker (max_requests) leaves its files behind so its
+    counts are not lost, and MultiProcessCollector re-reads all of them on
+    each scrape. Merging them into one archive file per type keeps scrape
+    cost proportional to the live workers rather than to every worker the
+    server has ever run. Must only be called from the gunicorn master.
+    """
+    from prometheus_client.mmap_dict import MmapedDict
+
+    path = path or os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not path:
+        return
+
+    for typ in ("counter", "histogram"):
+        source = os.path.join(path, f"{typ}_{pid}.db")
+        if not os.path.exists(source):
+            continue
+        archive = MmapedDict(os.path.join(path, f"{typ}_archive.db"))
+        try:
+            for key, value, timestamp, _ in MmapedDict.read_all_values_from_file(source):
+                total, _ = archive.read_value(key)
+                archive.write_value(key, total + value, timestamp)
+        finally:
+            archive.close()
+        os.remove(source)
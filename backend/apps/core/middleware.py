@@ -0,0 +1,222 @@
+"""
+Request middleware shared across the apps
+"""
+
+import json
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.functional import SimpleLazyObject, empty
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from .metrics import DB_QUERIES_PER_REQUEST, DB_TIME_PER_REQUEST
+from .querywrappers import execute_wrapper
+from .timing import (
+    atimed,
+    current_timer,
+    instrument_cache,
+    start_timer,
+    stop_timer,
+    timed,
+)
+
+access_logger = logging.getLogger("apps.core.access")
+
+
+def view_label(request):
+    """Return the URL name of the matched view, for low-cardinality metric labels."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<unresolved>"
+    return match.view_name or "<unnamed>"
+
+
+class HybridMiddleware:
+    """
+    Base for middleware that runs natively under both WSGI and ASGI.
+
+    Subclasses implement handle(request) and ahandle(request). Django builds
+    the chain in whichever mode the next handler uses, so under ASGI the
+    request stays on the event loop through this layer instead of hopping
+    into a thread and back. Hooks with an async twin (aprocess_view,
+    aprocess_template_response) are swapped in under ASGI for the same reason.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+            for hook in ("process_view", "process_template_response"):
+                if hasattr(self, f"a{hook}"):
+                    setattr(self, hook, getattr(self, f"a{hook}"))
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.ahandle(request)
+        return self.handle(request)
+
+
+class QueryMetricsMiddleware(HybridMiddleware):
+    """
+    Record how many database queries each request ran and how long they took.
+
+    Uses an execute wrapper, so it works with DEBUG off and costs one
+    perf_counter pair per query. It is request-scoped (apps.core.querywrappers)
+    so that under ASGI it also sees the queries the async ORM runs in threads.
+    """
+
+    def handle(self, request):
+        stats = [0, 0.0]
+        with execute_wrapper(self.recorder(stats)):
+            response = self.get_response(request)
+        return self.observe(request, response, stats)
+
+    async def ahandle(self, request):
+        stats = [0, 0.0]
+        with execute_wrapper(self.recorder(stats)):
+            response = await self.get_response(request)
+        return self.observe(request, response, stats)
+
+    @staticmethod
+    def recorder(stats):
+        def record(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                stats[0] += 1
+                stats[1] += time.perf_counter() - start
+
+        return record
+
+    def observe(self, request, response, stats):
+        view = view_label(request)
+        DB_QUERIES_PER_REQUEST.labels(view=view).observe(stats[0])
+        DB_TIME_PER_REQUEST.labels(view=view).observe(stats[1])
+        return response
+
+
+class ServerTimingMiddleware(HybridMiddleware):
+    """
+    Break a request's time down by phase in a Server-Timing header.
+
+    Phases: session (load), auth (user lookup), view, db, cache, serialize,
+    render and total. Browser devtools show them next to the SPA's fetches.
+
+    Only SERVER_TIMING_SAMPLE_RATE of requests are timed; the rest pay one
+    random() call. With SERVER_TIMING_ACCESS_LOG the timings are also logged
+    as one JSON line per timed request to the "apps.core.access" logger.
+
+    Must be the first middleware so "total" covers the others.
+    """
+
+    def handle(self, request):
+        if not self.sampled():
+            return self.get_response(request)
+
+        timer, token = start_timer()
+        try:
+            with execute_wrapper(timed_query):
+                response = self.get_response(request)
+            timer.end("view")
+        finally:
+            stop_timer(token)
+        return self.finish(request, response, timer)
+
+    async def ahandle(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        timer, token = start_timer()
+        try:
+            with execute_wrapper(timed_query):
+                response = await self.get_response(request)
+            timer.end("view")
+        finally:
+            stop_timer(token)
+        return self.finish(request, response, timer)
+
+    def sampled(self):
+        rate = getattr(settings, "SERVER_TIMING_SAMPLE_RATE", 0.0)
+        return rate > 0 and (rate >= 1 or random.random() < rate)
+
+    def finish(self, request, response, timer):
+        existing = response.get("Server-Timing")
+        header = timer.header()
+        response["Server-Timing"] = f"{existing}, {header}" if existing else header
+
+        if getattr(settings, "SERVER_TIMING_ACCESS_LOG", False):
+            access_logger.info(
+                json.dumps(
+                    {
+                        "method": request.method,
+                        "path": request.path,
+                        "view": view_label(request),
+                        "status": response.status_code,
+                        "timings_ms": timer.as_dict(),
+                    }
+                )
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        return self.instrument(request)
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        return self.instrument(request)
+
+    def instrument(self, request):
+        timer = current_timer()
+        if timer is None:
+            return None
+
+        # Session and user are loaded lazily on first access, usually inside
+        # the view (DRF authentication), so wrap their loaders in place. Sync
+        # views use load() and request.user, async ones aload() and auser().
+        session = getattr(request, "session", None)
+        if session is not None and not hasattr(session, "_session_cache"):
+            session.load = timed("session", session.load)
+            session.aload = atimed("session", session.aload)
+        user = request.__dict__.get("user")
+        if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+            # LazyObject.__setattr__ would evaluate the user, so set it directly
+            user.__dict__["_setupfunc"] = timed("auth", user._setupfunc)
+        if hasattr(request, "auser") and not hasattr(request, "_acached_user"):
+            request.auser = atimed("auth", request.auser)
+        for alias in settings.CACHES:
+            instrument_cache(caches[alias])
+
+        timer.begin("view")
+        return None
+
+    def process_template_response(self, request, response):
+        return self.time_render(response)
+
+    async def aprocess_template_response(self, request, response):
+        return self.time_render(response)
+
+    def time_render(self, response):
+        timer = current_timer()
+        if timer is not None:
+            # DRF and template responses render after the view returns
+            timer.end("view")
+            timer.begin("render")
+            response.add_post_render_callback(lambda response: timer.end("render"))
+        return response
+
+
+def timed_query(execute, sql, params, many, context):
+    """execute_wrapper that records each query as the "db" phase."""
+    timer = current_timer()
+    if timer is None:
+        return execute(sql, params, many, context)
+    with timer.phase("db"):
+        return execute(sql, params, many, context)
@@ -0,0 +1,277 @@
+"""
+Statistical stack sampling for profiling in production.
+
+A sampler thread reads other threads' stacks with sys._current_frames()
+and counts them in collapsed form ("outer;inner;leaf count" per line),
+which flamegraph.pl, speedscope and inferno read directly. Nothing runs on
+the sampled threads, so overhead is bounded by how often the sampler wakes.
+
+Two modes:
+
+- Per request: ProfilingMiddleware samples one request's thread when it
+  carries a valid X-Profile-Token header (see `manage.py profile_token`) or
+  a staff user adds ?_profile=1, and returns the collapsed stacks instead
+  of the response.
+- Per worker: with PROFILING_WORKER_SAMPLER each worker samples all of its
+  threads continuously, keeping its own cost under PROFILING_OVERHEAD_BUDGET,
+  and writes a stack file into PROFILING_DIR every PROFILING_FLUSH_INTERVAL
+  seconds (oldest files beyond PROFILING_MAX_FILES are removed).
+  `manage.py merge_profiles` merges the files across workers.
+"""
+
+import atexit
+import glob
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core import signing
+from django.http import HttpResponse
+
+from .middleware import HybridMiddleware
+
+# Per-request sampling interval: requests are short, so sample densely
+REQUEST_INTERVAL = 0.001
+
+_TOKEN_SALT = "apps.core.profiling"
+
+
+def collapse_stack(frame):
+    """Format a frame's stack root-first as "module:function;..."."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        module = frame.f_globals.get("__name__", code.co_filename)
+        names.append(f"{module}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def format_collapsed(stacks):
+    """Render a Counter of collapsed stacks as flamegraph input."""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def parse_collapsed(text, into=None):
+    """Add the counts from collapsed-stack text to a Counter."""
+    stacks = into if into is not None else Counter()
+    for line in text.splitlines():
+        stack, _, count = line.rpartition(" ")
+        if stack and count.isdigit():
+            stacks[stack] += int(count)
+    return stacks
+
+
+class StackSampler:
+    """
+    Sample thread stacks from a background thread.
+
+    With `thread_id` only that thread is sampled, otherwise every thread
+    but the sampler. The sleep between samples stretches so the sampler's
+    own time stays under `budget` (a fraction of wall time).
+    """
+
+    def __init__(self, interval, thread_id=None, budget=None):
+        self.interval = interval
+        self.thread_id = thread_id
+        self.budget = budget
+        self.stacks = Counter()
+        self.samples = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        return False
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            self.sample(own_id)
+            cost = time.perf_counter() - started
+            delay = self.interval
+            if self.budget:
+                delay = max(delay, cost / self.budget)
+            self._stop.wait(delay)
+
+    def sample(self, own_id=None):
+        frames = sys._current_frames()
+        if self.thread_id is not None:
+            frames = {self.thread_id: frames.get(self.thread_id)}
+        with self._lock:
+            for thread_id, frame in frames.items():
+                if frame is not None and thread_id != own_id:
+                    self.stacks[collapse_stack(frame)] += 1
+            self.samples += 1
+
+    def drain(self):
+        """Return the stacks counted so far and start a new count."""
+        with self._lock:
+            stacks, self.stacks = self.stacks, Counter()
+        return stacks
+
+
+class WorkerProfiler:
+    """Continuous per-process sampler that writes rotating stack files."""
+
+    def __init__(self, directory, interval, budget, flush_interval, max_files):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.max_files = max_files
+        self.sampler = StackSampler(interval, budget=budget)
+        self._flusher = None
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self.sampler.start()
+        self._flusher = threading.Thread(target=self._run, name="stack-flusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.flush)
+        return self
+
+    def _run(self):
+        while not self.sampler._stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Write the stacks counted since the last flush and rotate old files."""
+        stacks = self.sampler.drain()
+        if not stacks:
+            return None
+        path = os.path.join(self.directory, f"worker-{os.getpid()}-{time.time():.0f}.folded")
+        with open(path, "w") as f:
+            f.write(format_collapsed(stacks))
+        self.rotate()
+        return path
+
+    def rotate(self):
+        files = sorted(glob.glob(os.path.join(self.directory, "*.folded")), key=os.path.getmtime)
+        for path in files[: max(len(files) - self.max_files, 0)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+_worker_profiler = None
+_worker_profiler_pid = None
+_worker_profiler_lock = threading.Lock()
+
+
+def ensure_worker_profiler():
+    """Start this process's worker sampler once (after fork, per pid)."""
+    global _worker_profiler, _worker_profiler_pid
+    if _worker_profiler_pid == os.getpid():
+        return _worker_profiler
+    with _worker_profiler_lock:
+        if _worker_profiler_pid != os.getpid():
+            _worker_profiler = WorkerProfiler(
+                settings.PROFILING_DIR,
+                interval=settings.PROFILING_WORKER_INTERVAL,
+                budget=settings.PROFILING_OVERHEAD_BUDGET,
+                flush_interval=settings.PROFILING_FLUSH_INTERVAL,
+                max_files=settings.PROFILING_MAX_FILES,
+            ).start()
+            _worker_profiler_pid = os.getpid()
+    return _worker_profiler
+
+
+def make_profile_token():
+    """Create a token for the X-Profile-Token header."""
+    return signing.TimestampSigner(salt=_TOKEN_SALT).sign("profile")
+
+
+def valid_profile_token(token):
+    try:
+        signing.TimestampSigner(salt=_TOKEN_SALT).unsign(
+            token, max_age=settings.PROFILING_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return False
+    return True
+
+
+class ProfilingMiddleware(HybridMiddleware):
+    """
+    Profile single requests on demand, and start the worker sampler.
+
+    Must come after AuthenticationMiddleware so the staff switch can see
+    the user. Under ASGI the sampled thread is the event loop's, which runs
+    the async views; work they hand to threads (sync_to_async) is not seen.
+    """
+
+    def handle(self, request):
+        if settings.PROFILING_WORKER_SAMPLER:
+            ensure_worker_profiler()
+
+        if not self.should_profile(request):
+            return self.get_response(request)
+
+        sampler = StackSampler(REQUEST_INTERVAL, thread_id=threading.get_ident())
+        started = time.perf_counter()
+        with sampler:
+            response = self.get_response(request)
+            if hasattr(response, "render") and not response.is_rendered:
+                response.render()
+        return self.profile_response(sampler, started, response)
+
+    async def ahandle(self, request):
+        if settings.PROFILING_WORKER_SAMPLER:
+            ensure_worker_profiler()
+
+        if not await self.ashould_profile(request):
+            return await self.get_response(request)
+
+        sampler = StackSampler(REQUEST_INTERVAL, thread_id=threading.get_ident())
+        started = time.perf_counter()
+        with sampler:
+            response = await self.get_response(request)
+            if hasattr(response, "render") and not response.is_rendered:
+                response.render()
+        return self.profile_response(sampler, started, response)
+
+    def profile_response(self, sampler, started, response):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        profile = HttpResponse(format_collapsed(sampler.stacks), content_type="text/plain")
+        profile["X-Profile-Samples"] = str(sampler.samples)
+        profile["X-Profile-Duration-Ms"] = f"{elapsed_ms:.1f}"
+        profile["X-Profile-Status"] = str(response.status_code)
+        return profile
+
+    def should_profile(self, request):
+        token = request.headers.get("X-Profile-Token")
+        if token:
+            return valid_profile_token(token)
+        if request.GET.get("_profile") == "1":
+            user = getattr(request, "user", None)
+            return bool(user is not None and user.is_staff)
+        return False
+
+    async def ashould_profile(self, request):
+        token = request.headers.get("X-Profile-Token")
+        if token:
+            return valid_profile_token(token)
+        if request.GET.get("_profile") == "1" and hasattr(request, "auser"):
+            user = await request.auser()
+            return user.is_staff
+        return False
@@ -0,0 +1,249 @@
+"""
+Read-only fast path for ModelSerializer output.
+
+Serializing a list with a ModelSerializer builds a model instance per row
+and walks every field's get_attribute()/to_representation(). For reads of
+plain column fields neither is needed: Projection takes a serializer's
+readable fields, selects just their columns with values_list(), and builds
+each output dict straight from the row tuple. Fields the default model
+mapping would produce (str for CharField, bool for BooleanField, ...) are
+copied as-is; anything else (datetimes, custom fields) still goes through
+the field's own to_representation(), so the output is the same as the
+serializer's.
+
+Serializers with fields that aren't plain columns (relations, methods,
+properties, source="*") aren't supported; Projection.for_serializer()
+returns None for them and callers fall back to the serializer.
+"""
+
+import itertools
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+
+from rest_framework import ISO_8601, serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.field_mapping import ClassLookupDict
+
+from .timing import phase
+
+# Serializer fields whose to_representation() returns database values unchanged
+_PASSTHROUGH = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.EmailField,
+    serializers.IntegerField,
+    serializers.ReadOnlyField,
+)
+_default_fields = ClassLookupDict(serializers.ModelSerializer.serializer_field_mapping)
+
+_projections = {}
+
+
+class Unsupported(Exception):
+    """A serializer field that isn't a plain model column."""
+
+
+class Projection:
+    """A ModelSerializer's read output, built from values_list() rows."""
+
+    def __init__(self, serializer_class, fields=None):
+        model = serializer_class.Meta.model
+        self.names, self.columns = [], []
+        # (index, serializer field) for the columns that need converting
+        self.converters = []
+        for name, field in serializer_class().fields.items():
+            if field.write_only or (fields is not None and name not in fields):
+                continue
+            if len(field.source_attrs) != 1:
+                raise Unsupported(name)
+            try:
+                model_field = model._meta.get_field(field.source_attrs[0])
+            except FieldDoesNotExist:
+                raise Unsupported(name)
+            if not model_field.concrete or model_field.is_relation:
+                raise Unsupported(name)
+
+            try:
+                default = _default_fields[model_field]
+            except KeyError:
+                default = None
+            if type(field) not in _PASSTHROUGH or type(field) is not default:
+                self.converters.append((len(self.names), field))
+            self.names.append(name)
+            self.columns.append(model_field.attname)
+
+    @classmethod
+    def for_serializer(cls, serializer_class, fields=None):
+        """
+        The (cached) Projection for a serializer class, optionally of just some
+        of its fields, or None if unsupported.
+        """
+        key = (serializer_class, fields)
+        try:
+            return _projections[key]
+        except KeyError:
+            pass
+        try:
+            projection = cls(serializer_class, fields)
+        except Unsupported:
+            projection = None
+        _projections[key] = projection
+        return projection
+
+    def rows(self, queryset):
+        """The queryset selecting only the projected columns, as tuples."""
+        if not self.columns:
+            # values_list() with no names would select every column
+            raise ValueError("A projection needs at least one column")
+        return queryset.values_list(*self.columns)
+
+    def represent(self, rows):
+        """Output dicts for rows from rows(), as serializer.data would give them."""
+        names = self.names
+        tz = timezone.get_current_timezone() if settings.USE_TZ else None
+        converters = [(index, _converter(field, tz)) for index, field in self.converters]
+        data = []
+        with phase("serialize"):
+            for row in rows:
+                if converters:
+                    row = list(row)
+                    for index, convert in converters:
+                        if row[index] is not None:
+                            row[index] = convert(row[index])
+                data.append(dict(zip(names, row)))
+        return data
+
+    def stream(self, queryset, chunk_size=2000):
+        """Yield output dicts without loading the queryset at once (for exports)."""
+        rows = self.rows(queryset).iterator(chunk_size=chunk_size)
+        while chunk := list(itertools.islice(rows, chunk_size)):
+            yield from self.represent(chunk)
+
+
+def _converter(field, tz):
+    """
+    A field's to_representation(); for ISO 8601 DateTimeFields, inlined with
+    the current timezone looked up once rather than per value.
+    """
+    if type(field) is not serializers.DateTimeField or hasattr(field, "timezone"):
+        return field.to_representation
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    if not isinstance(output_format, str) or output_format.lower() != ISO_8601 or tz is None:
+        return field.to_representation
+
+    def convert(value):
+        if isinstance(value, str) or timezone.is_naive(value):
+            return field.to_representation(value)
+        value = value.astimezone(tz).isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+    return convert
+
+
+class ProjectedListMixin:
+    """
+    For generic list views: serve GET lists through the serializer's
+    Projection when it has one, with the view's filtering and pagination.
+    """
+
+    def get_sparse_fields(self):
+        """Names of the fields to output, or None for all (see SparseFieldsMixin)."""
+        return None
+
+    def get_projection(self):
+        return Projection.for_serializer(self.get_serializer_class(), self.get_sparse_fields())
+
+    def serialize_list(self, queryset):
+        """Output for a whole queryset, projected when possible."""
+        projection = self.get_projection()
+        if projection is None:
+            return self.get_serializer(queryset, many=True).data
+        return projection.represent(projection.rows(queryset))
+
+    def list(self, request, *args, **kwargs):
+        projection = self.get_projection()
+        if projection is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(projection.rows(queryset))
+        if page is not None:
+            return self.get_paginated_response(projection.represent(page))
+        return Response(self.serialize_list(queryset))
+
+
+class SparseFieldsMixin:
+    """
+    For generic views: ?fields=a,b (only these) and ?omit=c (all but these)
+    on GET, trimming the serializer's output and the selected columns (via
+    .only(), or the projection for ProjectedListMixin lists).
+
+    Only names in `sparse_fields` are accepted, by default the serializer's
+    readable fields; anything else is a 400, so query parameters can't reach
+    model attributes the serializer doesn't expose. Writes ignore both
+    parameters.
+    """
+
+    sparse_fields = None
+
+    def get_sparse_fields(self):
+        """The requested field names in serializer order, or None for all."""
+        if not hasattr(self, "_sparse_fields"):
+            self._sparse_fields = self._parse_sparse_fields()
+        return self._sparse_fields
+
+    def _parse_sparse_fields(self):
+        params = self.request.query_params
+        if self.request.method not in SAFE_METHODS or not ("fields" in params or "omit" in params):
+            return None
+
+        readable = [
+            name
+            for name, field in self.get_serializer_class()().fields.items()
+            if not field.write_only
+        ]
+        allowed = [
+            name for name in readable if self.sparse_fields is None or name in self.sparse_fields
+        ]
+        requested = {
+            param: {name.strip() for name in params[param].split(",") if name.strip()}
+            for param in ("fields", "omit")
+            if param in params
+        }
+        errors = {
+            param: [f"Unknown field: {name}" for name in sorted(names - set(allowed))]
+            for param, names in requested.items()
+            if names - set(allowed)
+        }
+        if errors:
+            raise ValidationError(errors)
+
+        selected = requested.get("fields", allowed)
+        omitted = requested.get("omit", set())
+        fields = tuple(name for name in allowed if name in selected and name not in omitted)
+        if not fields:
+            raise ValidationError({"fields": ["Select at least one field."]})
+        return fields
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            target = getattr(serializer, "child", serializer)
+            for name in [name for name in target.fields if name not in fields]:
+                del target.fields[name]
+        return serializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            projection = Projection.for_serializer(self.get_serializer_class(), fields)
+            if projection is not None:
+                queryset = queryset.only(*projection.columns)
+        return queryset
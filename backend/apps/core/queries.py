@@ -0,0 +1,155 @@
+"""
+SQL statement recording and N+1 detection.
+
+QueryRecorder captures every statement run on the database connections
+while it is active (through an execute wrapper, so it works with DEBUG off,
+and in the threads the async ORM runs queries in),
+fingerprints each one by its shape, and reports:
+
+- repeated shapes: the same statement with different parameters run many
+  times, the signature of an N+1 loop
+- duplicates: the exact same statement and parameters run more than once
+
+QueryInspectorMiddleware applies it to every request in DEBUG, and
+apps.core.testing.QueryBudgetMixin pins per-endpoint budgets in tests.
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+
+from .middleware import HybridMiddleware
+from .querywrappers import execute_wrapper
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:%s|\?|[-\w.']+)\s*,?)+\)", re.IGNORECASE)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """
+    Reduce a statement to its shape.
+
+    Literals and placeholders become "?" and IN lists collapse to one
+    entry, so `WHERE id IN (1, 2)` and `WHERE id IN (3, 4, 5)` match.
+    """
+    shape = _STRING.sub("?", sql)
+    shape = _IN_LIST.sub("IN (...)", shape)
+    shape = _NUMBER.sub("?", shape).replace("%s", "?")
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryProblem(Exception):
+    """Raised in "raise" mode when a request repeats queries."""
+
+
+class QueryRecorder:
+    """
+    Record every statement run while the recorder is active.
+
+    Usage:
+        with QueryRecorder() as recorder:
+            ...
+        recorder.count, recorder.repeated(), recorder.duplicates()
+    """
+
+    def __init__(self, using=None):
+        self.using = using
+        self.queries = []
+        self._stack = None
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        self._stack.enter_context(execute_wrapper(self._record))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+        return False
+
+    def _record(self, execute, sql, params, many, context):
+        if self.using and context["connection"].alias != self.using:
+            return execute(sql, params, many, context)
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                {
+                    "sql": sql,
+                    "params": params,
+                    "time": time.perf_counter() - start,
+                    "fingerprint": fingerprint(sql),
+                }
+            )
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    def repeated(self, threshold=None):
+        """Return {fingerprint: count} for shapes run at least `threshold` times."""
+        if threshold is None:
+            threshold = getattr(settings, "QUERY_INSPECTOR_REPEAT_THRESHOLD", 5)
+        shapes = Counter(query["fingerprint"] for query in self.queries)
+        return {shape: count for shape, count in shapes.items() if count >= threshold}
+
+    def duplicates(self):
+        """Return {sql: count} for identical statements and parameters run more than once."""
+        statements = Counter((query["sql"], repr(query["params"])) for query in self.queries)
+        return {sql: count for (sql, _), count in statements.items() if count > 1}
+
+    def problems(self, threshold=None):
+        """Describe repeated shapes and duplicates, one line each."""
+        lines = [
+            f"{count}x repeated shape: {shape}" for shape, count in self.repeated(threshold).items()
+        ]
+        lines += [f"{count}x duplicate: {sql}" for sql, count in self.duplicates().items()]
+        return lines
+
+
+class QueryInspectorMiddleware(HybridMiddleware):
+    """
+    Flag N+1 and duplicate queries per request while DEBUG is on.
+
+    QUERY_INSPECTOR_MODE chooses what happens: "log" (warning per problem),
+    "raise" (QueryProblem, so it can't be missed in development) or "off".
+    """
+
+    def handle(self, request):
+        if not self.enabled():
+            return self.get_response(request)
+
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        return self.inspect(request, response, recorder)
+
+    async def ahandle(self, request):
+        if not self.enabled():
+            return await self.get_response(request)
+
+        with QueryRecorder() as recorder:
+            response = await self.get_response(request)
+        return self.inspect(request, response, recorder)
+
+    def enabled(self):
+        return settings.DEBUG and getattr(settings, "QUERY_INSPECTOR_MODE", "log") != "off"
+
+    def inspect(self, request, response, recorder):
+        mode = getattr(settings, "QUERY_INSPECTOR_MODE", "log")
+        problems = recorder.problems()
+        if problems:
+            message = f"{request.method} {request.path} ran {recorder.count} queries: " + "; ".join(
+                problems
+            )
+            if mode == "raise":
+                raise QueryProblem(message)
+            logger.warning(message)
+        return response
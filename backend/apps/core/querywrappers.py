@@ -0,0 +1,42 @@
+"""
+Database execute wrappers that follow a request into other threads.
+
+connection.execute_wrapper() installs a wrapper on one thread's
+connection: `connections` is thread-local, so under ASGI the queries the
+async ORM and sync_to_async() run in worker threads go through other
+DatabaseWrapper objects and never reach it. execute_wrapper() here keeps
+the wrapper in a ContextVar instead, which asgiref copies into those
+threads, and every connection runs the current context's wrappers through
+dispatch(), added to each connection as it is created (CoreConfig.ready()).
+"""
+
+import contextvars
+import functools
+from contextlib import contextmanager
+
+_wrappers = contextvars.ContextVar("execute_wrappers", default=())
+
+
+@contextmanager
+def execute_wrapper(wrapper):
+    """Run `wrapper` around every query in this context, on any connection and thread."""
+    token = _wrappers.set(_wrappers.get() + (wrapper,))
+    try:
+        yield
+    finally:
+        _wrappers.reset(token)
+
+
+def dispatch(execute, sql, params, many, context):
+    wrappers = _wrappers.get()
+    # The first installed runs outermost, as with connection.execute_wrapper()
+    for wrapper in reversed(wrappers):
+        execute = functools.partial(wrapper, execute)
+    return execute(sql, params, many, context)
+
+
+def install(connection, **kwargs):
+    """connection_created receiver: add dispatch() to the connection once."""
+    if dispatch not in connection.execute_wrappers:
+        # First, so that connection.execute_wrapper()'s pop() on exit can't remove it
+        connection.execute_wrappers.insert(0, dispatch)
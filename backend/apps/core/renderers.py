@@ -0,0 +1,86 @@
+"""
+Fast JSON and optional MessagePack renderers/parsers for DRF.
+
+ORJSONRenderer produces the same bytes as DRF's JSONRenderer with the
+default settings (compact, UTF-8, U+2028/U+2029 escaped): orjson encodes
+the builtin types, and everything else (datetimes, Decimal, lazy
+translation strings, querysets, ...) goes through DRF's own encoder.
+
+MessagePackRenderer/Parser add application/msgpack for internal clients
+that ask for it with Accept/Content-Type; they need the msgpack package
+and are only enabled when it's installed (see REST_FRAMEWORK in settings).
+"""
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+import orjson
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional
+    msgpack = None
+
+# Datetimes go to DRF's encoder too, for its "Z" suffix and naive handling
+_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+_default = JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+    """Render JSON with orjson, byte-compatible with DRF's JSONRenderer."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        options = _OPTIONS
+        # orjson only indents by two spaces, whatever indent was asked for
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+        content = orjson.dumps(data, default=_default, option=options)
+        # Valid JSON but not valid JavaScript; escaped as DRF does
+        if b"\xe2\x80\xa8" in content or b"\xe2\x80\xa9" in content:
+            content = content.replace(b"\xe2\x80\xa8", b"\\u2028")
+            content = content.replace(b"\xe2\x80\xa9", b"\\u2029")
+        return content
+
+
+class ORJSONParser(BaseParser):
+    """Parse JSON request bodies with orjson."""
+
+    media_type = "application/json"
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Render application/msgpack, with the same values as the JSON output."""
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=_default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    """Parse application/msgpack request bodies."""
+
+    media_type = "application/msgpack"
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (msgpack.UnpackException, ValueError) as exc:
+            raise ParseError(f"MessagePack parse error - {exc}")
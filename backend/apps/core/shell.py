@@ -0,0 +1,93 @@
+"""
+Prebuilt SPA shell for the React catch-all route.
+
+index.html is nearly the same for every visitor: the CSRF token is read
+from the csrftoken cookie by the inline script, and the auth method, debug
+flag and auth config are fixed per deploy. So the template is rendered
+once per process (again only when the Vite build changes), compressed with
+gzip and brotli, and served with an ETag; repeat loads get a 304.
+
+The one per-visitor part is the bootstrap user: anonymous visitors get the
+prebuilt bytes (currentUser: null), signed-in users get their serialized
+user spliced in at USER_MARKER, so the SPA starts without API round trips.
+"""
+
+import gzip
+import threading
+
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from apps.authentication.views import get_auth_config
+
+from .compression import Precompressed, etag_for, negotiate
+from .renderers import ORJSONRenderer
+from .templatetags.vite_assets import get_manifest
+
+# Evaluates to null, so the shell works unmodified for anonymous visitors
+USER_MARKER = "/*user*/null"
+
+# Keep JSON from closing the inline <script> (as the json_script filter does)
+_SCRIPT_ESCAPES = {ord("<"): "\\u003C", ord(">"): "\\u003E", ord("&"): "\\u0026"}
+
+
+def script_json(data):
+    """
+    Serialize data for an inline script exactly as the API renders it.
+    """
+    return ORJSONRenderer().render(data).decode().translate(_SCRIPT_ESCAPES)
+
+
+class SPAShell(Precompressed):
+    """The rendered shell, precompressed, with the USER_MARKER split point."""
+
+    def __init__(self, html):
+        super().__init__(html.encode())
+        self.prefix, marker, self.suffix = self.content.partition(USER_MARKER.encode())
+        self.personalizable = bool(marker)
+
+    def personalize(self, user_json, accept_encoding):
+        """
+        Splice a user into the shell; returns (body, encoding, etag).
+
+        Compressed on the fly, gzip only (the page is a few KB), since the
+        body is per user.
+        """
+        content = self.prefix + user_json.encode() + self.suffix
+        encoding = negotiate(accept_encoding, ("gzip",))
+        etag = etag_for(content, encoding)
+        if encoding == "gzip":
+            content = gzip.compress(content, compresslevel=6, mtime=0)
+        return content, encoding, etag
+
+
+def render_shell():
+    return SPAShell(
+        render_to_string(
+            "index.html",
+            {
+                "debug": settings.DEBUG,
+                "auth_method": settings.AUTH_METHOD,
+                "csrf_cookie_name": settings.CSRF_COOKIE_NAME,
+                "auth_config": mark_safe(script_json(get_auth_config())),
+                "current_user": mark_safe(USER_MARKER),
+            },
+        )
+    )
+
+
+_shell = None
+_shell_key = None
+_shell_lock = threading.Lock()
+
+
+def get_shell():
+    """Return the shell, rebuilding it when the Vite build has changed."""
+    global _shell, _shell_key
+    manifest = get_manifest()
+    if _shell is None or _shell_key is not manifest:
+        with _shell_lock:
+            if _shell is None or _shell_key is not manifest:
+                _shell, _shell_key = render_shell(), manifest
+    return _shell
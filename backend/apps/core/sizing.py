@@ -0,0 +1,194 @@
+"""
+Gunicorn worker sizing from host resources and a measured workload.
+
+Used by `manage.py size_workers`. The host side reads how much CPU and
+memory this process may really use: the CPUs it may run on, capped by a
+cgroup CPU quota, and physical memory capped by a cgroup memory limit
+(cgroup v2 or v1, as containers and systemd's MemoryMax/CPUQuota set them).
+
+The workload side is the fraction of a request's wall time spent on CPU,
+measured by the command. At fraction f one request keeps a core busy only
+f of the time, so 1/f requests in flight per core saturate it:
+
+- mostly CPU (password hashing): sync workers, about one per core; more
+  in flight only queue for the GIL and the core
+- mostly waiting (database, SMTP): gthread workers, one per core for
+  parallelism, with enough threads to cover the waits
+
+Memory caps the worker count, and the measured growth per request sets
+max_requests so a worker is recycled before it outgrows its share.
+"""
+
+import math
+import os
+from dataclasses import dataclass
+
+# Values at or above this mean "no limit" in cgroup v1 (page-rounded 2**63 - 1)
+_UNLIMITED = 2**60
+
+
+def _read(path):
+    try:
+        with open(path) as file:
+            return file.read().strip()
+    except OSError:
+        return None
+
+
+def _cgroup_dirs(root, controller, proc_cgroup):
+    """Candidate directories for `controller`, most specific first."""
+    relative = {}
+    for line in (_read(proc_cgroup) or "").splitlines():
+        _, controllers, path = line.split(":", 2)
+        for name in controllers.split(",") if controllers else [""]:
+            relative[name] = path
+    # cgroup v2: one unified hierarchy ("0::/path")
+    if "" in relative:
+        yield os.path.join(root, relative[""].lstrip("/"))
+    # cgroup v1: one hierarchy per controller, possibly mounted co-located
+    for mount in (controller, f"{controller},cpuacct", f"cpuacct,{controller}"):
+        if controller in relative:
+            yield os.path.join(root, mount, relative[controller].lstrip("/"))
+        yield os.path.join(root, mount)
+    yield root
+
+
+def cpu_limit(root="/sys/fs/cgroup", proc_cgroup="/proc/self/cgroup"):
+    """CPUs this process may use (fractional under a CPU quota)."""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    for directory in _cgroup_dirs(root, "cpu", proc_cgroup):
+        quota = _read(os.path.join(directory, "cpu.max"))
+        if quota:
+            limit, _, period = quota.partition(" ")
+            if limit != "max":
+                return min(cpus, int(limit) / int(period))
+            break
+        quota = _read(os.path.join(directory, "cpu.cfs_quota_us"))
+        if quota:
+            if int(quota) > 0:
+                period = _read(os.path.join(directory, "cpu.cfs_period_us"))
+                return min(cpus, int(quota) / int(period))
+            break
+    return float(cpus)
+
+
+def memory_limit(root="/sys/fs/cgroup", proc_cgroup="/proc/self/cgroup", meminfo="/proc/meminfo"):
+    """Bytes of memory this process may use: the cgroup limit, or physical memory."""
+    total = None
+    for line in (_read(meminfo) or "").splitlines():
+        if line.startswith("MemTotal:"):
+            total = int(line.split()[1]) * 1024
+    for directory in _cgroup_dirs(root, "memory", proc_cgroup):
+        for name in ("memory.max", "memory.limit_in_bytes"):
+            limit = _read(os.path.join(directory, name))
+            if limit and limit != "max" and int(limit) < _UNLIMITED:
+                return min(int(limit), total) if total else int(limit)
+    return total
+
+
+@dataclass
+class Recommendation:
+    worker_class: str
+    workers: int
+    threads: int
+    max_requests: int
+    max_requests_jitter: int
+    notes: list
+
+
+def recommend(
+    cpus,
+    memory_bytes,
+    master_bytes,
+    worker_bytes,
+    growth_per_request,
+    cpu_fraction,
+    memory_fraction=0.75,
+    max_threads=32,
+):
+    """
+    Recommend gunicorn settings.
+
+    `worker_bytes` is one worker's memory and `growth_per_request` how much
+    it grows per request; `memory_fraction` of `memory_bytes` is the
+    budget for the master and workers together.
+    """
+    notes = []
+    cores = max(1, math.ceil(cpus))
+    cpu_fraction = min(1.0, max(cpu_fraction, 0.01))
+    # Requests in flight that keep every core busy
+    in_flight = math.ceil(cpus / cpu_fraction)
+
+    budget = memory_bytes * memory_fraction - master_bytes
+    memory_workers = max(1, int(budget // worker_bytes))
+
+    if cpu_fraction >= 0.5:
+        # One worker per core, and one spare to cover the waits
+        worker_class, threads, workers = "sync", 1, cores + 1
+    else:
+        worker_class = "gthread"
+        workers = cores
+        threads = min(max_threads, math.ceil(in_flight / workers))
+    if workers > memory_workers:
+        notes.append(
+            f"memory allows {memory_workers} workers of {worker_bytes / 2**20:.0f} MB, "
+            f"not {workers}"
+        )
+        workers = memory_workers
+        if worker_class == "gthread":
+            threads = min(max_threads, math.ceil(in_flight / workers))
+    if worker_class == "gthread" and threads >= max_threads:
+        notes.append("threads capped: at this little CPU per request, the ASGI server may suit")
+
+    # Recycle a worker before it has grown into the memory left for it
+    headroom = max(budget / workers - worker_bytes, worker_bytes * 0.25)
+    if growth_per_request > 0:
+        max_requests = int(min(20000, max(500, headroom / growth_per_request)))
+    else:
+        max_requests = 10000
+    max_requests = int(round(max_requests, -2)) or 500
+    return Recommendation(
+        worker_class, workers, threads, max_requests, max(1, max_requests // 20), notes
+    )
+
+
+def config_settings(recommendation):
+    """Gunicorn config lines for a recommendation, by setting name."""
+    return {
+        "worker_class": f'"{recommendation.worker_class}"',
+        "workers": str(recommendation.workers),
+        "threads": str(recommendation.threads),
+        "max_requests": str(recommendation.max_requests),
+        "max_requests_jitter": str(recommendation.max_requests_jitter),
+    }
+
+
+def _setting_line(lines, name):
+    """The index of the top-level `name = ...` line, or None."""
+    for number, line in enumerate(lines):
+        if line.split("=")[0].strip() == name and not line.startswith((" ", "#")):
+            return number
+    return None
+
+
+def apply_to_config(text, recommendation):
+    """
+    Set the recommended values in a gunicorn config file's text; missing settings are added.
+
+    A config with another worker class (the ASGI template's uvicorn worker)
+    keeps it and its threads: only workers and max_requests are sized.
+    """
+    lines = text.splitlines()
+    settings = config_settings(recommendation)
+    current = _setting_line(lines, "worker_class")
+    if current is not None:
+        worker_class = lines[current].partition("=")[2].strip().strip("\"'")
+        if worker_class not in ("sync", "gthread"):
+            del settings["worker_class"], settings["threads"]
+    for name, value in settings.items():
+        number = _setting_line(lines, name)
+        if number is None:
+            lines.append(f"{name} = {value}")
+        else:
+            lines[number] = f"{name} = {value}"
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,247 @@
+"""
+Static file storage and serving for the Vite build.
+
+Vite already puts a content hash in the name of every file it builds
+(assets/index-BvX3a_9K.js, listed in its manifest.json), and the frontend
+build writes .br and .gz variants next to them. So those files are:
+
+- left alone by ViteManifestStaticFilesStorage: not renamed or rewritten by
+  the manifest step (which would orphan the precompressed variants), and
+  only compressed here if the build didn't already do it
+- served by ViteWhiteNoiseMiddleware as immutable (cached for a year),
+  alongside the files Django's manifest step hashed itself
+
+collectstatic is also incremental: the storage keeps an index of what it
+compressed (by content hash) and produced, recompresses only changed files,
+in parallel processes, and removes its own stale outputs, so deploys don't
+need --clear.
+"""
+
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from whitenoise.compress import Compressor
+from whitenoise.middleware import WhiteNoiseMiddleware
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+from .templatetags.vite_assets import MANIFEST_NAME, ViteManifest, get_manifest
+
+# assets/<name>-<8 character base64url hash>.<ext>[.br|.gz], as Vite names
+# chunks; the hash must have a digit, so assets/app-settings.json doesn't match
+VITE_HASHED = re.compile(
+    r"^assets/[^/]+-(?=[A-Za-z_-]*[0-9])[A-Za-z0-9_-]{8}\.[A-Za-z0-9]+(?:\.br|\.gz)?$"
+)
+
+
+def is_vite_hashed(name, vite_files=None):
+    """
+    Whether Vite put a content hash in this file's name (or its .br/.gz variant's).
+
+    `vite_files` is the build's file set from its manifest.json, which decides.
+    Without a manifest the name has to look hashed (VITE_HASHED), which misses
+    the hashes that happen to have no digit.
+    """
+    name = name.replace(os.sep, "/")
+    if vite_files is not None:
+        return name.removesuffix(".br").removesuffix(".gz") in vite_files
+    return bool(VITE_HASHED.match(name))
+
+
+def manifest_files(storage, path):
+    """The file set of a Vite manifest.json in `storage`."""
+    with storage.open(path) as f:
+        return ViteManifest(json.load(f)).files()
+
+
+def file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _compress(path, extensions):
+    """Compress one file (in a worker process); returns the variants written."""
+    return Compressor(extensions=extensions, quiet=True).compress(path)
+
+
+class IncrementalCompressionMixin:
+    """
+    Compress only new or changed files and prune stale outputs.
+
+    INDEX_NAME in STATIC_ROOT records, per compressed file, the content hash
+    it was compressed from and the variants written, plus every file the last
+    run produced. Files whose hash matches and whose variants still exist are
+    skipped; the rest are compressed in parallel processes. Outputs of the
+    previous run that this run didn't produce are deleted; files the storage
+    never produced are left alone.
+    """
+
+    INDEX_NAME = ".staticfiles-index.json"
+
+    def load_index(self):
+        try:
+            with open(self.path(self.INDEX_NAME)) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {"compressed": {}, "outputs": []}
+
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            yield from super().post_process(paths, dry_run=dry_run, **options)
+            return
+
+        self._index = self.load_index()
+        self._compressed = {}
+        outputs = set(paths)
+        for name, hashed_name, processed in super().post_process(paths, **options):
+            if isinstance(hashed_name, str):
+                outputs.add(hashed_name)
+            yield name, hashed_name, processed
+        outputs |= set(self.hashed_files.values())
+        for entry in self._compressed.values():
+            outputs.update(entry["variants"])
+        outputs.add(self.manifest_name)
+
+        self.prune(set(self._index["outputs"]) - outputs)
+        with open(self.path(self.INDEX_NAME), "w") as f:
+            json.dump({"compressed": self._compressed, "outputs": sorted(outputs)}, f)
+
+    def compress_files(self, paths):
+        extensions = getattr(settings, "WHITENOISE_SKIP_COMPRESS_EXTENSIONS", None)
+        self.compressor = self.create_compressor(extensions=extensions, quiet=True)
+        previous = getattr(self, "_index", {"compressed": {}})["compressed"]
+
+        pending = {}
+        for name in paths:
+            if not self.compressor.should_compress(name):
+                continue
+            digest = file_digest(self.path(name))
+            entry = previous.get(name)
+            if (
+                entry
+                and entry["sha256"] == digest
+                and all(self.exists(variant) for variant in entry["variants"])
+            ):
+                self._compressed[name] = entry
+            else:
+                pending[name] = digest
+
+        if not pending:
+            return
+        with ProcessPoolExecutor() as executor:
+            futures = {
+                name: executor.submit(_compress, self.path(name), extensions) for name in pending
+            }
+            for name, future in futures.items():
+                prefix_len = len(self.path(name)) - len(name)
+                variants = [path[prefix_len:] for path in future.result()]
+                self._compressed[name] = {"sha256": pending[name], "variants": variants}
+                for variant in variants:
+                    yield name, variant
+
+    def prune(self, names):
+        for name in names:
+            if self.exists(name):
+                self.delete(name)
+
+
+class ViteManifestMixin:
+    """Keep Vite-hashed files out of the manifest step (names and bytes unchanged)."""
+
+    _vite_build = None
+
+    def post_process(self, paths, dry_run=False, **options):
+        if MANIFEST_NAME in paths:
+            self._vite_build = manifest_files(*paths[MANIFEST_NAME])
+        vite_files = [name for name in paths if is_vite_hashed(name, self._vite_build)]
+        self._vite_files = vite_files
+        paths = {
+            name: value
+            for name, value in paths.items()
+            if not is_vite_hashed(name, self._vite_build)
+        }
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+
+        # Compress only what the build didn't ship precompressed
+        names = set(vite_files)
+        uncompressed = [
+            name
+            for name in vite_files
+            if not name.endswith((".br", ".gz"))
+            and f"{name}.br" not in names
+            and f"{name}.gz" not in names
+        ]
+        for name, compressed_name in self.compress_files(uncompressed):
+            yield name, compressed_name, True
+
+    def hashed_name(self, name, content=None, filename=None):
+        # Also used for references to Vite files from other CSS files
+        if is_vite_hashed(self.clean_name(name), self._vite_build):
+            return name
+        return super().hashed_name(name, content, filename)
+
+    def save_manifest(self):
+        for name in getattr(self, "_vite_files", []):
+            self.hashed_files[self.hash_key(self.clean_name(name))] = name
+        super().save_manifest()
+
+
+class ViteManifestStaticFilesStorage(
+    IncrementalCompressionMixin, ViteManifestMixin, CompressedManifestStaticFilesStorage
+):
+    """
+    WhiteNoise's compressed manifest storage, skipping Vite-hashed files and
+    compressing incrementally.
+
+    Not strict, so a template referencing a file missing from the build
+    (e.g. before the frontend was built) gets the plain URL, not an error.
+    """
+
+    manifest_strict = False
+
+
+class ViteWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise, also treating Vite-hashed assets as immutable.
+
+    WhiteNoise 6 is sync-only, which would put every ASGI request through a
+    thread here; looking a file up does no I/O, so the async path does it
+    on the event loop and awaits the rest of the chain.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.acall(request)
+        return super().__call__(request)
+
+    async def acall(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
+
+    def immutable_file_test(self, path, url):
+        if url.startswith(self.static_prefix) and is_vite_hashed(
+            url[len(self.static_prefix) :], get_manifest().files()
+        ):
+            return True
+        return super().immutable_file_test(path, url)
@@ -1,13 +1,175 @@
-"""Template tags for Vite-generated assets with hashed filenames."""
+"""
+Template tags for Vite-generated assets with hashed filenames.
 
+The asset graph comes from Vite's manifest.json (build.manifest in
+vite.config.ts), read once per process and again only when its mtime
+changes, so rendering index.html costs one os.stat(). Builds without a
+manifest fall back to scanning the assets directory, cached the same way.
+"""
+
+import fnmatch
+import json
 import os
+import threading
 
 from django import template
 from django.conf import settings
 from django.templatetags.static import static
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
 
 register = template.Library()
 
+MANIFEST_NAME = "manifest.json"
+
+
+class ViteManifest:
+    """
+    Entry points and their dependency chunks, with the tag HTML built once.
+
+    `entries` maps chunk keys to Vite manifest entries:
+    {"file": ..., "isEntry": bool, "imports": [keys], "css": [files]}.
+    """
+
+    def __init__(self, entries, scanned=False):
+        self.entries = entries
+        # Built by from_directory(): only the scripts and entry stylesheets
+        self.scanned = scanned
+        self._assets = {}
+        self._tags = None
+        self._hints = None
+
+    @classmethod
+    def from_directory(cls, files):
+        """Build a manifest from a directory listing (builds without manifest.json)."""
+        js = sorted(f for f in files if f.endswith(".js"))
+        css = sorted(fnmatch.filter(files, "index*.css"))
+        entries = {f"_{name}": {"file": f"assets/{name}"} for name in js}
+        for name in fnmatch.filter(js, "index*.js"):
+            imports = [f"_{other}" for other in js if not fnmatch.fnmatch(other, "index*.js")]
+            # Vendor chunks first, as the directory scan used to order them
+            imports.sort(key=lambda key: not key.startswith("_vendor"))
+            entries[f"_{name}"] = {
+                "file": f"assets/{name}",
+                "isEntry": True,
+                "imports": imports,
+                "css": [f"assets/{c}" for c in css],
+            }
+        return cls(entries, scanned=True)
+
+    def files(self):
+        """Every file the build hashed (chunks, stylesheets, assets), or None if scanned."""
+        if self.scanned:
+            return None
+        files = set()
+        for entry in self.entries.values():
+            files.add(entry["file"])
+            files.update(entry.get("css", []))
+            files.update(entry.get("assets", []))
+        return files
+
+    def entry_points(self):
+        return [entry for entry in self.entries.values() if entry.get("isEntry")]
+
+    def static_imports(self, entry):
+        """Chunks statically imported by an entry, depth-first, each once."""
+        seen, chunks = set(), []
+
+        def visit(chunk):
+            for key in chunk.get("imports", []):
+                if key not in seen and key in self.entries:
+                    seen.add(key)
+                    chunks.append(self.entries[key])
+                    visit(self.entries[key])
+
+        visit(entry)
+        return chunks
+
+    def stylesheets(self):
+        files = []
+        for entry in self.entry_points():
+            for chunk in [entry, *self.static_imports(entry)]:
+                files += [css for css in chunk.get("css", []) if css not in files]
+        return files
+
+    def tags(self):
+        """Stylesheet links and entry scripts."""
+        if self._tags is None:
+            parts = [
+                f'<link rel="stylesheet" href="{escape(static(css))}">'
+                for css in self.stylesheets()
+            ]
+            parts += [
+                f'<script type="module" src="{escape(static(entry["file"]))}"></script>'
+                for entry in self.entry_points()
+            ]
+            self._tags = mark_safe("\n        ".join(parts))
+        return self._tags
+
+    def preload_hints(self):
+        """Preload links so the browser fetches the whole import graph in parallel."""
+        if self._hints is None:
+            parts = [
+                f'<link rel="preload" as="style" href="{escape(static(css))}">'
+                for css in self.stylesheets()
+            ]
+            modules = []
+            for entry in self.entry_points():
+                modules += [entry, *self.static_imports(entry)]
+            files = list(dict.fromkeys(chunk["file"] for chunk in modules))
+            parts += [f'<link rel="modulepreload" href="{escape(static(file))}">' for file in files]
+            self._hints = mark_safe("\n    ".join(parts))
+        return self._hints
+
+    def asset(self, pattern):
+        """URL of the first built file whose name matches `pattern`."""
+        if pattern not in self._assets:
+            files = [entry["file"] for entry in self.entries.values()]
+            files += [css for entry in self.entries.values() for css in entry.get("css", [])]
+            matches = [f for f in files if fnmatch.fnmatch(os.path.basename(f), pattern)]
+            self._assets[pattern] = static(matches[0] if matches else f"assets/{pattern}")
+        return self._assets[pattern]
+
+
+_cache = {}
+_cache_lock = threading.Lock()
+# Shared so callers can tell by identity that nothing changed
+_NO_BUILD = ViteManifest({})
+
+
+def _build_root():
+    """Directory holding the Vite build: the collected static files in production."""
+    if settings.DEBUG and settings.STATICFILES_DIRS:
+        return str(settings.STATICFILES_DIRS[0])
+    return str(settings.STATIC_ROOT)
+
+
+def get_manifest():
+    """Return the current ViteManifest, reloading only when the build changes."""
+    root = _build_root()
+    path = os.path.join(root, MANIFEST_NAME)
+    try:
+        key = (path, os.stat(path).st_mtime_ns)
+    except FileNotFoundError:
+        path = os.path.join(root, "assets")
+        try:
+            key = (path, os.stat(path).st_mtime_ns)
+        except FileNotFoundError:
+            return _NO_BUILD
+
+    cached = _cache.get(root)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    with _cache_lock:
+        if key[0].endswith(MANIFEST_NAME):
+            with open(key[0]) as f:
+                manifest = ViteManifest(json.load(f))
+        else:
+            manifest = ViteManifest.from_directory(os.listdir(key[0]))
+        _cache[root] = (key, manifest)
+    return manifest
+
 
 @register.simple_tag
 def vite_asset(pattern):
@@ -18,61 +180,21 @@ def vite_asset(pattern):
         {% vite_asset 'index*.js' %} finds index-HASH.js
         {% vite_asset 'index*.css' %} finds index-HASH.css
     """
-    staticfiles_dir = os.path.join(settings.STATICFILES_DIRS[0], "assets")
-
-    # In production, check the collected static files
-    if not settings.DEBUG:
-        staticfiles_dir = os.path.join(settings.STATIC_ROOT, "assets")
-
-    # Find files matching the pattern
-    if os.path.exists(staticfiles_dir):
-        import fnmatch
-
-        files = os.listdir(staticfiles_dir)
-        matches = fnmatch.filter(files, pattern)
-        if matches:
-            # Use the first match (there should only be one)
-            return static(f"assets/{matches[0]}")
-
-    # Fallback to the pattern itself (will 404 but won't break template)
-    return static(f"assets/{pattern}")
+    return get_manifest().asset(pattern)
 
 
 @register.simple_tag
 def vite_assets():
     """
-    Return all Vite JS and CSS assets as HTML tags.
-    Finds all index*.js and index*.css files.
+    Return the Vite entry stylesheets and scripts as HTML tags.
     """
-    html_parts = []
-
-    # Determine the directory to search
-    if settings.DEBUG:
-        staticfiles_dir = os.path.join(settings.STATICFILES_DIRS[0], "assets")
-    else:
-        staticfiles_dir = os.path.join(settings.STATIC_ROOT, "assets")
-
-    if os.path.exists(staticfiles_dir):
-        import fnmatch
-
-        files = os.listdir(staticfiles_dir)
-
-        # Find CSS files
-        css_files = fnmatch.filter(files, "index*.css")
-        for css_file in css_files:
-            url = static(f"assets/{css_file}")
-            html_parts.append(f'<link rel="stylesheet" href="{url}">')
+    return get_manifest().tags()
 
-        # Find JS files (vendor first, then others)
-        vendor_files = fnmatch.filter(files, "vendor*.js")
-        index_files = fnmatch.filter(files, "index*.js")
-        other_js = [f for f in files if f.endswith(".js") and f not in vendor_files + index_files]
 
-        js_files = vendor_files + other_js + index_files  # Load order matters
-        for js_file in js_files:
-            url = static(f"assets/{js_file}")
-            html_parts.append(f'<script type="module" src="{url}"></script>')
-
-    from django.utils.safestring import mark_safe
-
-    return mark_safe("\n        ".join(html_parts))
+@register.simple_tag
+def vite_preload():
+    """
+    Return modulepreload and CSS preload hints for the entries' static imports.
+    Place in <head> so the downloads start before the body is parsed.
+    """
+    return get_manifest().preload_hints()
@@ -0,0 +1,150 @@
+"""Tests for the async-native views served under ASGI."""
+
+import importlib.util
+import unittest
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.urls import resolve
+from django.utils.module_loading import import_string
+
+from asgiref.sync import iscoroutinefunction
+
+from apps.contact.models import ContactMessage
+
+from .email import SMTP_BACKEND, asend_mail
+
+HAS_AIOSMTPLIB = importlib.util.find_spec("aiosmtplib") is not None
+
+User = get_user_model()
+
+
+class AsyncStackTestCase(TestCase):
+    """Test that requests under ASGI can stay on the event loop."""
+
+    def test_middleware_async_capable(self):
+        """Test that no middleware forces the chain into a thread."""
+        for path in settings.MIDDLEWARE:
+            self.assertTrue(import_string(path).async_capable, path)
+
+    def test_views_are_coroutines(self):
+        """Test that the auth and public endpoints resolve to async views."""
+        for path in (
+            "/api/health/",
+            "/api/auth/config/",
+            "/api/auth/login/",
+            "/api/auth/logout/",
+            "/api/auth/user/",
+            "/api/contact/",
+        ):
+            self.assertTrue(iscoroutinefunction(resolve(path).func), path)
+
+
+@override_settings(HEALTH_PROBE_INTERVAL=0)
+class AsyncViewsTestCase(TestCase):
+    """Test the async views through the ASGI test client."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="pete", email="pete@purdue.edu", password="TestPass123!"
+        )
+
+    async def login(self, password="TestPass123!"):
+        return await self.async_client.post(
+            "/api/auth/login/",
+            {"username_or_email": "pete@purdue.edu", "password": password},
+            content_type="application/json",
+        )
+
+    async def test_login_and_logout(self):
+        """Test that logging in opens a session the next request sees, and logging out ends it."""
+        response = await self.login()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["user"]["username"], "pete")
+
+        response = await self.async_client.get("/api/auth/user/")
+        self.assertEqual(response.json()["email"], "pete@purdue.edu")
+
+        csrf = self.async_client.cookies["csrftoken"].value
+        response = await self.async_client.post("/api/auth/logout/", headers={"X-CSRFToken": csrf})
+        self.assertEqual(response.status_code, 200)
+        response = await self.async_client.get("/api/auth/user/")
+        self.assertEqual(response.status_code, 403)
+
+    async def test_login_rejects_bad_password(self):
+        """Test that validation errors come back as with the sync view."""
+        response = await self.login(password="wrong")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("non_field_errors", response.json())
+
+    async def test_update_current_user(self):
+        """Test that PATCH on the current user saves."""
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.patch(
+            "/api/auth/user/", {"first_name": "Pete"}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+        await self.user.arefresh_from_db()
+        self.assertEqual(self.user.first_name, "Pete")
+
+    async def test_contact_saves_and_emails(self):
+        """Test that a contact submission is stored and the notification sent."""
+        response = await self.async_client.post(
+            "/api/contact/",
+            {
+                "name": "Pete",
+                "email": "pete@purdue.edu",
+                "subject": "Hello",
+                "message": "A message long enough to pass.",
+            },
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+
+        message = await ContactMessage.objects.aget()
+        self.assertTrue(message.email_sent)
+        self.assertEqual(mail.outbox[0].subject, "[Contact Form] Hello")
+
+    async def test_health_and_config(self):
+        """Test the endpoints that do no I/O of their own."""
+        health = await self.async_client.get("/api/health/")
+        self.assertEqual(health.json()["status"], "healthy")
+        config = await self.async_client.get("/api/auth/config/")
+        self.assertEqual(config.json()["auth_method"], settings.AUTH_METHOD)
+
+
+class AsyncMailTestCase(TestCase):
+    """Test sending mail from async code."""
+
+    async def test_other_backends_in_a_thread(self):
+        """Test that non-SMTP backends (locmem here) still receive the message."""
+        sent = await asend_mail("Subject", "Body", "from@purdue.edu", ["to@purdue.edu"])
+        self.assertEqual(sent, 1)
+        self.assertEqual(mail.outbox[0].to, ["to@purdue.edu"])
+
+    @unittest.skipUnless(HAS_AIOSMTPLIB, "aiosmtplib is not installed")
+    @override_settings(
+        EMAIL_BACKEND=SMTP_BACKEND,
+        EMAIL_HOST="smtp.example.edu",
+        EMAIL_PORT=587,
+        EMAIL_USE_TLS=True,
+        EMAIL_USE_SSL=False,
+        EMAIL_HOST_USER="",
+        EMAIL_HOST_PASSWORD="",
+        EMAIL_TIMEOUT=5,
+    )
+    async def test_smtp_over_asyncio(self):
+        """Test that the SMTP backend's settings are used for an aiosmtplib send."""
+        with mock.patch("aiosmtplib.send", new_callable=mock.AsyncMock) as send:
+            sent = await asend_mail("Subject", "Body", "from@purdue.edu", ["to@purdue.edu"])
+
+        self.assertEqual(sent, 1)
+        message = send.await_args.args[0]
+        self.assertEqual(message["Subject"], "Subject")
+        self.assertEqual(send.await_args.kwargs["recipients"], ["to@purdue.edu"])
+        self.assertEqual(send.await_args.kwargs["hostname"], "smtp.example.edu")
+        self.assertTrue(send.await_args.kwargs["start_tls"])
+        self.assertIsNone(send.await_args.kwargs["username"])
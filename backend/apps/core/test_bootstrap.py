@@ -0,0 +1,95 @@
+"""Tests for the container bootstrap command."""
+
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import OperationalError
+from django.test import SimpleTestCase, TestCase
+
+from .management.commands import bootstrap
+
+
+class FakeConnection:
+    def __init__(self, failures):
+        self.failures = failures
+
+    def ensure_connection(self):
+        if self.failures:
+            self.failures -= 1
+            raise OperationalError("connection refused")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def __call__(self):
+        return self.now
+
+
+class WaitForDatabaseTestCase(SimpleTestCase):
+    """Test waiting for the database with backoff."""
+
+    def test_backoff(self):
+        """Test that retries start quickly and back off to 2 s."""
+        clock = FakeClock()
+        attempts = bootstrap.wait_for_database(FakeConnection(6), 60, clock.sleep, clock)
+
+        self.assertEqual(attempts, 7)
+        self.assertEqual(clock.sleeps, [0.1, 0.2, 0.4, 0.8, 1.6, 2])
+
+    def test_timeout(self):
+        """Test that a database that never answers fails the command."""
+        clock = FakeClock()
+        with self.assertRaisesMessage(CommandError, "Database unavailable after 5s"):
+            bootstrap.wait_for_database(FakeConnection(100), 5, clock.sleep, clock)
+        self.assertLessEqual(clock.now, 5)
+
+
+class BootstrapTestCase(TestCase):
+    """Test the steps of the bootstrap command in one process."""
+
+    def run_bootstrap(self, *args):
+        out = StringIO()
+        with mock.patch.object(bootstrap, "call_command") as command:
+            call_command("bootstrap", *args, stdout=out)
+        return out.getvalue(), [call.args[0] for call in command.call_args_list]
+
+    def test_creates_superuser_once(self):
+        """Test that the default admin is created only when there is no superuser."""
+        with mock.patch.dict("os.environ", {"DEFAULT_SUPERUSER_PASSWORD": "Not-the-default-1"}):
+            output, _ = self.run_bootstrap("--static", "never")
+        admin = get_user_model().objects.get(username="admin")
+
+        self.assertTrue(admin.is_superuser)
+        self.assertTrue(admin.check_password("Not-the-default-1"))
+        self.assertIn("Created default admin user", output)
+
+        output, _ = self.run_bootstrap("--static", "never")
+        self.assertIn("Found 1 admin user(s)", output)
+        self.assertIn("Default Admin Credentials", output)
+
+    def test_skips_empty_migration_plan(self):
+        """Test that migrate doesn't run when every migration is applied."""
+        _, commands = self.run_bootstrap("--static", "never", "--no-superuser")
+
+        self.assertEqual(commands, [])
+        self.assertFalse(get_user_model().objects.exists())
+
+    def test_static(self):
+        """Test that --static auto follows DEBUG and runs collectstatic and generate_schema."""
+        with self.settings(DEBUG=True):
+            _, commands = self.run_bootstrap("--no-superuser")
+        self.assertEqual(commands, [])
+
+        with self.settings(DEBUG=False):
+            _, commands = self.run_bootstrap("--no-superuser")
+        self.assertEqual(commands, ["collectstatic", "generate_schema"])
@@ -0,0 +1,206 @@
+"""Tests for the Oracle and SQL Server connection pools, against fake connections."""
+
+import importlib.util
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.db.utils import OperationalError
+
+from apps.api.health import connection_pool_stats
+
+from .dbpool import ConnectionPool, oracle_error_reason, oracle_pool_options, oracle_pool_stats
+
+HAS_SQLALCHEMY = importlib.util.find_spec("sqlalchemy") is not None
+HAS_PROMETHEUS = importlib.util.find_spec("prometheus_client") is not None
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, sql):
+        if self.connection.broken:
+            raise RuntimeError("connection reset")
+        self.connection.executed.append(sql)
+
+    def fetchall(self):
+        return [(1,)]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """A DB-API connection that records what the pool does with it."""
+
+    def __init__(self):
+        self.broken = False
+        self.closed = False
+        self.rollbacks = 0
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+def error_count(vendor, reason):
+    from prometheus_client import REGISTRY
+
+    labels = {"vendor": vendor, "reason": reason}
+    return REGISTRY.get_sample_value("django_db_pool_errors_total", labels) or 0
+
+
+class OraclePoolTestCase(unittest.TestCase):
+    """Test the translation of DB_POOL settings for python-oracledb."""
+
+    def test_pool_options(self):
+        """Test that the generic sizes become create_pool() arguments."""
+        options = {"min_size": 2, "max_size": 8, "timeout": 2.5, "max_idle": 120.0}
+
+        params = oracle_pool_options(options, health_checks=True, timedwait="TIMEDWAIT")
+
+        self.assertEqual(params["min"], 2)
+        self.assertEqual(params["max"], 8)
+        self.assertEqual(params["getmode"], "TIMEDWAIT")
+        self.assertEqual(params["wait_timeout"], 2500)
+        self.assertEqual(params["timeout"], 120)
+        self.assertEqual(params["ping_interval"], 0)
+
+    def test_pool_options_without_health_checks(self):
+        """Test that without health checks only long-idle connections are pinged."""
+        params = oracle_pool_options({}, health_checks=False, timedwait="TIMEDWAIT")
+
+        self.assertEqual(params["ping_interval"], 60)
+        self.assertEqual((params["min"], params["max"]), (1, 4))
+
+    def test_pool_stats(self):
+        """Test that the session pool's counts are reported as open, busy and idle."""
+        pool = SimpleNamespace(opened=3, busy=1, min=1, max=4)
+
+        stats = oracle_pool_stats(pool)
+
+        self.assertEqual(stats["size"], 3)
+        self.assertEqual(stats["in_use"], 1)
+        self.assertEqual(stats["idle"], 2)
+        self.assertEqual(stats["max"], 4)
+
+    def test_error_reasons(self):
+        """Test that oracledb errors map to the same reasons as the SQL Server pool's."""
+
+        def error(full_code):
+            # oracledb errors carry an _Error with the code as their first argument
+            return Exception(SimpleNamespace(full_code=full_code))
+
+        self.assertEqual(oracle_error_reason(error("DPY-4005")), "timeout")
+        self.assertEqual(oracle_error_reason(error("ORA-24457")), "timeout")
+        self.assertEqual(oracle_error_reason(error("ORA-12541")), "connect")
+        self.assertEqual(oracle_error_reason(Exception()), "connect")
+
+
+@unittest.skipUnless(HAS_SQLALCHEMY, "SQLAlchemy is not installed")
+class ConnectionPoolTestCase(unittest.TestCase):
+    """Test the SQLAlchemy-backed pool used for SQL Server."""
+
+    def setUp(self):
+        self.opened = []
+
+    def creator(self):
+        connection = FakeConnection()
+        self.opened.append(connection)
+        return connection
+
+    def make_pool(self, **kwargs):
+        pool = ConnectionPool(self.creator, "fake", **kwargs)
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_reuses_returned_connection(self):
+        """Test that a returned connection is rolled back and lent again."""
+        pool = self.make_pool()
+
+        first = pool.acquire()
+        pool.release(first)
+        second = pool.acquire()
+
+        self.assertEqual(len(self.opened), 1)
+        self.assertIs(second.dbapi_connection, self.opened[0])
+        self.assertEqual(self.opened[0].rollbacks, 1)
+        self.assertEqual(pool.stats()["in_use"], 1)
+
+    def test_overflow_closes_on_return(self):
+        """Test that connections above min_size close when returned."""
+        pool = self.make_pool(min_size=1, max_size=3)
+
+        borrowed = [pool.acquire() for _ in range(3)]
+        self.assertEqual(pool.stats()["in_use"], 3)
+        for pooled in borrowed:
+            pool.release(pooled)
+
+        stats = pool.stats()
+        self.assertEqual((stats["size"], stats["idle"], stats["max"]), (1, 1, 3))
+        self.assertEqual(sum(connection.closed for connection in self.opened), 2)
+
+    def test_timeout_when_exhausted(self):
+        """Test that borrowing from a full pool fails after the timeout."""
+        pool = self.make_pool(min_size=1, max_size=1, timeout=0.05)
+        held = pool.acquire()  # noqa: F841 - a dropped proxy returns to the pool
+        before = error_count("fake", "timeout") if HAS_PROMETHEUS else 0
+
+        with self.assertRaises(OperationalError):
+            pool.acquire()
+
+        if HAS_PROMETHEUS:
+            self.assertEqual(error_count("fake", "timeout"), before + 1)
+
+    def test_waits_for_returned_connection(self):
+        """Test that a borrower waits for a connection another thread returns."""
+        pool = self.make_pool(min_size=1, max_size=1, timeout=5)
+        held = pool.acquire()
+        threading.Timer(0.05, pool.release, [held]).start()
+
+        pooled = pool.acquire()
+
+        self.assertIs(pooled.dbapi_connection, self.opened[0])
+
+    def test_health_check_replaces_broken_connection(self):
+        """Test that a connection failing SELECT 1 is closed and replaced."""
+        pool = self.make_pool()
+        pool.release(pool.acquire())
+        self.opened[0].broken = True
+        before = error_count("fake", "health_check") if HAS_PROMETHEUS else 0
+
+        pooled = pool.acquire()
+
+        self.assertTrue(self.opened[0].closed)
+        self.assertIs(pooled.dbapi_connection, self.opened[1])
+        self.assertIn("SELECT 1", self.opened[1].executed)
+        if HAS_PROMETHEUS:
+            self.assertEqual(error_count("fake", "health_check"), before + 1)
+
+    def test_without_health_checks(self):
+        """Test that health checks can be turned off."""
+        pool = self.make_pool(health_checks=False)
+
+        pool.acquire()
+
+        self.assertEqual(self.opened[0].executed, [])
+
+
+class HealthPoolStatsTestCase(unittest.TestCase):
+    """Test that the readiness check reports a pooled backend's stats."""
+
+    def test_uses_backend_pool_stats(self):
+        """Test that a backend's own pool_stats() is preferred."""
+        stats = {"type": "QueuePool", "size": 2, "in_use": 1, "idle": 1, "min": 1, "max": 4}
+        connection = SimpleNamespace(pool_stats=lambda: stats)
+
+        with patch("apps.api.health.connections", {"default": connection}):
+            self.assertEqual(connection_pool_stats(), stats)
@@ -0,0 +1,152 @@
+"""Tests for server push over Server-Sent Events."""
+
+import asyncio
+import importlib.util
+import json
+import threading
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from asgiref.sync import sync_to_async
+
+from . import events
+
+HAS_FAKEREDIS = importlib.util.find_spec("fakeredis") is not None
+
+User = get_user_model()
+
+
+def parse_event(chunk):
+    """The JSON payload of one `data:` event."""
+    assert chunk.startswith(b"data: "), chunk
+    return json.loads(chunk[len(b"data: ") :])
+
+
+class BroadcasterTestCase(TestCase):
+    """Test delivering published messages to subscribers."""
+
+    def test_publish_from_another_thread(self):
+        """Test that a message published in a worker thread reaches an async subscriber."""
+
+        async def scenario():
+            async with events.subscribe("demo") as subscription:
+                with self.captureOnCommitCallbacks(execute=True):
+                    await asyncio.to_thread(events.publish, "demo", {"n": 1})
+                return await subscription.get(timeout=1)
+
+        self.assertEqual(json.loads(asyncio.run(scenario())), {"n": 1})
+        self.assertEqual(events.broadcaster.subscriber_count("demo"), 0)
+
+    @override_settings(EVENTS_QUEUE_SIZE=2)
+    def test_slow_subscriber_dropped(self):
+        """Test that a stream ends once its client falls a full queue behind."""
+
+        async def scenario():
+            stream = events.event_stream("demo", heartbeat=1)
+            chunks = [await anext(stream)]
+            for n in range(3):
+                events.broadcaster.deliver("demo", json.dumps({"n": n}).encode())
+            await asyncio.sleep(0)
+            async for chunk in stream:
+                chunks.append(chunk)
+            return chunks
+
+        chunks = asyncio.run(scenario())
+        self.assertEqual(chunks[0], b"retry: 5000\n\n")
+        self.assertEqual(len(chunks), 1)
+
+    def test_heartbeat(self):
+        """Test that an idle stream sends keep-alive comments."""
+
+        async def scenario():
+            stream = events.event_stream("idle", heartbeat=0.01)
+            await anext(stream)
+            chunk = await anext(stream)
+            await stream.aclose()
+            return chunk
+
+        self.assertEqual(asyncio.run(scenario()), b": ping\n\n")
+
+
+class RecordingBroadcaster(events.Broadcaster):
+    """Record deliveries instead of queueing them."""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+        self.received = threading.Event()
+
+    def deliver(self, channel, message):
+        self.messages.append((channel, message))
+        self.received.set()
+
+
+@unittest.skipUnless(HAS_FAKEREDIS, "fakeredis is not installed")
+class RedisTransportTestCase(TestCase):
+    """Test carrying messages between processes through Redis pub/sub."""
+
+    def test_round_trip(self):
+        """Test that a message published to Redis is delivered by the listener thread."""
+        import fakeredis
+
+        broadcaster = RecordingBroadcaster()
+        transport = events.RedisTransport("redis://localhost", broadcaster)
+        transport.client = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        transport.start()
+        # Publish until the listener thread has subscribed and picks one up
+        for _ in range(50):
+            transport.publish("users", b'{"type":"deleted","id":1}')
+            if broadcaster.received.wait(0.05):
+                break
+
+        self.assertEqual(broadcaster.messages[0], ("users", b'{"type":"deleted","id":1}'))
+
+
+class UserEventsViewTestCase(TransactionTestCase):
+    """Test the user directory event stream."""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.edu", password="pw"
+        )
+
+    async def test_streams_user_changes(self):
+        """Test that creating, updating and deleting a user are pushed to an admin."""
+        await self.async_client.aforce_login(self.admin)
+        response = await self.async_client.get("/api/auth/users/events/")
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b"retry: 5000\n\n")
+
+        user = await sync_to_async(User.objects.create_user)(
+            username="pete", email="pete@example.edu"
+        )
+        created = parse_event(await asyncio.wait_for(anext(stream), 2))
+        user.first_name = "Pete"
+        await sync_to_async(user.save)()
+        updated = parse_event(await asyncio.wait_for(anext(stream), 2))
+        user_id = user.id
+        await sync_to_async(user.delete)()
+        deleted = parse_event(await asyncio.wait_for(anext(stream), 2))
+        await stream.aclose()
+
+        self.assertEqual((created["type"], created["user"]["username"]), ("created", "pete"))
+        self.assertEqual((updated["type"], updated["user"]["first_name"]), ("updated", "Pete"))
+        self.assertEqual(deleted, {"type": "deleted", "id": user_id})
+
+    async def test_admin_only(self):
+        """Test that non-staff users can't subscribe."""
+        user = await sync_to_async(User.objects.create_user)(
+            username="regular", email="regular@example.edu"
+        )
+        await self.async_client.aforce_login(user)
+        response = await self.async_client.get("/api/auth/users/events/")
+        self.assertEqual(response.status_code, 403)
+
+    def test_wsgi_refused(self):
+        """Test that the WSGI server answers 503 rather than holding a worker."""
+        self.client.force_login(self.admin)
+        response = self.client.get("/api/auth/users/events/")
+        self.assertEqual(response.status_code, 503)
@@ -0,0 +1,48 @@
+"""Tests for summarizing -X importtime output."""
+
+from django.test import SimpleTestCase
+
+from .importtime import by_group, group, parse, top_level
+
+OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     yaml.error
+import time:       500 |        620 |   yaml
+import time:       300 |        920 | apps.core.renderers
+import time:        80 |         80 |   apps.core.timing
+import time:       200 |        280 | apps.authentication.views
+import time:      1000 |       1000 | config.urls
+Traceback lines and other stderr are skipped
+"""
+
+
+class ImportTimeTestCase(SimpleTestCase):
+    """Test parsing and grouping import times."""
+
+    def test_parse(self):
+        """Test module, self and cumulative time and depth per line."""
+        imports = parse(OUTPUT)
+
+        self.assertEqual(len(imports), 6)
+        self.assertEqual(
+            (imports[0].module, imports[0].self_us, imports[0].cumulative_us, imports[0].depth),
+            ("yaml.error", 120, 120, 2),
+        )
+        self.assertEqual([entry.depth for entry in imports], [2, 1, 0, 1, 0, 0])
+
+    def test_groups(self):
+        """Test that apps group per app and everything else per top-level package."""
+        self.assertEqual(group("apps.core.renderers"), "apps.core")
+        self.assertEqual(group("config.settings.base"), "config")
+        self.assertEqual(group("yaml.error"), "yaml")
+        self.assertEqual(
+            by_group(parse(OUTPUT)),
+            [("config", 1000), ("yaml", 620), ("apps.core", 380), ("apps.authentication", 200)],
+        )
+
+    def test_top_level(self):
+        """Test that only direct imports are ranked, by cumulative time."""
+        self.assertEqual(
+            [entry.module for entry in top_level(parse(OUTPUT))],
+            ["config.urls", "apps.core.renderers", "apps.authentication.views"],
+        )
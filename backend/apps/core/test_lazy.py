@@ -0,0 +1,72 @@
+"""Tests for views and schemas imported on first use."""
+
+import sys
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase
+
+from rest_framework.views import APIView
+
+from drf_spectacular.openapi import AutoSchema
+
+from . import lazy
+
+
+class LazyViewTestCase(SimpleTestCase):
+    """Test that lazy_view imports its view on the first request only."""
+
+    def test_imported_on_first_request(self):
+        """Test that the view class is imported once, when first called."""
+        view = lazy.lazy_view("drf_spectacular.views.SpectacularSwaggerView", url_name="schema")
+        self.assertEqual(view.__name__, "SpectacularSwaggerView")
+        self.assertTrue(view.csrf_exempt)
+
+        with mock.patch.object(lazy, "import_string", wraps=lazy.import_string) as load:
+            view = lazy.lazy_view("drf_spectacular.views.SpectacularSwaggerView", url_name="schema")
+            self.assertEqual(load.call_count, 0)
+            request = RequestFactory().get("/api/swagger/")
+            first = view(request)
+            second = view(request)
+
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 200)
+
+    def test_docs_served(self):
+        """Test that the API docs pages answer through the lazy views."""
+        for path in ("/api/swagger/", "/api/redoc/"):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path).status_code, 200)
+
+
+class LazyAutoSchemaTestCase(SimpleTestCase):
+    """Test the DEFAULT_SCHEMA_CLASS stand-in for drf-spectacular's AutoSchema."""
+
+    def test_api_view_schema(self):
+        """Test that a stand-in made before the import hands view instances the real one."""
+        with mock.patch.dict(sys.modules):
+            del sys.modules["drf_spectacular.openapi"]
+            stand_in = lazy.LazyAutoSchema()
+
+        class View(APIView):
+            schema = stand_in
+
+        view = View()
+        self.assertIs(View.schema, stand_in)
+        self.assertIsInstance(view.schema, AutoSchema)
+        self.assertIs(view.schema.view, view)
+
+    def test_instance_gets_autoschema(self):
+        """Test that a view instance's schema is drf-spectacular's, bound to the view."""
+        view = APIView()
+        schema = view.schema
+
+        self.assertIsInstance(schema, AutoSchema)
+        self.assertIs(schema.view, view)
+
+    def test_explicit_schema_kept(self):
+        """Test that a schema assigned to a view instance wins."""
+        view = APIView()
+        view.schema = None
+
+        self.assertIsNone(view.schema)
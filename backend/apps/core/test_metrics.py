@@ -0,0 +1,159 @@
+"""Tests for the Prometheus metrics helpers."""
+
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import resolve
+
+from asgiref.sync import async_to_sync, sync_to_async
+
+from config import gunicorn_hooks
+
+from .metrics import compact_dead_process, metrics_view
+from .middleware import QueryMetricsMiddleware
+
+HAS_PROMETHEUS = importlib.util.find_spec("prometheus_client") is not None
+
+User = get_user_model()
+
+
+@unittest.skipUnless(HAS_PROMETHEUS, "prometheus_client is not installed")
+class CompactDeadProcessTestCase(unittest.TestCase):
+    """Test folding dead workers' metric files into the archive."""
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def _write_counter(self, pid, value):
+        from prometheus_client.mmap_dict import MmapedDict
+
+        key = json.dumps(["requests", "requests_total", {"view": "x"}, "Requests"], sort_keys=True)
+        metrics = MmapedDict(os.path.join(self.path, f"counter_{pid}.db"))
+        metrics.write_value(key, value, 0.0)
+        metrics.close()
+
+    def _total(self):
+        from prometheus_client import CollectorRegistry, multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=self.path)
+        return registry.get_sample_value("requests_total", {"view": "x"})
+
+    def test_totals_survive_compaction(self):
+        """Test that dead workers' counts are merged rather than lost."""
+        self._write_counter(101, 3)
+        self._write_counter(102, 4)
+        self._write_counter(103, 5)
+
+        compact_dead_process(101, self.path)
+        compact_dead_process(102, self.path)
+
+        self.assertEqual(self._total(), 12)
+        self.assertEqual(sorted(os.listdir(self.path)), ["counter_103.db", "counter_archive.db"])
+
+
+class MultiprocessDirTestCase(unittest.TestCase):
+    """Test where gunicorn workers keep their metric files."""
+
+    def test_defaults_to_the_ready_directory(self):
+        """Test that each app gets a directory of its own, cleared when gunicorn starts."""
+        ready_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, ready_dir)
+        path = os.path.join(ready_dir, "prometheus")
+        os.makedirs(path)
+        open(os.path.join(path, "counter_1.db"), "w").close()
+        environ = {gunicorn_hooks.READY_DIR_ENV: ready_dir}
+
+        with (
+            mock.patch.dict(os.environ, environ),
+            mock.patch.object(gunicorn_hooks, "_multiprocess_dir_prepared", False),
+        ):
+            os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+            gunicorn_hooks.prepare_multiprocess_dir()
+
+            self.assertEqual(os.environ["PROMETHEUS_MULTIPROC_DIR"], path)
+        self.assertEqual(os.listdir(path), [])
+
+
+@unittest.skipUnless(HAS_PROMETHEUS, "prometheus_client is not installed")
+class QueryMetricsMiddlewareTestCase(TestCase):
+    """Test per-request database query metrics."""
+
+    def test_queries_are_counted_per_view(self):
+        """Test that each request observes its own query count."""
+        from prometheus_client import REGISTRY
+
+        def view(request):
+            request.resolver_match = resolve("/api/auth/users/")
+            list(User.objects.all())
+            list(User.objects.all())
+            return HttpResponse()
+
+        labels = {"view": "authentication:user-list"}
+        before = REGISTRY.get_sample_value("django_db_queries_per_request_sum", labels) or 0
+
+        QueryMetricsMiddleware(view)(RequestFactory().get("/api/auth/users/"))
+
+        after = REGISTRY.get_sample_value("django_db_queries_per_request_sum", labels)
+        self.assertEqual(after - before, 2)
+
+    def test_async_queries_in_threads_are_counted(self):
+        """Test that under ASGI the queries run in sync_to_async threads are counted."""
+        from prometheus_client import REGISTRY
+
+        def select_one():
+            # A thread of its own, so a connection object of its own
+            try:
+                with connections["default"].cursor() as cursor:
+                    cursor.execute("SELECT 1")
+            finally:
+                connections["default"].close()
+
+        async def view(request):
+            request.resolver_match = resolve("/api/auth/users/")
+            await User.objects.acount()
+            await sync_to_async(select_one, thread_sensitive=False)()
+            return HttpResponse()
+
+        labels = {"view": "authentication:user-list"}
+        before = REGISTRY.get_sample_value("django_db_queries_per_request_sum", labels) or 0
+
+        async_to_sync(QueryMetricsMiddleware(view))(RequestFactory().get("/api/auth/users/"))
+
+        after = REGISTRY.get_sample_value("django_db_queries_per_request_sum", labels)
+        self.assertEqual(after - before, 2)
+
+
+@unittest.skipUnless(HAS_PROMETHEUS, "prometheus_client is not installed")
+class MetricsViewTestCase(TestCase):
+    """Test the /metrics export view."""
+
+    def test_exports_application_metrics(self):
+        """Test that the export includes the email queue gauge."""
+        response = metrics_view(RequestFactory().get("/metrics"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"contact_email_queue_depth", response.content)
+
+    @override_settings(METRICS_BEARER_TOKEN="s3cret")
+    def test_token_is_required_when_configured(self):
+        """Test that scrapes without the bearer token are refused."""
+        factory = RequestFactory()
+
+        denied = metrics_view(factory.get("/metrics"))
+        allowed = metrics_view(factory.get("/metrics", HTTP_AUTHORIZATION="Bearer s3cret"))
+
+        self.assertEqual(denied.status_code, 403)
+        self.assertEqual(allowed.status_code, 200)
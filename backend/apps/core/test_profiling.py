@@ -0,0 +1,86 @@
+"""Tests for the sampling profiler."""
+
+import io
+import os
+import shutil
+import tempfile
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from .profiling import StackSampler, WorkerProfiler, make_profile_token
+
+User = get_user_model()
+
+
+def busy_wait(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class StackSamplerTestCase(TestCase):
+    """Test sampling thread stacks."""
+
+    def test_samples_busy_thread(self):
+        """Test that a busy function shows up in the collapsed stacks."""
+        with StackSampler(0.001) as sampler:
+            busy_wait(0.1)
+
+        self.assertGreater(sampler.samples, 0)
+        self.assertTrue(any("busy_wait" in stack for stack in sampler.stacks))
+
+
+class ProfilingMiddlewareTestCase(TestCase):
+    """Test profiling single requests."""
+
+    def test_signed_header_returns_stacks(self):
+        """Test that a valid token swaps the response for collapsed stacks."""
+        response = self.client.get("/api/health/", HTTP_X_PROFILE_TOKEN=make_profile_token())
+
+        self.assertEqual(response["Content-Type"], "text/plain")
+        self.assertEqual(response["X-Profile-Status"], "200")
+
+    def test_bad_token_is_ignored(self):
+        """Test that an invalid token gets the normal response."""
+        response = self.client.get("/api/health/", HTTP_X_PROFILE_TOKEN="forged")
+
+        self.assertNotIn("X-Profile-Status", response)
+
+    def test_switch_requires_staff(self):
+        """Test that ?_profile=1 only profiles staff users."""
+        user = User.objects.create_user(username="u", email="u@purdue.edu", password="x")
+        self.client.force_login(user)
+        self.assertNotIn("X-Profile-Status", self.client.get("/api/health/?_profile=1"))
+
+        User.objects.filter(pk=user.pk).update(is_staff=True)
+        self.assertIn("X-Profile-Status", self.client.get("/api/health/?_profile=1"))
+
+
+class WorkerProfilerTestCase(TestCase):
+    """Test the rotating per-worker stack files."""
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_flush_rotate_and_merge(self):
+        """Test that old files are rotated out and the rest merge."""
+        profiler = WorkerProfiler(self.path, 0.01, 0.01, 60, max_files=2)
+        for count in (1, 2, 3):
+            profiler.sampler.stacks["app:main;app:handler"] += count
+            path = profiler.flush()
+            os.utime(path, (count, count))
+            os.rename(path, os.path.join(self.path, f"worker-{count}.folded"))
+        profiler.rotate()
+
+        out = io.StringIO()
+        with override_settings(PROFILING_DIR=self.path):
+            call_command("merge_profiles", stdout=out, stderr=io.StringIO())
+
+        self.assertEqual(sorted(os.listdir(self.path)), ["worker-2.folded", "worker-3.folded"])
+        self.assertEqual(out.getvalue(), "app:main;app:handler 5\n")
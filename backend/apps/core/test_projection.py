@@ -0,0 +1,187 @@
+"""Tests for the read-only serializer projection."""
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from apps.authentication.serializers import UserSerializer
+
+from .projection import Projection
+
+User = get_user_model()
+
+
+class ProjectionTestCase(TestCase):
+    """Test that projected output is identical to the serializer's."""
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.edu", password="pw"
+        )
+        for i in range(30):
+            User.objects.create_user(
+                username=f"user{i}",
+                email=f"user{i}@example.edu",
+                first_name="Zoë" if i % 3 else "",
+                last_name=f"Boilermaker {i}",
+                is_active=bool(i % 4),
+                is_staff=i % 5 == 0,
+                is_email_verified=i % 2 == 0,
+                last_login=now - timedelta(hours=i, microseconds=i) if i % 2 else None,
+            )
+
+    def test_byte_identical_to_serializer(self):
+        """Test that every user renders to the same bytes as UserSerializer."""
+        queryset = User.objects.order_by("id")
+        projection = Projection.for_serializer(UserSerializer)
+
+        expected = UserSerializer(queryset, many=True).data
+        actual = projection.represent(projection.rows(queryset))
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+
+    def test_byte_identical_in_local_timezone(self):
+        """Test that datetimes match the serializer under an activated timezone."""
+        queryset = User.objects.order_by("id")
+        projection = Projection.for_serializer(UserSerializer)
+
+        with timezone.override("America/Indiana/Indianapolis"):
+            expected = UserSerializer(queryset, many=True).data
+            actual = projection.represent(projection.rows(queryset))
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+        self.assertTrue(actual[0]["date_joined"].endswith(("-04:00", "-05:00")))
+
+    def test_list_view_matches_serializer(self):
+        """Test that the user list endpoint serves the serializer's output, page by page."""
+        self.client.force_login(self.admin)
+        response = self.client.get("/api/auth/users/", {"ordering": "id", "page": 2})
+
+        expected = UserSerializer(User.objects.order_by("id")[20:40], many=True).data
+        self.assertEqual(response.json()["count"], User.objects.count())
+        self.assertEqual(
+            JSONRenderer().render(response.json()["results"]), JSONRenderer().render(expected)
+        )
+
+    def test_selects_only_serialized_columns(self):
+        """Test that list queries don't select unserialized columns like the password hash."""
+        self.client.force_login(self.admin)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/auth/users/")
+
+        # The page query (the session's own user lookup loads the full row)
+        [page_query] = [q["sql"] for q in queries if "LIMIT 20" in q["sql"]]
+        self.assertIn('"date_joined"', page_query)
+        self.assertNotIn('"password"', page_query)
+
+    def test_stream(self):
+        """Test that streaming in chunks yields the same dicts."""
+        projection = Projection.for_serializer(UserSerializer)
+        queryset = User.objects.order_by("id")
+
+        self.assertEqual(
+            list(projection.stream(queryset, chunk_size=7)),
+            projection.represent(projection.rows(queryset)),
+        )
+
+    def test_unsupported_serializer(self):
+        """Test that serializers with non-column fields have no projection."""
+
+        class MethodSerializer(serializers.ModelSerializer):
+            display = serializers.SerializerMethodField()
+
+            class Meta:
+                model = User
+                fields = ("id", "display")
+
+            def get_display(self, obj):
+                return obj.username
+
+        self.assertIsNone(Projection.for_serializer(MethodSerializer))
+
+
+class SparseFieldsTestCase(TestCase):
+    """Test ?fields= / ?omit= on the user endpoints."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.edu", password="pw"
+        )
+        cls.other = User.objects.create_user(
+            username="other", email="other@example.edu", password="pw"
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_list_fields(self):
+        """Test that the list returns, and selects, only the requested fields."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/auth/users/", {"fields": "username,id"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0], {"id": self.admin.id, "username": "admin"})
+        page_query = queries[-1]["sql"]
+        self.assertIn('"username"', page_query)
+        self.assertNotIn('"email"', page_query)
+
+    def test_detail_omit(self):
+        """Test that omitted fields are left out of a user's detail, and its query."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                f"/api/auth/users/{self.other.id}/", {"omit": "date_joined,last_login"}
+            )
+
+        data = response.json()
+        self.assertNotIn("date_joined", data)
+        self.assertNotIn("last_login", data)
+        self.assertEqual(data["email"], "other@example.edu")
+        detail_query = queries[-1]["sql"]
+        self.assertNotIn('"date_joined"', detail_query)
+        self.assertNotIn('"password"', detail_query)
+
+    def test_current_user_fields_and_omit(self):
+        """Test that fields and omit combine on the current user."""
+        response = self.client.get(
+            "/api/auth/user/", {"fields": "id,username,email", "omit": "email"}
+        )
+        self.assertEqual(response.json(), {"id": self.admin.id, "username": "admin"})
+
+    def test_unknown_fields_rejected(self):
+        """Test that names outside the serializer's fields are a 400."""
+        for params in ({"fields": "id,password"}, {"omit": "groups"}, {"fields": "_state"}):
+            response = self.client.get("/api/auth/users/", params)
+            self.assertEqual(response.status_code, 400, params)
+
+    def test_empty_selection_rejected(self):
+        """Test that a selection leaving no fields is a 400 rather than every column."""
+        for query in ("fields=", "fields=,", "fields=id&omit=id"):
+            for url in ("/api/auth/users/", f"/api/auth/users/{self.other.id}/", "/api/auth/user/"):
+                response = self.client.get(f"{url}?{query}")
+                self.assertEqual(response.status_code, 400, (url, query))
+                self.assertEqual(response.json(), {"fields": ["Select at least one field."]})
+
+    def test_projection_without_columns(self):
+        """Test that a projection with no columns refuses to query."""
+        projection = Projection(UserSerializer, fields=())
+        with self.assertRaises(ValueError):
+            projection.rows(User.objects.all())
+
+    def test_writes_ignore_fields(self):
+        """Test that a PATCH with ?fields= still validates and returns every field."""
+        response = self.client.patch(
+            f"/api/auth/users/{self.other.id}/?fields=id",
+            {"first_name": "Pete"},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["first_name"], "Pete")
@@ -0,0 +1,86 @@
+"""Tests for query recording and N+1 detection."""
+
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from .queries import QueryInspectorMiddleware, QueryProblem, QueryRecorder, fingerprint
+
+User = get_user_model()
+
+
+class FingerprintTestCase(TestCase):
+    """Test reducing statements to their shape."""
+
+    def test_literals_and_in_lists_are_normalised(self):
+        """Test that statements differing only in values share a fingerprint."""
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id IN (1, 2) AND name = 'a'"),
+            fingerprint("SELECT *  FROM t WHERE id IN (%s, %s, %s) AND name = %s"),
+        )
+
+
+class QueryRecorderTestCase(TestCase):
+    """Test flagging repeated and duplicate queries."""
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(username=f"user{i}", email=f"user{i}@purdue.edu")
+            for i in range(3)
+        ]
+
+    def test_repeated_shapes_are_flagged(self):
+        """Test that a query per row is reported as an N+1 shape."""
+        with QueryRecorder() as recorder:
+            for user in self.users:
+                User.objects.get(pk=user.pk)
+
+        self.assertEqual(list(recorder.repeated(3).values()), [3])
+        self.assertEqual(recorder.duplicates(), {})
+
+    def test_identical_queries_are_duplicates(self):
+        """Test that the same statement and parameters twice is a duplicate."""
+        with QueryRecorder() as recorder:
+            User.objects.get(pk=self.users[0].pk)
+            User.objects.get(pk=self.users[0].pk)
+
+        self.assertEqual(list(recorder.duplicates().values()), [2])
+
+    def test_login_save_does_not_reread_user(self):
+        """Test that saving a loaded user without changing email costs one query."""
+        user = User.objects.get(pk=self.users[0].pk)
+
+        with QueryRecorder() as recorder:
+            user.save(update_fields=["last_login"])
+            user.first_name = "Changed"
+            user.save()
+
+        self.assertEqual(recorder.count, 2)
+
+    def test_email_change_resets_verification(self):
+        """Test that changing the email still clears is_email_verified."""
+        User.objects.filter(pk=self.users[0].pk).update(is_email_verified=True)
+        user = User.objects.get(pk=self.users[0].pk)
+
+        user.email = "changed@purdue.edu"
+        user.save()
+
+        self.assertFalse(User.objects.get(pk=user.pk).is_email_verified)
+
+
+@override_settings(DEBUG=True, QUERY_INSPECTOR_MODE="raise", QUERY_INSPECTOR_REPEAT_THRESHOLD=2)
+class QueryInspectorMiddlewareTestCase(TestCase):
+    """Test the DEBUG per-request inspector."""
+
+    def test_raises_on_n_plus_one(self):
+        """Test that "raise" mode turns an N+1 into an error."""
+        User.objects.create_user(username="a", email="a@purdue.edu")
+        User.objects.create_user(username="b", email="b@purdue.edu")
+
+        def view(request):
+            for user in User.objects.all():
+                User.objects.filter(pk=user.pk).exists()
+            return HttpResponse()
+
+        with self.assertRaises(QueryProblem):
+            QueryInspectorMiddleware(view)(RequestFactory().get("/"))
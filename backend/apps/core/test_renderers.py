@@ -0,0 +1,124 @@
+"""Tests for the orjson and MessagePack renderers and parsers."""
+
+import datetime
+import decimal
+import importlib.util
+import io
+import unittest
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.renderers import JSONRenderer
+
+from .management.commands.benchmark_renderers import user_page
+from .renderers import ORJSONParser, ORJSONRenderer
+
+HAS_MSGPACK = importlib.util.find_spec("msgpack") is not None
+
+User = get_user_model()
+
+
+class ORJSONRendererTestCase(TestCase):
+    """Test that orjson output matches DRF's JSONRenderer byte for byte."""
+
+    def assertSameAsDRF(self, data, accepted_media_type=None, renderer_context=None):
+        self.assertEqual(
+            ORJSONRenderer().render(data, accepted_media_type, renderer_context),
+            JSONRenderer().render(data, accepted_media_type, renderer_context),
+        )
+
+    def test_user_pages(self):
+        """Test that serialized user pages render identically."""
+        self.assertSameAsDRF(user_page(20))
+
+    def test_values_outside_json(self):
+        """Test that datetimes, Decimal, UUID, lazy strings and errors render as DRF does."""
+        aware = datetime.datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc)
+        self.assertSameAsDRF(
+            {
+                "aware": aware,
+                "local": timezone.localtime(aware, datetime.timezone(datetime.timedelta(hours=-5))),
+                "naive": datetime.datetime(2025, 1, 2, 3, 4, 5),
+                "date": datetime.date(2025, 1, 2),
+                "time": datetime.time(3, 4, 5),
+                "duration": datetime.timedelta(minutes=90),
+                "decimal": decimal.Decimal("1.50"),
+                "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+                "lazy": gettext_lazy("This field is required."),
+                "error": [ErrorDetail("Invalid.", code="invalid")],
+                "tuple": (1, 2),
+                1: "integer key",
+            }
+        )
+
+    def test_unicode_and_line_separators(self):
+        """Test that non-ASCII stays UTF-8 and U+2028/U+2029 are escaped."""
+        self.assertSameAsDRF({"name": "Zoë 日本 \u2028\u2029 </script>"})
+
+    def test_queryset(self):
+        """Test that a queryset renders as a list."""
+        User.objects.create_user(username="qs", email="qs@example.com", password="x")
+        self.assertSameAsDRF({"ids": User.objects.values_list("id", flat=True)})
+
+    def test_empty_and_indent(self):
+        """Test that None renders empty and an indent parameter pretty-prints."""
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+        content = ORJSONRenderer().render({"a": [1]}, "application/json; indent=4")
+        self.assertEqual(content, b'{\n  "a": [\n    1\n  ]\n}')
+
+
+class ORJSONParserTestCase(TestCase):
+    """Test parsing request bodies with orjson."""
+
+    def test_parse(self):
+        """Test that a body parses to Python values."""
+        data = ORJSONParser().parse(io.BytesIO('{"name": "Zoë", "n": [1, 2.5]}'.encode()))
+        self.assertEqual(data, {"name": "Zoë", "n": [1, 2.5]})
+
+    def test_invalid(self):
+        """Test that malformed JSON and NaN are rejected with a ParseError."""
+        for body in (b"{", b'{"a": NaN}'):
+            with self.assertRaises(ParseError):
+                ORJSONParser().parse(io.BytesIO(body))
+
+    def test_malformed_request(self):
+        """Test that the API answers malformed JSON with a 400."""
+        response = self.client.post("/api/auth/login/", data=b"{", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+
+@unittest.skipUnless(HAS_MSGPACK, "msgpack is not installed")
+class MessagePackTestCase(TestCase):
+    """Test the optional application/msgpack content type."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="packer", email="packer@example.com", password="pw-12345"
+        )
+
+    def test_content_negotiation(self):
+        """Test that Accept: application/msgpack gets the same data as JSON."""
+        import msgpack
+
+        self.client.force_login(self.user)
+        json_data = self.client.get("/api/auth/user/").json()
+        response = self.client.get("/api/auth/user/", HTTP_ACCEPT="application/msgpack")
+
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(response.content), json_data)
+
+    def test_request_body(self):
+        """Test that a msgpack request body is parsed."""
+        import msgpack
+
+        response = self.client.post(
+            "/api/auth/login/",
+            data=msgpack.packb({"username_or_email": "packer", "password": "pw-12345"}),
+            content_type="application/msgpack",
+        )
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,86 @@
+"""Tests for the prebuilt SPA shell."""
+
+import gzip
+import json
+import re
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from . import shell
+
+User = get_user_model()
+
+
+def embedded(response, key):
+    """Parse a value embedded in window.__DJANGO_CONTEXT__."""
+    match = re.search(rf"^\s*{key}: (.*),$", response.content.decode(), re.MULTILINE)
+    return json.loads(match.group(1).replace("/*user*/", ""))
+
+
+class ReactAppViewTestCase(TestCase):
+    """Test serving the React catch-all from the prebuilt shell."""
+
+    def setUp(self):
+        shell._shell = None
+        self.addCleanup(setattr, shell, "_shell", None)
+
+    def test_gzip_variant_and_csrf_cookie(self):
+        """Test that the shell is served compressed and still sets the CSRF cookie."""
+        response = self.client.get("/some/route", HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn(b"__DJANGO_CONTEXT__", gzip.decompress(response.content))
+        self.assertIn("csrftoken", response.cookies)
+
+    def test_etag_revalidation(self):
+        """Test that a repeat load with the ETag gets a 304."""
+        etag = self.client.get("/")["ETag"]
+
+        response = self.client.get("/dashboard", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_template_rendered_once(self):
+        """Test that repeat requests reuse the rendered shell."""
+        with mock.patch.object(shell, "render_to_string", return_value="<html></html>") as render:
+            self.client.get("/")
+            self.client.get("/other")
+
+        self.assertEqual(render.call_count, 1)
+
+
+class BootstrapPayloadTestCase(TestCase):
+    """Test the startup data embedded in the shell."""
+
+    def setUp(self):
+        shell._shell = None
+        self.addCleanup(setattr, shell, "_shell", None)
+
+    def test_embedded_data_matches_api(self):
+        """Test that the embedded user and auth config equal the API responses."""
+        user = User.objects.create_user(
+            username="boot", email="boot@purdue.edu", password="x", first_name="</script>"
+        )
+        self.client.force_login(user)
+
+        response = self.client.get("/")
+
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+        self.assertNotIn(b'</script>"', response.content)
+        self.assertEqual(
+            embedded(response, "currentUser"), self.client.get("/api/auth/user/").json()
+        )
+        self.assertEqual(
+            embedded(response, "authConfig"), self.client.get("/api/auth/config/").json()
+        )
+
+    def test_anonymous_gets_null_user(self):
+        """Test that signed-out visitors get the shared shell with no user."""
+        response = self.client.get("/")
+
+        self.assertIsNone(embedded(response, "currentUser"))
+        self.assertEqual(response["Cache-Control"], "no-cache")
@@ -0,0 +1,108 @@
+"""Tests for sizing gunicorn workers."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from .sizing import Recommendation, apply_to_config, cpu_limit, memory_limit, recommend
+
+MB = 2**20
+
+# Not in the backend's Docker image
+TEMPLATES = Path(__file__).resolve().parents[3] / "deployment" / "templates"
+
+
+class CgroupLimitsTestCase(SimpleTestCase):
+    """Test reading CPU and memory limits from a fake /sys/fs/cgroup."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.meminfo = self.write("meminfo", "MemTotal:        8388608 kB\n")
+
+    def write(self, path, content):
+        path = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(content)
+        return path
+
+    def test_cgroup_v2(self):
+        """Test the unified hierarchy's cpu.max and memory.max for this process's group."""
+        proc = self.write("proc-cgroup", "0::/system.slice/app.service\n")
+        self.write("cg/system.slice/app.service/cpu.max", "150000 100000\n")
+        self.write("cg/system.slice/app.service/memory.max", f"{512 * MB}\n")
+        root = os.path.join(self.root, "cg")
+
+        self.assertEqual(cpu_limit(root, proc), min(len(os.sched_getaffinity(0)), 1.5))
+        self.assertEqual(memory_limit(root, proc, self.meminfo), 512 * MB)
+
+    def test_cgroup_v1_unlimited(self):
+        """Test that v1's "no limit" values fall back to the CPUs and physical memory."""
+        proc = self.write("proc-cgroup", "4:memory:/\n1:cpu,cpuacct:/\n")
+        self.write("cg/cpu,cpuacct/cpu.cfs_quota_us", "-1\n")
+        self.write("cg/memory/memory.limit_in_bytes", "9223372036854771712\n")
+        root = os.path.join(self.root, "cg")
+
+        self.assertEqual(cpu_limit(root, proc), len(os.sched_getaffinity(0)))
+        self.assertEqual(memory_limit(root, proc, self.meminfo), 8 * 1024 * MB)
+
+
+class RecommendTestCase(SimpleTestCase):
+    """Test turning measurements into gunicorn settings."""
+
+    def test_cpu_bound(self):
+        """Test that hashing-heavy traffic gets sync workers, one per core and a spare."""
+        recommendation = recommend(4, 8192 * MB, 20 * MB, 60 * MB, 2048, cpu_fraction=0.9)
+        self.assertEqual((recommendation.worker_class, recommendation.workers), ("sync", 5))
+        self.assertEqual(recommendation.threads, 1)
+
+    def test_io_bound(self):
+        """Test that waiting traffic gets threads enough to keep the cores busy."""
+        recommendation = recommend(4, 8192 * MB, 20 * MB, 60 * MB, 2048, cpu_fraction=0.1)
+        self.assertEqual(recommendation.worker_class, "gthread")
+        self.assertEqual((recommendation.workers, recommendation.threads), (4, 10))
+
+    def test_memory_caps_workers(self):
+        """Test that the memory budget limits the workers and says so."""
+        recommendation = recommend(8, 400 * MB, 20 * MB, 100 * MB, 0, cpu_fraction=0.9)
+        self.assertEqual(recommendation.workers, 2)
+        self.assertTrue(recommendation.notes)
+
+    def test_growth_sets_max_requests(self):
+        """Test that faster-growing workers are recycled sooner."""
+        slow = recommend(2, 2048 * MB, 20 * MB, 60 * MB, 10 * 1024, cpu_fraction=0.9)
+        fast = recommend(2, 2048 * MB, 20 * MB, 60 * MB, 200 * 1024, cpu_fraction=0.9)
+        self.assertGreater(slow.max_requests, fast.max_requests)
+        self.assertGreaterEqual(fast.max_requests, 500)
+
+
+class ApplyToConfigTestCase(SimpleTestCase):
+    """Test writing a recommendation into a gunicorn config."""
+
+    def test_replaces_and_adds(self):
+        """Test that existing settings are replaced in place and missing ones appended."""
+        text = 'workers = 3\nworker_class = "sync"\n# workers = 9\nthreads = 1\ntimeout = 30\n'
+        updated = apply_to_config(text, Recommendation("gthread", 4, 8, 2000, 100, []))
+        self.assertEqual(
+            updated,
+            'workers = 4\nworker_class = "gthread"\n# workers = 9\nthreads = 8\ntimeout = 30\n'
+            "max_requests = 2000\nmax_requests_jitter = 100\n",
+        )
+
+    @unittest.skipUnless(TEMPLATES.is_dir(), "deployment templates not present")
+    def test_keeps_asgi_worker_class(self):
+        """Test that the ASGI template keeps its uvicorn worker, with only the counts sized."""
+        text = (TEMPLATES / "gunicorn-asgi.conf.template").read_text()
+        updated = apply_to_config(text, Recommendation("gthread", 4, 8, 2000, 100, []))
+
+        self.assertIn('worker_class = "config.asgi_worker.DjangoUvicornWorker"\n', updated)
+        self.assertIn('wsgi_app = "config.asgi:application"\n', updated)
+        self.assertNotIn('"gthread"', updated)
+        self.assertNotIn("threads = 8", updated)
+        self.assertIn("\nworkers = 4\n", updated)
+        self.assertIn("\nmax_requests = 2000\n", updated)
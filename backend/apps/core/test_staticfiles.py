@@ -0,0 +1,134 @@
+"""Tests for serving and collecting the Vite build's static files."""
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from .staticfiles import ViteWhiteNoiseMiddleware, is_vite_hashed
+
+VITE_JS = "assets/index-BvX3a_9K.js"
+
+
+def write(root, name, content):
+    path = os.path.join(root, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+class ViteStaticFilesTestCase(SimpleTestCase):
+    """Test immutable caching and precompressed variants for Vite assets."""
+
+    def setUp(self):
+        self.build = tempfile.mkdtemp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.build)
+        self.addCleanup(shutil.rmtree, self.root)
+        self.source = b"console.log('hello');" * 100
+        write(self.build, VITE_JS, self.source)
+        write(self.build, f"{VITE_JS}.br", b"prebuilt-br")
+        write(self.build, f"{VITE_JS}.gz", gzip.compress(self.source))
+        write(self.build, "robots.txt", b"User-agent: *\n" * 100)
+
+    def collect(self):
+        storages = {
+            "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+            "staticfiles": {"BACKEND": "apps.core.staticfiles.ViteManifestStaticFilesStorage"},
+        }
+        with override_settings(
+            STATIC_ROOT=self.root,
+            STATICFILES_DIRS=[self.build],
+            # Only the build directory, not the apps' static files
+            STATICFILES_FINDERS=["django.contrib.staticfiles.finders.FileSystemFinder"],
+            STORAGES=storages,
+        ):
+            call_command("collectstatic", interactive=False, verbosity=0)
+
+    def test_vite_files_skip_manifest_step(self):
+        """Test that Vite files keep their names and build-time compression."""
+        self.collect()
+
+        with open(os.path.join(self.root, "staticfiles.json")) as f:
+            paths = json.load(f)["paths"]
+        self.assertEqual(paths[VITE_JS], VITE_JS)
+        self.assertNotEqual(paths["robots.txt"], "robots.txt")
+        with open(os.path.join(self.root, f"{VITE_JS}.br"), "rb") as f:
+            self.assertEqual(f.read(), b"prebuilt-br")
+
+    def test_headers(self):
+        """Test Cache-Control and Content-Encoding for hashed and plain files."""
+        self.collect()
+        with override_settings(STATIC_ROOT=self.root, DEBUG=False):
+            middleware = ViteWhiteNoiseMiddleware(lambda request: HttpResponse())
+        factory = RequestFactory()
+
+        hashed = middleware(factory.get(f"/static/{VITE_JS}", HTTP_ACCEPT_ENCODING="gzip, br"))
+        plain = middleware(factory.get("/static/robots.txt", HTTP_ACCEPT_ENCODING="gzip"))
+
+        self.assertEqual(hashed["Cache-Control"], "max-age=315360000, public, immutable")
+        self.assertEqual(hashed["Content-Encoding"], "br")
+        self.assertNotIn("immutable", plain["Cache-Control"])
+        self.assertEqual(plain["Content-Encoding"], "gzip")
+
+    def test_incremental_compression_and_pruning(self):
+        """Test that unchanged files aren't recompressed and removed files are pruned."""
+        write(self.build, "app.css", b"body { color: red; }\n" * 100)
+        self.collect()
+        robots_gz = os.path.join(self.root, "robots.txt.gz")
+        os.utime(robots_gz, (0, 0))
+        write(self.root, "uploaded.txt", b"not produced by collectstatic")
+
+        os.remove(os.path.join(self.build, "app.css"))
+        self.collect()
+
+        self.assertEqual(os.path.getmtime(robots_gz), 0)
+        remaining = set()
+        for directory, _, files in os.walk(self.root):
+            remaining |= {os.path.relpath(os.path.join(directory, f), self.root) for f in files}
+        self.assertFalse([name for name in remaining if name.startswith("app.")])
+        self.assertIn("uploaded.txt", remaining)
+        self.assertIn(VITE_JS, remaining)
+
+    def test_vite_hash_pattern(self):
+        """Test which names count as Vite-hashed."""
+        self.assertTrue(is_vite_hashed("assets/vendor-C0_a-9Zz.js.gz"))
+        self.assertFalse(is_vite_hashed("assets/logo.svg"))
+        self.assertFalse(is_vite_hashed("admin/js/core-abcdefgh.js"))
+        self.assertFalse(is_vite_hashed("assets/app-settings.json"))
+        self.assertFalse(is_vite_hashed("assets/site-override.css"))
+
+    def test_manifest_decides(self):
+        """Test that with a manifest, exactly its files (and their variants) are Vite-hashed."""
+        files = {"assets/index-abcdEFGH.js", "assets/logo-xyzwQRST.svg"}
+
+        self.assertTrue(is_vite_hashed("assets/index-abcdEFGH.js.br", files))
+        self.assertTrue(is_vite_hashed("assets/logo-xyzwQRST.svg", files))
+        self.assertFalse(is_vite_hashed(VITE_JS, files))
+        self.assertFalse(is_vite_hashed("assets/app-settings.json", files))
+
+    def test_headers_follow_manifest(self):
+        """Test that only the manifest's files are immutable when the build has one."""
+        digitless = "assets/index-abcdEFGH.js"
+        write(self.build, digitless, self.source)
+        write(self.build, "assets/site-override.css", b"body {}\n")
+        manifest = {"index.html": {"file": digitless, "isEntry": True}}
+        write(self.build, "manifest.json", json.dumps(manifest).encode())
+        self.collect()
+        with open(os.path.join(self.root, "staticfiles.json")) as f:
+            self.assertEqual(json.load(f)["paths"][digitless], digitless)
+
+        with override_settings(STATIC_ROOT=self.root, DEBUG=False):
+            middleware = ViteWhiteNoiseMiddleware(lambda request: HttpResponse())
+        factory = RequestFactory()
+
+        listed = middleware(factory.get(f"/static/{digitless}"))
+        unlisted = middleware(factory.get("/static/assets/site-override.css"))
+
+        self.assertIn("immutable", listed["Cache-Control"])
+        self.assertNotIn("immutable", unlisted["Cache-Control"])
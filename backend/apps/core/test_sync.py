@@ -0,0 +1,99 @@
+"""Tests for delta sync of the user list."""
+
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from rest_framework.pagination import PageNumberPagination
+
+from apps.authentication.models import UserTombstone
+
+from .sync import make_cursor, parse_cursor
+
+User = get_user_model()
+
+
+@override_settings(SYNC_CURSOR_OVERLAP=0)
+class DeltaSyncTestCase(TestCase):
+    """Test ?since=<cursor> on the user list."""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.edu", password="pw"
+        )
+        self.alice = User.objects.create_user(username="alice", email="alice@example.edu")
+        self.bob = User.objects.create_user(username="bob", email="bob@example.edu")
+        self.client.force_login(self.admin)
+
+    def sync(self, cursor):
+        response = self.client.get("/api/auth/users/", {"since": cursor})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_nothing_changed(self):
+        """Test that a fresh cursor returns no changes."""
+        later = make_cursor(timezone.now() + timedelta(seconds=1))
+        self.assertEqual(self.sync(later)["results"], [])
+
+    def test_changes_and_deletions(self):
+        """Test that only changed rows come back, with deleted ids and a new cursor."""
+        cursor = make_cursor(timezone.now())
+        self.alice.first_name = "Alice"
+        self.alice.save()
+        User.objects.create_user(username="carol", email="carol@example.edu")
+        bob_id = self.bob.id
+        self.bob.delete()
+
+        data = self.sync(cursor)
+
+        self.assertEqual(sorted(user["username"] for user in data["results"]), ["alice", "carol"])
+        self.assertEqual(data["deleted"], [bob_id])
+        self.assertEqual(data["count"], 3)
+        self.assertGreater(int(data["sync_cursor"]), int(cursor))
+
+    def test_page_ids_follow_the_list_order(self):
+        """Test that deltas carry the first page's ids in the order the full list has."""
+        User.objects.create_user(username="Carol", email="carol@example.edu")
+        cursor = make_cursor(timezone.now())
+
+        with mock.patch.object(PageNumberPagination, "page_size", 2):
+            full = self.client.get("/api/auth/users/").json()
+            data = self.sync(cursor)
+
+        self.assertEqual(data["page_ids"], [user["id"] for user in full["results"]])
+        self.assertEqual(len(data["page_ids"]), 2)
+
+    def test_partial_saves_count_as_changes(self):
+        """Test that saves with update_fields, like the login timestamp, bump updated_at."""
+        cursor = make_cursor(timezone.now())
+        update_last_login(None, self.bob)
+
+        usernames = [user["username"] for user in self.sync(cursor)["results"]]
+        self.assertEqual(usernames, ["bob"])
+
+    def test_full_list_carries_cursor(self):
+        """Test that a full list page includes a cursor to sync from."""
+        data = self.client.get("/api/auth/users/").json()
+        self.assertLessEqual(parse_cursor(data["sync_cursor"]), timezone.now())
+        self.assertEqual(data["count"], 3)
+
+    def test_invalid_and_expired_cursors(self):
+        """Test that garbage cursors are a 400 and ones past tombstone retention a 410."""
+        self.assertEqual(self.client.get("/api/auth/users/", {"since": "x"}).status_code, 400)
+        expired = make_cursor(timezone.now() - timedelta(days=31))
+        self.assertEqual(self.client.get("/api/auth/users/", {"since": expired}).status_code, 410)
+
+    def test_old_tombstones_pruned(self):
+        """Test that deleting a user prunes tombstones past retention."""
+        UserTombstone.objects.create(user_id=999)
+        UserTombstone.objects.filter(user_id=999).update(
+            deleted_at=timezone.now() - timedelta(days=40)
+        )
+        bob_id = self.bob.id
+        self.bob.delete()
+
+        self.assertEqual(list(UserTombstone.objects.values_list("user_id", flat=True)), [bob_id])
@@ -0,0 +1,185 @@
+"""Tests for the atomic throttle backends shared across worker processes."""
+
+import importlib.util
+import multiprocessing
+import shutil
+import socket
+import sqlite3
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .throttling import _REDIS_SCRIPT, RedisRateLimiter, SQLiteRateLimiter, _build_rate_limiter
+
+HAS_FAKEREDIS = importlib.util.find_spec("fakeredis") is not None
+
+WORKERS = 4
+HITS_PER_WORKER = 25
+LIMIT = 30
+
+
+def _hammer(limiter_factory, results):
+    """Worker process body: count how many of our hits were allowed."""
+    limiter = limiter_factory()
+    allowed = sum(
+        limiter.hit("throttle_test_shared", LIMIT, 3600)[0] for _ in range(HITS_PER_WORKER)
+    )
+    results.put(allowed)
+
+
+def _run_workers(limiter_factory):
+    """Run WORKERS processes against the same limiter and return total allowed hits."""
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=_hammer, args=(limiter_factory, results)) for _ in range(WORKERS)
+    ]
+    for process in processes:
+        process.start()
+    totals = [results.get(timeout=30) for _ in processes]
+    for process in processes:
+        process.join(timeout=30)
+    return sum(totals)
+
+
+class SQLiteRateLimiterTestCase(SimpleTestCase):
+    """Test the SQLite counter-file limiter."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = Path(self.tmpdir) / "throttle.sqlite3"
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_limit_is_shared_across_processes(self):
+        """Test that several worker processes share one limit."""
+        total = _run_workers(lambda: SQLiteRateLimiter(self.path))
+        self.assertEqual(total, LIMIT)
+
+    def test_previous_window_is_weighted(self):
+        """Test that hits in the previous window decay across the current one."""
+        limiter = SQLiteRateLimiter(self.path)
+        for _ in range(10):
+            self.assertTrue(limiter.hit("k", 10, 60, now=60.0)[0])
+
+        # Rest of the first window: rejected until the window rolls over
+        allowed, retry_after = limiter.hit("k", 10, 60, now=90.0)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(retry_after, 30.0)
+
+        # Halfway through, half of the previous window has decayed
+        allowed_count = sum(limiter.hit("k", 10, 60, now=150.0)[0] for _ in range(10))
+        self.assertEqual(allowed_count, 5)
+
+    def test_fails_open_when_file_cannot_be_opened(self):
+        """Test that hits are allowed and logged when the counter file can't be created."""
+        self.path.touch()
+        limiter = SQLiteRateLimiter(self.path / "throttle.sqlite3")
+
+        with self.assertLogs("apps.core.throttling", "ERROR"):
+            self.assertEqual(limiter.hit("k", 1, 60, now=0.0), (True, None))
+
+    def test_fails_open_while_locked(self):
+        """Test that a hit waiting past the lock timeout is allowed, and counting resumes after."""
+        limiter = SQLiteRateLimiter(self.path)
+        limiter.lock_timeout = 0.05
+        limiter.hit("k", 1, 60, now=0.0)
+        other = sqlite3.connect(self.path, isolation_level=None)
+        self.addCleanup(other.close)
+        other.execute("BEGIN IMMEDIATE")
+
+        with self.assertLogs("apps.core.throttling", "ERROR"):
+            self.assertEqual(limiter.hit("k", 1, 60, now=0.0), (True, None))
+
+        other.execute("ROLLBACK")
+        self.assertFalse(limiter.hit("k", 1, 60, now=0.0)[0])
+
+
+@unittest.skipUnless(HAS_FAKEREDIS, "fakeredis is not installed")
+class RedisRateLimiterTestCase(SimpleTestCase):
+    """Test the Redis limiter against a fake Redis server shared over TCP."""
+
+    def setUp(self):
+        from fakeredis import TcpFakeServer
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        self.server = TcpFakeServer(("127.0.0.1", port), server_type="redis")
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"redis://127.0.0.1:{port}/0"
+
+        # The fake server drops the connection after an EVALSHA miss instead of
+        # letting redis-py fall back to SCRIPT LOAD, so load the script up front
+        import redis
+
+        redis.Redis.from_url(self.url).script_load(_REDIS_SCRIPT)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_limit_is_shared_across_processes(self):
+        """Test that several worker processes share one limit."""
+        total = _run_workers(lambda: RedisRateLimiter(self.url))
+        self.assertEqual(total, LIMIT)
+
+    def test_rejected_hits_are_not_counted(self):
+        """Test that a rejected hit does not consume budget in the next window."""
+        limiter = RedisRateLimiter(self.url)
+        for _ in range(5):
+            limiter.hit("k", 3, 60, now=0.0)
+        # Halfway through the next window only the three allowed hits still weigh in
+        allowed_count = sum(limiter.hit("k", 3, 60, now=90.0)[0] for _ in range(3))
+        self.assertEqual(allowed_count, 2)
+
+    def test_fails_open_when_redis_is_down(self):
+        """Test that hits are allowed and logged while Redis is unreachable."""
+        limiter = RedisRateLimiter(self.url)
+        limiter.hit("k", 1, 60, now=0.0)
+        self.server.shutdown()
+        self.server.server_close()
+
+        with self.assertLogs("apps.core.throttling", "ERROR"):
+            self.assertEqual(limiter.hit("k", 1, 60, now=0.0), (True, None))
+
+
+class ContactThrottleTestCase(APITestCase):
+    """Test that the contact form throttle uses the atomic limiter."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        _build_rate_limiter.cache_clear()
+
+    def tearDown(self):
+        _build_rate_limiter.cache_clear()
+        shutil.rmtree(self.tmpdir)
+
+    def test_contact_form_is_throttled(self):
+        """Test that the sixth anonymous submission in an hour is rejected."""
+        data = {
+            "name": "Test User",
+            "email": "test@purdue.edu",
+            "subject": "Hello",
+            "message": "This is a test message.",
+        }
+        with override_settings(
+            THROTTLE_BACKEND="sqlite",
+            THROTTLE_SQLITE_PATH=str(Path(self.tmpdir) / "throttle.sqlite3"),
+            EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+        ):
+            for _ in range(5):
+                response = self.client.post("/api/contact/", data, format="json")
+                self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            response = self.client.post("/api/contact/", data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response)
@@ -0,0 +1,55 @@
+"""Tests for the Server-Timing middleware."""
+
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+
+class ServerTimingTestCase(APITestCase):
+    """Test the per-phase Server-Timing header."""
+
+    def setUp(self):
+        """Create and log in a test user."""
+        self.user = User.objects.create_user(
+            username="timing", email="timing@purdue.edu", password="TestPass123!"
+        )
+        self.client.force_login(self.user)
+
+    def _phases(self, response):
+        return {entry.split(";")[0].strip() for entry in response["Server-Timing"].split(",")}
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1.0)
+    def test_current_user_phases(self):
+        """Test that an API request reports each phase it went through."""
+        response = self.client.get("/api/auth/user/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(
+            {"session", "auth", "view", "db", "serialize", "render", "total"}
+            <= self._phases(response)
+        )
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0.0)
+    def test_unsampled_requests_have_no_header(self):
+        """Test that requests outside the sample are left untouched."""
+        response = self.client.get("/api/auth/user/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1.0, SERVER_TIMING_ACCESS_LOG=True)
+    def test_access_log_line(self):
+        """Test that timed requests are logged as one JSON line."""
+        with self.assertLogs("apps.core.access", level="INFO") as logs:
+            self.client.get("/api/auth/user/")
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["view"], "authentication:current-user")
+        self.assertEqual(record["status"], 200)
+        self.assertIn("total", record["timings_ms"])
@@ -0,0 +1,83 @@
+"""Tests for the Vite asset template tags."""
+
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from .templatetags import vite_assets
+
+MANIFEST = {
+    "index.html": {
+        "file": "assets/index-abc.js",
+        "isEntry": True,
+        "src": "index.html",
+        "imports": ["_vendor-123.js", "_query-456.js"],
+        "css": ["assets/index-def.css"],
+    },
+    "_vendor-123.js": {"file": "assets/vendor-123.js"},
+    "_query-456.js": {"file": "assets/query-456.js", "imports": ["_vendor-123.js"]},
+}
+
+
+class ViteAssetsTestCase(SimpleTestCase):
+    """Test resolving hashed assets from the Vite build."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.root, "assets"))
+        override = override_settings(DEBUG=False, STATIC_ROOT=self.root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.addCleanup(vite_assets._cache.clear)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def write_manifest(self, manifest, mtime):
+        path = os.path.join(self.root, "manifest.json")
+        with open(path, "w") as f:
+            json.dump(manifest, f)
+        os.utime(path, (mtime, mtime))
+
+    def test_tags_and_preload_hints_from_manifest(self):
+        """Test that the entry gets tags and its imports get preload hints."""
+        self.write_manifest(MANIFEST, 1)
+
+        self.assertEqual(
+            vite_assets.vite_assets(),
+            '<link rel="stylesheet" href="/static/assets/index-def.css">\n        '
+            '<script type="module" src="/static/assets/index-abc.js"></script>',
+        )
+        hints = vite_assets.vite_preload()
+        self.assertIn('<link rel="preload" as="style" href="/static/assets/index-def.css">', hints)
+        self.assertEqual(hints.count('rel="modulepreload"'), 3)
+        self.assertEqual(vite_assets.vite_asset("vendor*.js"), "/static/assets/vendor-123.js")
+
+    def test_manifest_read_once_until_it_changes(self):
+        """Test that renders reuse the parsed manifest until its mtime changes."""
+        self.write_manifest(MANIFEST, 1)
+
+        with mock.patch.object(vite_assets.json, "load", wraps=json.load) as load:
+            vite_assets.vite_assets()
+            vite_assets.vite_assets()
+            self.assertEqual(load.call_count, 1)
+
+            rebuilt = dict(MANIFEST, **{"index.html": dict(MANIFEST["index.html"], css=[])})
+            self.write_manifest(rebuilt, 2)
+            self.assertNotIn("stylesheet", vite_assets.vite_assets())
+            self.assertEqual(load.call_count, 2)
+
+    def test_directory_fallback_without_manifest(self):
+        """Test that builds without manifest.json still get their assets."""
+        for name in ("index-abc.js", "vendor-123.js", "index-def.css"):
+            open(os.path.join(self.root, "assets", name), "w").close()
+
+        tags = vite_assets.vite_assets()
+
+        self.assertIn('href="/static/assets/index-def.css"', tags)
+        self.assertIn('src="/static/assets/index-abc.js"', tags)
+        self.assertIn("/static/assets/vendor-123.js", vite_assets.vite_preload())
@@ -0,0 +1,141 @@
+"""Tests for warming the app before gunicorn forks its workers."""
+
+import gc
+import os
+import shutil
+import signal
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth.password_validation import get_default_password_validators
+from django.core.asgi import get_asgi_application
+from django.core.wsgi import get_wsgi_application
+from django.db import connection, connections
+from django.test import TestCase
+
+from config import gunicorn_hooks, rolling_reload
+
+from .warmup import warm, warm_requests
+
+
+def server(preload_app):
+    return SimpleNamespace(cfg=SimpleNamespace(preload_app=preload_app), log=mock.Mock())
+
+
+class WarmupTestCase(TestCase):
+    """Test the warmup steps and the gunicorn hooks that run them."""
+
+    def test_warm_runs_every_step(self):
+        """Test that every step succeeds and leaves its cache filled."""
+        get_default_password_validators.cache_clear()
+        self.assertEqual(warm(), [])
+        self.assertEqual(get_default_password_validators.cache_info().currsize, 1)
+
+    def test_failed_step_is_reported(self):
+        """Test that one failing step does not stop the others."""
+        steps = [("broken", mock.Mock(side_effect=RuntimeError)), ("fine", mock.Mock())]
+        with mock.patch("apps.core.warmup.STEPS", steps):
+            self.assertEqual(warm(), ["broken"])
+        steps[1][1].assert_called_once()
+
+    def test_hooks_do_nothing_without_preload(self):
+        """Test that workers importing the app themselves skip the master's warmup."""
+        with mock.patch("apps.core.warmup.warm") as warm_mock:
+            gunicorn_hooks.when_ready(server(preload_app=False))
+        warm_mock.assert_not_called()
+
+    def test_pre_fork_closes_connections_and_freezes(self):
+        """Test that the master forks without open connections or collectable objects."""
+        self.addCleanup(gc.unfreeze)
+        with mock.patch.object(connection, "close") as close:
+            gunicorn_hooks.pre_fork(server(preload_app=True), worker=None)
+        close.assert_called()
+        self.assertGreater(gc.get_freeze_count(), 0)
+
+    def test_pre_fork_closes_pools(self):
+        """Test that a native database pool is closed, not only its borrowed connection."""
+        self.addCleanup(gc.unfreeze)
+        pooled = mock.Mock(settings_dict={"OPTIONS": {"pool": {"max_size": 4}}})
+        unpooled = mock.Mock(settings_dict={"OPTIONS": {}})
+        with mock.patch.object(connections, "all", return_value=[pooled, unpooled]):
+            gunicorn_hooks.pre_fork(server(preload_app=True), worker=None)
+        pooled.close_pool.assert_called_once()
+        unpooled.close_pool.assert_not_called()
+
+
+class WarmRequestsTestCase(TestCase):
+    """Test warming a worker with requests through its own app."""
+
+    def test_wsgi_and_asgi(self):
+        """Test that the default paths answer through both app interfaces."""
+        for application in (get_wsgi_application(), get_asgi_application()):
+            results = warm_requests(application)
+            self.assertEqual(
+                [(path, status) for path, status, _ in results],
+                [("/", 200), ("/api/health/", 200), ("/api/auth/config/", 200)],
+            )
+
+    def test_post_worker_init_marks_ready(self):
+        """Test that a warmed worker leaves its ready marker, and removes it on exit."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        worker = SimpleNamespace(wsgi=get_wsgi_application(), log=mock.Mock())
+        marker = os.path.join(directory, str(os.getpid()))
+        with mock.patch.dict(os.environ, {gunicorn_hooks.READY_DIR_ENV: directory}):
+            gunicorn_hooks.post_worker_init(worker)
+            self.assertTrue(os.path.exists(marker))
+            gunicorn_hooks.worker_exit(server(preload_app=False), worker)
+        self.assertFalse(os.path.exists(marker))
+
+
+class FakeMaster:
+    """Stands in for a gunicorn master: TTIN forks a warm worker, TTOU stops the oldest."""
+
+    def __init__(self, ready_dir, workers):
+        self.ready_dir = ready_dir
+        self.workers = list(workers)
+        self.next_pid = max(workers) + 1
+
+    def children(self, pid):
+        return sorted(self.workers)
+
+    def kill(self, pid, sig):
+        if sig == signal.SIGTTIN:
+            self.workers.append(self.next_pid)
+            open(os.path.join(self.ready_dir, str(self.next_pid)), "w").close()
+            self.next_pid += 1
+        elif sig == signal.SIGTTOU:
+            self.workers.pop(0)
+
+
+class RollingReloadTestCase(TestCase):
+    """Test replacing workers one at a time."""
+
+    def setUp(self):
+        self.ready_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.ready_dir)
+        patcher = mock.patch.dict(os.environ, {gunicorn_hooks.READY_DIR_ENV: self.ready_dir})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def roll(self, master):
+        with (
+            mock.patch.object(rolling_reload, "children", master.children),
+            mock.patch.object(rolling_reload.os, "kill", master.kill),
+        ):
+            rolling_reload.roll(1, timeout=1, log=lambda message: None)
+
+    def test_replaces_every_worker(self):
+        """Test that every old worker is gone and as many new ones are running."""
+        master = FakeMaster(self.ready_dir, [10, 11, 12])
+        self.roll(master)
+        self.assertEqual(master.workers, [13, 14, 15])
+
+    def test_refuses_preloaded_master(self):
+        """Test that a preloaded master is left alone: its new workers would run old code."""
+        open(os.path.join(self.ready_dir, "preloaded"), "w").close()
+        master = FakeMaster(self.ready_dir, [10, 11])
+        with self.assertRaises(rolling_reload.ReloadError):
+            self.roll(master)
+        self.assertEqual(master.workers, [10, 11])
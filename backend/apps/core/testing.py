@@ -0,0 +1,60 @@
+"""
+Test helpers shared across the apps.
+
+QueryBudgetMixin pins how many queries an endpoint may run, and fails on
+N+1 patterns and duplicate queries, so regressions show up as test failures
+rather than slow pages:
+
+    class UserApiTestCase(QueryBudgetMixin, APITestCase):
+        def test_list(self):
+            with self.assertQueryBudget(3):
+                self.client.get("/api/auth/users/")
+"""
+
+from contextlib import contextmanager
+
+from .queries import QueryRecorder
+
+
+class QueryBudgetMixin:
+    """Assertions on the queries run inside a block, for TestCase subclasses."""
+
+    @contextmanager
+    def assertQueryBudget(self, max_queries, repeat_threshold=3, allow_duplicates=False):
+        """
+        Fail if the block runs more than `max_queries` queries, repeats one
+        query shape `repeat_threshold` or more times, or (unless allowed)
+        runs the exact same query twice.
+        """
+        with QueryRecorder() as recorder:
+            yield recorder
+
+        details = "\n".join(
+            f"  {index}. {query['sql']}" for index, query in enumerate(recorder.queries, 1)
+        )
+        self.assertLessEqual(
+            recorder.count,
+            max_queries,
+            f"{recorder.count} queries run, budget is {max_queries}:\n{details}",
+        )
+        repeated = recorder.repeated(repeat_threshold)
+        self.assertFalse(repeated, f"Possible N+1, query shapes repeated: {repeated}")
+        if not allow_duplicates:
+            duplicates = recorder.duplicates()
+            self.assertFalse(duplicates, f"Duplicate queries: {duplicates}")
+
+    def assertConstantQueries(self, request, grow):
+        """
+        Fail if `request()` runs more queries after `grow()` adds rows, i.e.
+        the query count depends on the number of results.
+        """
+        with QueryRecorder() as before:
+            request()
+        grow()
+        with QueryRecorder() as after:
+            request()
+        self.assertEqual(
+            before.count,
+            after.count,
+            f"Query count grew from {before.count} to {after.count} with more rows",
+        )
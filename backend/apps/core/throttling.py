@@ -0,0 +1,275 @@
+"""
+Atomic rate limiting for DRF throttles.
+
+DRF's SimpleRateThrottle keeps a list of request timestamps in the cache and
+rewrites it on every request. That read-modify-write races between workers,
+and with LocMemCache each gunicorn worker keeps its own history, so the real
+limit is multiplied by the worker count.
+
+The limiters here use a sliding-window counter instead: two integer counters
+per key (current and previous window) and a weighted estimate. Each check is
+O(1) and atomic, either as a Lua script in Redis or as a single SQLite
+transaction in a counter file shared by the workers on one host.
+
+Select the backend with settings.THROTTLE_BACKEND:
+- "redis": Lua script against THROTTLE_REDIS_URL
+- "sqlite": counter file at THROTTLE_SQLITE_PATH
+- "cache": DRF's default cache-based history (no atomic limiter)
+"""
+
+import functools
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+from .metrics import THROTTLE_REJECTIONS
+
+logger = logging.getLogger(__name__)
+
+# Sliding-window counter: allow the hit only if the weighted estimate of the
+# last `window` seconds is below the limit, then count it in the current window.
+# Keys share a {hash tag} so both counters live in the same Redis Cluster slot.
+_REDIS_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local limit = tonumber(ARGV[1])
+local weight = tonumber(ARGV[2])
+if previous * weight + current >= limit then
+    return {0, current, previous}
+end
+current = redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))
+return {1, current, previous}
+"""
+
+
+def _window_position(now, window):
+    """Return (window index, fraction of the current window already elapsed)."""
+    index = int(now // window)
+    return index, (now - index * window) / window
+
+
+def _retry_after(current, previous, limit, window, elapsed):
+    """
+    Seconds until the weighted estimate drops below the limit again.
+
+    Only the previous window's weight decays within the current window, so if
+    the current window alone is over the limit the caller has to wait for the
+    next window to start.
+    """
+    remaining = window * (1 - elapsed)
+    if current >= limit or previous == 0:
+        return remaining
+    # previous * (1 - f) + current < limit  =>  f > 1 - (limit - current) / previous
+    target = 1 - (limit - current) / previous
+    return max(0.0, min(remaining, (target - elapsed) * window))
+
+
+class RedisRateLimiter:
+    """
+    Sliding-window rate limiter backed by Redis counters.
+
+    One EVALSHA round trip per check; the script runs atomically on the server,
+    so every worker on every host shares the same counters. If Redis can't be
+    reached the check fails open: the request is allowed and the error logged,
+    so an outage doesn't turn every throttled endpoint into a 500.
+    """
+
+    # Seconds to wait for Redis before letting the request through
+    socket_timeout = 1.0
+
+    def __init__(self, url, key_prefix="throttle"):
+        import redis
+
+        self.client = redis.Redis.from_url(
+            url,
+            socket_connect_timeout=self.socket_timeout,
+            socket_timeout=self.socket_timeout,
+        )
+        self.key_prefix = key_prefix
+        self.script = self.client.register_script(_REDIS_SCRIPT)
+        self._redis_error = redis.RedisError
+
+    def hit(self, key, limit, window, now=None):
+        """
+        Count a request against `key`.
+
+        Returns (allowed, retry_after_seconds).
+        """
+        now = time.time() if now is None else now
+        index, elapsed = _window_position(now, window)
+        base = f"{self.key_prefix}:{{{key}}}"
+        try:
+            allowed, current, previous = self.script(
+                keys=[f"{base}:{index}", f"{base}:{index - 1}"],
+                args=[limit, 1 - elapsed, int(window * 2)],
+            )
+        except self._redis_error:
+            logger.exception("Rate limiter could not reach Redis; allowing %s", key)
+            return True, None
+        if allowed:
+            return True, None
+        return False, _retry_after(int(current), int(previous), limit, window, elapsed)
+
+
+class SQLiteRateLimiter:
+    """
+    Sliding-window rate limiter backed by a SQLite counter file.
+
+    Used when Redis is not configured. Every worker process on the host opens
+    the same file, and each check is one BEGIN IMMEDIATE transaction, so the
+    counters are shared and updated atomically without a separate service.
+    Like the Redis limiter it fails open, allowing the request and logging the
+    error, when the file can't be opened or stays locked past the timeout.
+    """
+
+    # Expired rows for keys that never come back are swept every N writes
+    prune_interval = 1000
+    # Seconds to wait for another worker's lock before letting the request through
+    lock_timeout = 5.0
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+        self._writes = 0
+
+    def _connection(self):
+        """Return this thread's connection, reopening it after a fork."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.lock_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS throttle_counter ("
+                " key TEXT NOT NULL,"
+                " window INTEGER NOT NULL,"
+                " count INTEGER NOT NULL,"
+                " expires REAL NOT NULL,"
+                " PRIMARY KEY (key, window)"
+                ") WITHOUT ROWID"
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def hit(self, key, limit, window, now=None):
+        """
+        Count a request against `key`.
+
+        Returns (allowed, retry_after_seconds).
+        """
+        now = time.time() if now is None else now
+        index, elapsed = _window_position(now, window)
+        try:
+            conn = self._connection()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                counts = dict(
+                    conn.execute(
+                        "SELECT window, count FROM throttle_counter "
+                        "WHERE key = ? AND window IN (?, ?)",
+                        (key, index, index - 1),
+                    ).fetchall()
+                )
+                current = counts.get(index, 0)
+                previous = counts.get(index - 1, 0)
+                allowed = previous * (1 - elapsed) + current < limit
+                if allowed:
+                    conn.execute(
+                        "INSERT INTO throttle_counter (key, window, count, expires) "
+                        "VALUES (?, ?, 1, ?) "
+                        "ON CONFLICT (key, window) DO UPDATE SET count = count + 1",
+                        (key, index, now + window * 2),
+                    )
+                    conn.execute(
+                        "DELETE FROM throttle_counter WHERE key = ? AND window < ?",
+                        (key, index - 1),
+                    )
+                    self._writes += 1
+                    if self._writes % self.prune_interval == 0:
+                        conn.execute("DELETE FROM throttle_counter WHERE expires < ?", (now,))
+                conn.execute("COMMIT")
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+        except (OSError, sqlite3.Error):
+            logger.exception("Rate limiter could not use %s; allowing %s", self.path, key)
+            return True, None
+
+        if allowed:
+            return True, None
+        return False, _retry_after(current, previous, limit, window, elapsed)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_rate_limiter(backend, redis_url, sqlite_path):
+    if backend == "redis":
+        return RedisRateLimiter(redis_url)
+    if backend == "sqlite":
+        return SQLiteRateLimiter(sqlite_path)
+    if backend == "cache":
+        return None
+    raise ValueError(f"Unsupported THROTTLE_BACKEND: {backend}")
+
+
+def get_rate_limiter():
+    """
+    Return the configured limiter, or None to use DRF's cache-based throttle.
+    """
+    return _build_rate_limiter(
+        getattr(settings, "THROTTLE_BACKEND", "cache"),
+        getattr(settings, "THROTTLE_REDIS_URL", None),
+        getattr(settings, "THROTTLE_SQLITE_PATH", None),
+    )
+
+
+class AtomicRateThrottleMixin:
+    """
+    Swap a SimpleRateThrottle's cache history for the atomic limiter.
+
+    Keeps DRF's rate parsing, scopes and cache keys, so subclasses are
+    drop-in replacements for the stock throttles.
+    """
+
+    def allow_request(self, request, view):
+        allowed = self._allow_request(request, view)
+        if not allowed:
+            THROTTLE_REJECTIONS.labels(scope=self.scope).inc()
+        return allowed
+
+    def _allow_request(self, request, view):
+        limiter = get_rate_limiter()
+        if limiter is None:
+            return super().allow_request(request, view)
+
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        allowed, self._retry_after = limiter.hit(self.key, self.num_requests, self.duration)
+        return allowed
+
+    def wait(self):
+        if get_rate_limiter() is None:
+            return super().wait()
+        return getattr(self, "_retry_after", None)
+
+
+class AtomicAnonRateThrottle(AtomicRateThrottleMixin, AnonRateThrottle):
+    """AnonRateThrottle counted by the atomic limiter."""
+
+
+class AtomicUserRateThrottle(AtomicRateThrottleMixin, UserRateThrottle):
+    """UserRateThrottle counted by the atomic limiter."""
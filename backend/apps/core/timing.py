@@ -0,0 +1,168 @@
+"""
+Per-request phase timing for the Server-Timing header.
+
+ServerTimingMiddleware (apps.core.middleware) starts a RequestTimer for a
+sampled fraction of requests and stores it in a context variable. Code on
+the request path records phases into it with `phase()`; when no timer is
+active (unsampled requests, management commands) recording is a single
+ContextVar lookup.
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+
+_current_timer = contextvars.ContextVar("request_timer", default=None)
+
+
+class RequestTimer:
+    """Accumulated durations (and call counts) per phase for one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = {}
+        self.counts = {}
+        self._active = set()
+        self._marks = {}
+
+    def add(self, name, seconds):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    @contextmanager
+    def phase(self, name):
+        # Nested entries of the same phase (e.g. nested serializers) count once
+        if name in self._active:
+            yield
+            return
+        self._active.add(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._active.discard(name)
+            self.add(name, time.perf_counter() - start)
+
+    def begin(self, name):
+        """Start a phase whose end is seen by a different hook."""
+        self._marks[name] = time.perf_counter()
+
+    def end(self, name):
+        """End a phase started with begin(); ignored if not started or already ended."""
+        start = self._marks.pop(name, None)
+        if start is not None:
+            self.add(name, time.perf_counter() - start)
+
+    def total(self):
+        return time.perf_counter() - self.started
+
+    def as_dict(self):
+        """Durations in milliseconds, plus the total so far."""
+        timings = {name: round(seconds * 1000, 2) for name, seconds in self.durations.items()}
+        timings["total"] = round(self.total() * 1000, 2)
+        return timings
+
+    def header(self):
+        """Format the timings as a Server-Timing header value."""
+        parts = []
+        for name, ms in self.as_dict().items():
+            entry = f"{name};dur={ms}"
+            if name in ("db", "cache"):
+                entry += f';desc="{self.counts[name]} calls"'
+            parts.append(entry)
+        return ", ".join(parts)
+
+
+def current_timer():
+    """Return the active request's timer, or None."""
+    return _current_timer.get()
+
+
+def start_timer():
+    """Start timing the current request; returns a token for stop_timer()."""
+    timer = RequestTimer()
+    return timer, _current_timer.set(timer)
+
+
+def stop_timer(token):
+    _current_timer.reset(token)
+
+
+@contextmanager
+def phase(name):
+    """Time a block as `name` if the current request is being timed."""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    with timer.phase(name):
+        yield
+
+
+def timed(name, func):
+    """Wrap a callable so each call is recorded as `name`."""
+
+    def wrapper(*args, **kwargs):
+        timer = _current_timer.get()
+        if timer is None:
+            return func(*args, **kwargs)
+        with timer.phase(name):
+            return func(*args, **kwargs)
+
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def atimed(name, func):
+    """timed() for coroutine functions."""
+
+    async def wrapper(*args, **kwargs):
+        timer = _current_timer.get()
+        if timer is None:
+            return await func(*args, **kwargs)
+        with timer.phase(name):
+            return await func(*args, **kwargs)
+
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+# Cache methods that talk to the backend
+_CACHE_METHODS = (
+    "add",
+    "get",
+    "set",
+    "touch",
+    "delete",
+    "get_many",
+    "get_or_set",
+    "has_key",
+    "incr",
+    "decr",
+    "set_many",
+    "delete_many",
+    "clear",
+)
+
+
+def instrument_cache(cache):
+    """
+    Record calls on a cache backend instance as the "cache" phase.
+
+    Cache backends are created per thread, so this wraps each instance's
+    methods once; untimed requests pay only the ContextVar lookup.
+    """
+    if getattr(cache, "_server_timing", False):
+        return
+    for method in _CACHE_METHODS:
+        if hasattr(cache, method):
+            setattr(cache, method, timed("cache", getattr(cache, method)))
+    cache._server_timing = True
+
+
+class TimedRepresentationMixin:
+    """Record a serializer's to_representation() as the "serialize" phase."""
+
+    def to_representation(self, instance):
+        with phase("serialize"):
+            return super().to_representation(instance)
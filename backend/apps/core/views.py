@@ -2,19 +2,38 @@
 Core views for serving the React app
 """
 
-from django.conf import settings
-from django.views.generic import TemplateView
+from django.middleware.csrf import get_token
+from django.views import View
 
+from apps.authentication.serializers import UserSerializer
 
-class ReactAppView(TemplateView):
+from .compression import serve
+from .shell import get_shell, script_json
+
+CONTENT_TYPE = "text/html; charset=utf-8"
+
+
+class ReactAppView(View):
     """
     Serve the React app
+
+    The shell is prebuilt and precompressed (see apps.core.shell), so this
+    only negotiates the encoding, splices in a signed-in user and answers
+    If-None-Match.
     """
 
-    template_name = "index.html"
+    def get(self, request, *args, **kwargs):
+        # The inline script reads the token from the cookie; make sure it is set
+        get_token(request)
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context["debug"] = settings.DEBUG
-        context["auth_method"] = settings.AUTH_METHOD
-        return context
+        shell = get_shell()
+        # The body depends on the session cookie (signed in or not)
+        headers = {"Vary": "Accept-Encoding, Cookie", "Cache-Control": "no-cache"}
+        if request.user.is_authenticated and shell.personalizable:
+            user_json = script_json(UserSerializer(request.user).data)
+            content, encoding, etag = shell.personalize(
+                user_json, request.headers.get("Accept-Encoding", "")
+            )
+            headers["Cache-Control"] = "private, no-cache"
+            return serve(request, content, encoding, etag, CONTENT_TYPE, headers)
+        return shell.serve(request, CONTENT_TYPE, headers)
@@ -0,0 +1,214 @@
+"""
+Build the app's lazy per-process state ahead of the first request.
+
+With gunicorn's preload_app the master imports the app once and forks
+workers that share its memory copy-on-write. Anything the master leaves
+lazy, every worker builds for itself on its first requests, in private
+pages, and the first visitors to each new worker wait for it. warm() does
+that work in the master instead, so it is paid once and shared:
+
+- the URL resolver's lookup tables (reverse/resolve)
+- model metadata (_meta field caches) and each app's serializers' fields
+- the templates, the Vite manifest and the prebuilt SPA shell
+- the password validators (CommonPasswordValidator reads a 20,000-word list)
+
+Each step is best effort: a failure is logged and the worker builds that
+piece itself, as it would without preloading.
+
+warm_requests() is the per-worker half: before a new worker takes
+connections, it sends settings.WARMUP_PATHS through the worker's own WSGI
+or ASGI app, which also opens the worker's database connection and fills
+caches that belong to a middleware instance.
+"""
+
+import asyncio
+import inspect
+import io
+import logging
+import sys
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.password_validation import get_default_password_validators
+from django.template.loader import get_template
+from django.urls import get_resolver
+from django.utils.module_loading import autodiscover_modules
+
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+
+def warm_urls():
+    resolver = get_resolver()
+    resolver.reverse_dict
+    for namespace in resolver.namespace_dict:
+        resolver.namespace_dict[namespace][1].reverse_dict
+
+
+def warm_models():
+    for model in apps.get_models():
+        model._meta.get_fields()
+
+
+def _subclasses(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _subclasses(subclass)
+
+
+def warm_serializers():
+    autodiscover_modules("serializers")
+    for serializer_class in set(_subclasses(serializers.Serializer)):
+        if not serializer_class.__module__.startswith("apps."):
+            continue
+        try:
+            serializer_class().fields
+        except Exception:
+            # Serializers that need context or arguments to build their fields
+            logger.debug("Could not warm %s", serializer_class.__qualname__)
+
+
+def warm_templates():
+    from .shell import get_shell
+
+    get_template("index.html")
+    get_shell()
+
+
+def warm_password_validators():
+    get_default_password_validators()
+
+
+STEPS = [
+    ("urls", warm_urls),
+    ("models", warm_models),
+    ("serializers", warm_serializers),
+    ("templates", warm_templates),
+    ("password validators", warm_password_validators),
+]
+
+
+def warm():
+    """Run every warmup step; returns the names of the steps that failed."""
+    failed = []
+    for name, step in STEPS:
+        try:
+            step()
+        except Exception:
+            logger.exception("Warmup step %r failed", name)
+            failed.append(name)
+    return failed
+
+
+def _warmup_host():
+    for host in settings.ALLOWED_HOSTS:
+        if host != "*":
+            return host.lstrip(".")
+    return "localhost"
+
+
+def _wsgi_get(application, path, host):
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "SCRIPT_NAME": "",
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "SERVER_NAME": host,
+        "SERVER_PORT": "443",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "REMOTE_ADDR": "127.0.0.1",
+        "HTTP_HOST": host,
+        "HTTP_ACCEPT": "text/html,application/json",
+        "HTTP_ACCEPT_ENCODING": "br, gzip",
+        "HTTP_X_FORWARDED_PROTO": "https",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "https",
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": False,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    statuses = []
+
+    def start_response(status, headers, exc_info=None):
+        statuses.append(int(status.split()[0]))
+
+    body = application(environ, start_response)
+    try:
+        for _ in body:
+            pass
+    finally:
+        if hasattr(body, "close"):
+            body.close()
+    return statuses[0]
+
+
+async def _asgi_get(application, path, host):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "https",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", host.encode()),
+            (b"accept", b"text/html,application/json"),
+            (b"accept-encoding", b"br, gzip"),
+            (b"x-forwarded-proto", b"https"),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": (host, 443),
+    }
+    requested = False
+    finished = asyncio.Event()
+    status = None
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Django also listens for the client going away; that waits for the response
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body" and not message.get("more_body"):
+            finished.set()
+
+    await application(scope, receive, send)
+    return status
+
+
+def warm_requests(application, paths=None):
+    """
+    GET each path through `application` (WSGI or ASGI).
+
+    Returns (path, status, seconds) per path; status is None when the
+    request raised.
+    """
+    host = _warmup_host()
+    is_asgi = inspect.iscoroutinefunction(getattr(application, "__call__", application))
+    results = []
+    for path in settings.WARMUP_PATHS if paths is None else paths:
+        started = time.perf_counter()
+        try:
+            if is_asgi:
+                status = asyncio.run(_asgi_get(application, path, host))
+            else:
+                status = _wsgi_get(application, path, host)
+        except Exception:
+            logger.exception("Warmup request to %s failed", path)
+            status = None
+        results.append((path, status, time.perf_counter() - started))
+    return results
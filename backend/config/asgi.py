@@ -6,6 +6,10 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from config.sentry import init_sentry
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
 
+# Before the handler loads the middleware, which Sentry instruments
+init_sentry()
 application = get_asgi_application()
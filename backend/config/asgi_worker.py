@@ -0,0 +1,25 @@
+"""
+Gunicorn worker class for the ASGI app
+
+Used by the generated config when SERVER_INTERFACE="asgi" (deployment/
+templates/gunicorn-asgi.conf.template). Needs the uvicorn-worker package.
+"""
+
+from uvicorn_worker import UvicornWorker
+
+
+class DjangoUvicornWorker(UvicornWorker):
+    """
+    UvicornWorker tuned for Django.
+
+    - lifespan is off: Django's ASGI handler doesn't implement it, and
+      uvicorn would otherwise log that at every worker start
+    - gunicorn's worker_connections caps concurrent requests per worker;
+      beyond it uvicorn answers 503 instead of queueing without bound
+    """
+
+    CONFIG_KWARGS = {**UvicornWorker.CONFIG_KWARGS, "lifespan": "off"}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.config.limit_concurrency = self.cfg.worker_connections
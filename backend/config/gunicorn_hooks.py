@@ -0,0 +1,166 @@
+"""
+Gunicorn server hooks for Purdue Web Application
+
+Imported by the generated gunicorn config (deployment/templates/
+gunicorn.conf.template). Keep this module free of Django imports at module
+level: it is loaded by the gunicorn master before the app.
+"""
+
+import gc
+import glob
+import os
+
+_multiprocess_dir_prepared = False
+
+# Directory where each worker leaves a file named after its pid once it is
+# warm; config.rolling_reload waits for these. Unset: no markers.
+READY_DIR_ENV = "GUNICORN_READY_DIR"
+
+# The backend directory, home of the metrics directory when there is no ready directory
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def ready_marker(pid, name=None):
+    """Path of a marker in the ready directory, or None when there is none."""
+    directory = os.environ.get(READY_DIR_ENV)
+    if not directory:
+        return None
+    return os.path.join(directory, name or str(pid))
+
+
+def _touch(path):
+    try:
+        with open(path, "w"):
+            pass
+    except OSError:
+        pass
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def prepare_multiprocess_dir():
+    """
+    Point prometheus_client at this app's directory and clear stale samples.
+
+    Runs when the config file is loaded, before the app is imported (even
+    with preload_app), so every process sees PROMETHEUS_MULTIPROC_DIR. Only
+    the first call wipes the directory, so re-reading the config on HUP does
+    not discard the live workers' samples. Unless set, the directory is
+    "prometheus" in GUNICORN_READY_DIR (the unit's RuntimeDirectory) or
+    "prometheus-multiproc" in the backend directory: never one shared with
+    other apps on the host, whose samples a restart would wipe.
+    """
+    global _multiprocess_dir_prepared
+    ready_dir = os.environ.get(READY_DIR_ENV)
+    path = os.environ.setdefault(
+        "PROMETHEUS_MULTIPROC_DIR",
+        (
+            os.path.join(ready_dir, "prometheus")
+            if ready_dir
+            else os.path.join(BACKEND_DIR, "prometheus-multiproc")
+        ),
+    )
+    if _multiprocess_dir_prepared:
+        return
+    os.makedirs(path, exist_ok=True)
+    for stale in glob.glob(os.path.join(path, "*.db")):
+        os.remove(stale)
+    _multiprocess_dir_prepared = True
+
+
+def when_ready(server):
+    """
+    With preload_app, warm the app in the master before the first fork.
+
+    Workers then inherit the warmed caches as shared pages instead of each
+    building its own copy (see apps.core.warmup).
+    """
+    marker = ready_marker(os.getpid(), "preloaded")
+    if marker:
+        os.makedirs(os.path.dirname(marker), exist_ok=True)
+        # Preloaded workers fork from the master's code: config.rolling_reload
+        # can't bring in new code that way, and needs to know
+        (_touch if server.cfg.preload_app else _remove)(marker)
+    if not server.cfg.preload_app:
+        return
+    from apps.core.warmup import warm
+
+    failed = warm()
+    server.log.info("Preloaded app warmed%s", f" (failed: {', '.join(failed)})" if failed else "")
+
+
+def pre_fork(server, worker):
+    """
+    With preload_app, make the master's memory safe and cheap to share (runs in the master).
+
+    Database and cache connections (and database pools) opened while
+    warming would be shared by every worker's socket, so they are closed.
+    gc.freeze() moves everything allocated so far out of the collector's
+    reach: a collection in the worker would otherwise write to every
+    object's header and copy the pages it shares with the master.
+    """
+    if not server.cfg.preload_app:
+        return
+    from django.core.cache import caches
+    from django.db import connections
+
+    connections.close_all()
+    for connection in connections.all(initialized_only=True):
+        # A native pool keeps its connections open after close()
+        if connection.settings_dict["OPTIONS"].get("pool") and hasattr(connection, "close_pool"):
+            connection.close_pool()
+    caches.close_all()
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    """
+    Warm a new worker with synthetic requests before it takes connections (runs in the worker).
+
+    The worker accepts nothing until this returns, so the first real
+    requests don't pay for its cold caches and database connection. Then it
+    marks itself ready for config.rolling_reload.
+    """
+    from apps.core.warmup import warm_requests
+
+    results = warm_requests(worker.wsgi)
+    worker.log.info(
+        "Worker warmed: %s",
+        ", ".join(f"{path} {status} {seconds * 1000:.0f}ms" for path, status, seconds in results),
+    )
+    marker = ready_marker(os.getpid())
+    if marker:
+        _touch(marker)
+
+
+def worker_exit(server, worker):
+    """Count why the worker is exiting (runs in the worker)."""
+    from apps.core.metrics import WORKER_RECYCLES
+
+    marker = ready_marker(os.getpid())
+    if marker:
+        _remove(marker)
+
+    max_requests = getattr(worker, "max_requests", 0)
+    if max_requests and getattr(worker, "nr", 0) >= max_requests:
+        WORKER_RECYCLES.labels(reason="max_requests").inc()
+    else:
+        WORKER_RECYCLES.labels(reason="shutdown").inc()
+
+
+def child_exit(server, worker):
+    """Release a dead worker's metric files (runs in the master)."""
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+
+    from apps.core.metrics import compact_dead_process
+
+    multiprocess.mark_process_dead(worker.pid)
+    compact_dead_process(worker.pid)
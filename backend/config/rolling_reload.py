@@ -0,0 +1,115 @@
+"""
+Rolling reload for gunicorn: replace the workers one at a time, each only
+once its replacement is warm.
+
+Usage (the systemd unit's ExecReload): python -m config.rolling_reload $MAINPID
+
+gunicorn's own HUP starts every new worker and stops every old one at once,
+so requests queue on the socket until the new workers have imported the
+app. Instead, for each old worker this:
+
+1. sends TTIN: the master forks one more worker, which imports the code now
+   on disk and runs the post_worker_init warmup (config.gunicorn_hooks)
+   before it accepts connections, then leaves its ready marker
+2. waits for that marker
+3. sends TTOU: the master gracefully stops its oldest worker
+
+The listening socket (held by systemd with socket activation) stays open
+and there are never fewer warm workers than before. Both gunicorn and this
+command need GUNICORN_READY_DIR. With preload_app, new workers would fork
+the master's old code, so this refuses: restart the service instead.
+
+Like HUP, it brings in new Python code and templates but not a new
+gunicorn config or new dependencies of the master.
+"""
+
+import argparse
+import os
+import signal
+import sys
+import time
+
+from config.gunicorn_hooks import READY_DIR_ENV, ready_marker
+
+
+class ReloadError(Exception):
+    pass
+
+
+def children(pid):
+    """PIDs of `pid`'s child processes."""
+    found = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat:
+                # The command name may contain spaces; fields resume after its ")"
+                fields = stat.read().rpartition(")")[2].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            found.append(int(entry))
+    return sorted(found)
+
+
+def wait_for(condition, timeout, interval=0.1):
+    """Poll `condition` until it returns something truthy; returns it, or None on timeout."""
+    deadline = time.monotonic() + timeout
+    while True:
+        result = condition()
+        if result or time.monotonic() >= deadline:
+            return result or None
+        time.sleep(interval)
+
+
+def roll(master, timeout=60, log=print):
+    """Replace each of `master`'s workers with a warm new one."""
+    if ready_marker(master) is None:
+        raise ReloadError(f"{READY_DIR_ENV} is not set")
+    if os.path.exists(ready_marker(master, "preloaded")):
+        raise ReloadError("preload_app is on, so new workers would run the old code: restart")
+    old = children(master)
+    if not old:
+        raise ReloadError(f"Process {master} has no workers")
+
+    for number, _ in enumerate(old, 1):
+        before = set(children(master))
+        os.kill(master, signal.SIGTTIN)
+
+        def ready_newcomers():
+            return [
+                pid
+                for pid in children(master)
+                if pid not in before and os.path.exists(ready_marker(pid))
+            ]
+
+        ready = wait_for(ready_newcomers, timeout)
+        if ready is None:
+            raise ReloadError(
+                f"No new worker was ready within {timeout}s; the master has one extra worker "
+                "(see the gunicorn error log)"
+            )
+        # The master stops its oldest worker: one that still runs the old code
+        os.kill(master, signal.SIGTTOU)
+        wait_for(lambda: len(children(master)) <= len(before), timeout)
+        log(f"Worker {ready[0]} ready ({number}/{len(old)})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replace gunicorn's workers one at a time")
+    parser.add_argument("master", type=int, help="PID of the gunicorn master ($MAINPID)")
+    parser.add_argument(
+        "--timeout", type=float, default=60, help="Seconds to wait for each new worker"
+    )
+    args = parser.parse_args(argv)
+    try:
+        roll(args.master, args.timeout)
+    except (ReloadError, OSError) as error:
+        print(f"Rolling reload failed: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""
+Sentry error tracking for the app servers and management commands.
+
+Importing sentry_sdk and its Django integration is slow, and settings are
+imported by every management command and test run. So production settings
+only read SENTRY_DSN and SENTRY_TRACES_SAMPLE_RATE; config.wsgi,
+config.asgi and manage.py call init_sentry(), which imports nothing
+unless a DSN is set.
+"""
+
+from django.conf import settings
+
+
+def init_sentry():
+    """
+    Start Sentry when SENTRY_DSN is set; returns whether it did.
+
+    Only the Django integration and Sentry's defaults (logging, uncaught
+    exceptions) are enabled: auto_enabling_integrations=False gives up the
+    Redis, Celery and other library integrations, and their breadcrumbs and
+    spans, to keep startup fast. Add any that are needed to `integrations`.
+    """
+    dsn = getattr(settings, "SENTRY_DSN", "")
+    if not dsn:
+        return False
+    import sentry_sdk
+    from sentry_sdk.integrations.django import DjangoIntegration
+
+    sentry_sdk.init(
+        dsn=dsn,
+        integrations=[DjangoIntegration()],
+        # Don't probe for (and import) every other library Sentry can integrate with
+        auto_enabling_integrations=False,
+        traces_sample_rate=settings.SENTRY_TRACES_SAMPLE_RATE,
+        send_default_pii=False,
+        environment="production",
+    )
+    return True
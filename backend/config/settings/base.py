@@ -2,6 +2,7 @@
 Base settings for Purdue Web Application Template
 """
 
+import importlib.util
 import os
 from pathlib import Path
 
@@ -85,13 +86,15 @@ LOCAL_APPS = [
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    "apps.core.middleware.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "apps.core.staticfiles.ViteWhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.core.profiling.ProfilingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -120,6 +123,21 @@ ASGI_APPLICATION = "config.asgi.application"
 # Database configuration with multi-database support
 DATABASE_ENGINE = env("DATABASE_ENGINE")
 
+# Connection pool per worker process (postgresql, oracle, mssql): a request
+# borrows a connection and returns it, so idle threads hold none and the
+# connections open follow load between min_size and max_size. Replaces
+# persistent connections (CONN_MAX_AGE must be 0)
+db_pool = None
+if env.bool("DB_POOL", default=False):
+    db_pool = {
+        "min_size": env.int("DB_POOL_MIN_SIZE", default=1),
+        "max_size": env.int("DB_POOL_MAX_SIZE", default=4),
+        # Seconds a request waits for a free connection
+        "timeout": env.float("DB_POOL_TIMEOUT", default=10),
+        # Seconds before an unused connection above min_size closes
+        "max_idle": env.float("DB_POOL_MAX_IDLE", default=300),
+    }
+
 if DATABASE_ENGINE == "postgresql":
     DATABASES = {
         "default": {
@@ -130,8 +148,28 @@ if DATABASE_ENGINE == "postgresql":
             "HOST": env("DB_HOST", default="localhost"),
             "PORT": env("DB_PORT", default="5432"),
             "CONN_MAX_AGE": 600,
+            "OPTIONS": {},
         }
     }
+    # The options below need psycopg 3 (requirements/postgres-pool.txt); with
+    # psycopg2 only DB_PGBOUNCER applies
+    if db_pool:
+        # Django's native pool (psycopg_pool)
+        DATABASES["default"]["OPTIONS"]["pool"] = db_pool
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+    if env.bool("DB_SERVER_SIDE_BINDING", default=False):
+        # Send query parameters separately instead of interpolating them
+        # client-side; psycopg can then prepare statements it runs repeatedly
+        DATABASES["default"]["OPTIONS"]["server_side_binding"] = True
+    if env("DB_PREPARE_THRESHOLD", default=""):
+        # Prepare a statement after this many runs on a connection (server-side
+        # binding only). Off by default: PgBouncer < 1.21 can't route them
+        DATABASES["default"]["OPTIONS"]["prepare_threshold"] = env.int("DB_PREPARE_THRESHOLD")
+    if env.bool("DB_PGBOUNCER", default=False):
+        # PgBouncer in transaction mode may give each transaction a different
+        # server connection, so nothing may outlive a transaction: no
+        # server-side cursors (WITH HOLD cursors would pin the connection)
+        DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
 elif DATABASE_ENGINE == "mysql":
     DATABASES = {
         "default": {
@@ -163,6 +201,12 @@ elif DATABASE_ENGINE == "mssql":
             },
         }
     }
+    if db_pool:
+        # mssql-django has no pool: this backend keeps one of its connections
+        # in SQLAlchemy's QueuePool (apps/core/dbpool)
+        DATABASES["default"]["ENGINE"] = "apps.core.dbpool.mssql"
+        DATABASES["default"]["OPTIONS"]["pool"] = db_pool
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
 elif DATABASE_ENGINE == "oracle":
     DATABASES = {
         "default": {
@@ -177,6 +221,12 @@ elif DATABASE_ENGINE == "oracle":
             },
         }
     }
+    if db_pool:
+        # Django's python-oracledb session pool, sized from db_pool and with
+        # metrics (apps/core/dbpool)
+        DATABASES["default"]["ENGINE"] = "apps.core.dbpool.oracle"
+        DATABASES["default"]["OPTIONS"]["pool"] = db_pool
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
 elif DATABASE_ENGINE == "sqlite":
     # SQLite for lightweight development
     db_name = env("DB_NAME", default="db.sqlite3")
@@ -234,7 +284,24 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "authentication.User"
 
 # REST Framework configuration
+# JSON is rendered and parsed with orjson (apps.core.renderers, same output as
+# DRF's JSONRenderer); application/msgpack is also offered when msgpack is installed
+API_RENDERERS = ["apps.core.renderers.ORJSONRenderer"]
+API_PARSERS = [
+    "apps.core.renderers.ORJSONParser",
+    "rest_framework.parsers.FormParser",
+    "rest_framework.parsers.MultiPartParser",
+]
+if importlib.util.find_spec("msgpack"):
+    API_RENDERERS.append("apps.core.renderers.MessagePackRenderer")
+    API_PARSERS.append("apps.core.renderers.MessagePackParser")
+
 REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        *API_RENDERERS,
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": API_PARSERS,
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.SessionAuthentication",
     ],
@@ -243,7 +310,8 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
-    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # drf-spectacular's AutoSchema, imported only when a schema is generated
+    "DEFAULT_SCHEMA_CLASS": "apps.core.lazy.LazyAutoSchema",
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
         "rest_framework.filters.SearchFilter",
@@ -255,6 +323,34 @@ REST_FRAMEWORK = {
     },
 }
 
+# Delta sync of lists (?since=<cursor>, apps.core.sync)
+# - SYNC_CURSOR_OVERLAP: seconds each cursor reaches back, so rows written by
+#   transactions still open when the cursor was issued aren't missed
+# - SYNC_TOMBSTONE_DAYS: how long deletions are remembered; older cursors get
+#   410 Gone and clients reload the full list
+SYNC_CURSOR_OVERLAP = env.float("SYNC_CURSOR_OVERLAP", default=10.0)
+SYNC_TOMBSTONE_DAYS = env.int("SYNC_TOMBSTONE_DAYS", default=30)
+
+# Server push (Server-Sent Events under ASGI, apps.core.events)
+# - local: events reach streams served by the same process only
+# - redis: Redis pub/sub at EVENTS_REDIS_URL, shared by every worker
+EVENTS_BACKEND = env("EVENTS_BACKEND", default="local")
+EVENTS_REDIS_URL = env("REDIS_URL", default=None)
+# Seconds between keep-alive comments on an idle stream
+EVENTS_HEARTBEAT = env.float("EVENTS_HEARTBEAT", default=15.0)
+# Undelivered messages per stream before a slow client is dropped
+EVENTS_QUEUE_SIZE = env.int("EVENTS_QUEUE_SIZE", default=100)
+
+# Throttle counting backend (see apps.core.throttling)
+# - cache: DRF's default cache-based history (fine for a single process)
+# - redis: atomic counters in Redis, shared by every worker
+# - sqlite: atomic counters in a local file, shared by the workers on one host
+THROTTLE_BACKEND = env("THROTTLE_BACKEND", default="cache")
+THROTTLE_REDIS_URL = env("REDIS_URL", default=None)
+THROTTLE_SQLITE_PATH = env(
+    "THROTTLE_SQLITE_PATH", default=str(BASE_DIR.parent / "data" / "throttle.sqlite3")
+)
+
 # CORS settings - can be explicitly set or derived from SITE_DOMAIN
 if env("CORS_ALLOWED_ORIGINS", default=None):
     CORS_ALLOWED_ORIGINS = env.list("CORS_ALLOWED_ORIGINS")
@@ -307,6 +403,43 @@ SPECTACULAR_SETTINGS = {
     "SERVE_INCLUDE_SCHEMA": False,
 }
 
+# OpenAPI schema cache (apps.api.schema), regenerated when the code version changes
+# APP_VERSION identifies the deployed code (e.g. git commit); unset = hash of the source
+APP_VERSION = env("APP_VERSION", default="")
+SCHEMA_CACHE_DIR = env("SCHEMA_CACHE_DIR", default=str(BASE_DIR / "schema-cache"))
+
+# Server-Timing header with per-phase durations (session, auth, view, db,
+# cache, serialize, render) for a sampled fraction of requests (0.0 - 1.0)
+SERVER_TIMING_SAMPLE_RATE = env.float("SERVER_TIMING_SAMPLE_RATE", default=0.0)
+# Also log one JSON line per timed request to the "apps.core.access" logger
+SERVER_TIMING_ACCESS_LOG = env.bool("SERVER_TIMING_ACCESS_LOG", default=False)
+
+# Sampling profiler (apps.core.profiling)
+# Single requests: send X-Profile-Token (manage.py profile_token) or, as staff, add ?_profile=1
+PROFILING_TOKEN_MAX_AGE = env.int("PROFILING_TOKEN_MAX_AGE", default=600)
+# Whole workers: sample continuously and write stack files for manage.py merge_profiles
+PROFILING_WORKER_SAMPLER = env.bool("PROFILING_WORKER_SAMPLER", default=False)
+PROFILING_DIR = env("PROFILING_DIR", default=str(BASE_DIR.parent / "data" / "profiles"))
+PROFILING_WORKER_INTERVAL = env.float("PROFILING_WORKER_INTERVAL", default=0.01)
+# Fraction of wall time the sampler may spend sampling (slows down to stay under)
+PROFILING_OVERHEAD_BUDGET = env.float("PROFILING_OVERHEAD_BUDGET", default=0.01)
+PROFILING_FLUSH_INTERVAL = env.int("PROFILING_FLUSH_INTERVAL", default=60)
+PROFILING_MAX_FILES = env.int("PROFILING_MAX_FILES", default=500)
+
+# Prometheus metrics endpoint (enabled in production with METRICS_BEARER_TOKEN or METRICS_ENABLED)
+PROMETHEUS_METRICS_ENABLED = False
+
+# Health checks
+# Dependencies are probed in a background thread every HEALTH_PROBE_INTERVAL
+# seconds and /api/health/ready/ serves the last result (0 = probe per request)
+HEALTH_PROBE_INTERVAL = env.int("HEALTH_PROBE_INTERVAL", default=10)
+# Checks that must pass for readiness (others are reported but informational)
+HEALTH_CRITICAL_CHECKS = env.list("HEALTH_CRITICAL_CHECKS", default=["database", "migrations"])
+
+# Worker warmup (config.gunicorn_hooks.post_worker_init): paths each new
+# gunicorn worker requests through the app before it takes connections
+WARMUP_PATHS = env.list("WARMUP_PATHS", default=["/", "/api/health/", "/api/auth/config/"])
+
 # Email configuration
 # Supports multiple email backends:
 # - smtp: Standard SMTP (default, works with Purdue's smtp.purdue.edu)
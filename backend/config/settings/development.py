@@ -21,7 +21,7 @@ INSTALLED_APPS += dev_apps
 
 # Add debug toolbar middleware (only if installed)
 if "debug_toolbar" in dev_apps:
-    MIDDLEWARE.insert(2, "debug_toolbar.middleware.DebugToolbarMiddleware")
+    MIDDLEWARE.insert(3, "debug_toolbar.middleware.DebugToolbarMiddleware")
 
 # Debug toolbar settings
 INTERNAL_IPS = [
@@ -29,6 +29,15 @@ INTERNAL_IPS = [
     "localhost",
 ]
 
+# Time every request so devtools show the Server-Timing breakdown
+SERVER_TIMING_SAMPLE_RATE = env.float("SERVER_TIMING_SAMPLE_RATE", default=1.0)
+
+# Flag N+1 and duplicate queries per request: "log", "raise" or "off"
+MIDDLEWARE.append("apps.core.queries.QueryInspectorMiddleware")
+QUERY_INSPECTOR_MODE = env("QUERY_INSPECTOR_MODE", default="log")
+# How many runs of one query shape in a request count as N+1
+QUERY_INSPECTOR_REPEAT_THRESHOLD = env.int("QUERY_INSPECTOR_REPEAT_THRESHOLD", default=5)
+
 # Allow all origins in development (be careful!)
 CORS_ALLOW_ALL_ORIGINS = True
 
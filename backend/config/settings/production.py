@@ -2,6 +2,8 @@
 Production settings
 """
 
+import importlib.util
+
 from .base import *
 
 DEBUG = False
@@ -28,7 +30,11 @@ if env("ALLOWED_HOSTS", default=None):
 # Otherwise, ALLOWED_HOSTS is already set by base.py from SITE_DOMAIN
 
 # Static files with compression
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+# Vite's hashed assets keep their names and build-time .br/.gz (apps.core.staticfiles)
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "apps.core.staticfiles.ViteManifestStaticFilesStorage"},
+}
 WHITENOISE_COMPRESS_OFFLINE = True
 WHITENOISE_COMPRESSION_QUALITY = 90
 
@@ -38,7 +44,12 @@ STATICFILES_DIRS = STATICFILES_DIRS + [
 ]
 
 # Database connection pooling
-DATABASES["default"]["CONN_MAX_AGE"] = 600
+# The ASGI deployment sets CONN_MAX_AGE=0: the sync ORM calls of async views
+# run in per-request threads, each of which would keep its own connection.
+# A native pool (DB_POOL) replaces persistent connections altogether.
+if not DATABASES["default"].get("OPTIONS", {}).get("pool"):
+    DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=600)
+# With a pool: check each connection as it is borrowed
 DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
 
 # Cache configuration - use Redis if available, otherwise use local memory
@@ -67,6 +78,44 @@ else:
         }
     }
 
+# Throttle counters must be shared by all gunicorn workers, which LocMemCache
+# is not: use Redis when available, otherwise a counter file on this host
+THROTTLE_BACKEND = env(
+    "THROTTLE_BACKEND", default="redis" if env("REDIS_URL", default=None) else "sqlite"
+)
+
+# Pushed events must reach streams held open by any worker
+EVENTS_BACKEND = env(
+    "EVENTS_BACKEND", default="redis" if env("REDIS_URL", default=None) else "local"
+)
+
+# Prometheus metrics (only if django-prometheus is installed)
+# Exposes /metrics with per-view latency histograms, DB queries per request,
+# cache hit/miss counts and throttle rejections. Under gunicorn the workers
+# share samples through PROMETHEUS_MULTIPROC_DIR (see config/gunicorn_hooks.py).
+# Shared secret scrapers must send as "Authorization: Bearer <token>"
+METRICS_BEARER_TOKEN = env("METRICS_BEARER_TOKEN", default="")
+# Off unless a token is set, or METRICS_ENABLED=True for an endpoint the
+# proxy keeps private (it would otherwise be public)
+PROMETHEUS_METRICS_ENABLED = env.bool("METRICS_ENABLED", default=bool(METRICS_BEARER_TOKEN)) and (
+    importlib.util.find_spec("django_prometheus") is not None
+)
+if PROMETHEUS_METRICS_ENABLED:
+    INSTALLED_APPS += ["django_prometheus"]
+    MIDDLEWARE = [
+        "django_prometheus.middleware.PrometheusBeforeMiddleware",
+        *MIDDLEWARE,
+        "apps.core.middleware.QueryMetricsMiddleware",
+        "django_prometheus.middleware.PrometheusAfterMiddleware",
+    ]
+    # Same backends, instrumented with hit/miss counters
+    CACHES["default"]["BACKEND"] = {
+        "django_redis.cache.RedisCache": "django_prometheus.cache.backends.redis.RedisCache",
+        "django.core.cache.backends.locmem.LocMemCache": (
+            "django_prometheus.cache.backends.locmem.LocMemCache"
+        ),
+    }.get(CACHES["default"]["BACKEND"], CACHES["default"]["BACKEND"])
+
 # Session configuration
 # Use database sessions since we don't have Redis for shared cache
 SESSION_ENGINE = "django.contrib.sessions.backends.db"
@@ -79,24 +128,14 @@ SESSION_COOKIE_SAMESITE = "Lax"
 # Override here only if production needs different settings:
 # SERVER_EMAIL = env("SERVER_EMAIL", default="server-errors@purdue.edu")
 
-# Sentry error tracking
-if env("SENTRY_DSN", default=None):
-    import sentry_sdk
-    from sentry_sdk.integrations.django import DjangoIntegration
-
-    sentry_sdk.init(
-        dsn=env("SENTRY_DSN"),
-        integrations=[DjangoIntegration()],
-        traces_sample_rate=env.float("SENTRY_TRACES_SAMPLE_RATE", default=0.1),
-        send_default_pii=False,
-        environment="production",
-    )
+# Sentry error tracking, started by the app servers and manage.py (config/sentry.py)
+SENTRY_DSN = env("SENTRY_DSN", default="")
+SENTRY_TRACES_SAMPLE_RATE = env.float("SENTRY_TRACES_SAMPLE_RATE", default=0.1)
 
 # SAML Configuration for Production
+# The bindings are saml2.BINDING_HTTP_POST/REDIRECT, spelled out so that
+# settings don't import pysaml2 (djangosaml2 does, when it is used)
 if AUTH_METHOD == "saml":
-    import saml2
-    from saml2 import saml
-
     SAML_CONFIG = {
         "xmlsec_binary": "/usr/bin/xmlsec1",
         "entityid": env("SAML_ENTITY_ID", default="https://yourapp.purdue.edu/saml/metadata/"),
@@ -108,13 +147,13 @@ if AUTH_METHOD == "saml":
                     "assertion_consumer_service": [
                         (
                             env("SAML_ACS_URL", default="https://yourapp.purdue.edu/saml/acs/"),
-                            saml2.BINDING_HTTP_POST,
+                            "urn:oasis:names:tc:SAML:2.0:bindings:HTTP-POST",
                         ),
                     ],
                     "single_logout_service": [
                         (
                             env("SAML_SLS_URL", default="https://yourapp.purdue.edu/saml/sls/"),
-                            saml2.BINDING_HTTP_REDIRECT,
+                            "urn:oasis:names:tc:SAML:2.0:bindings:HTTP-Redirect",
                         ),
                     ],
                 },
@@ -178,5 +217,10 @@ LOGGING = {
             "level": "DEBUG",
             "propagate": False,
         },
+        "apps.core.access": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
@@ -7,7 +7,7 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
-from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+from apps.core.lazy import lazy_view
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -15,12 +15,26 @@ urlpatterns = [
     path("api/", include("apps.api.urls")),
     path("api/auth/", include("apps.authentication.urls")),
     path("api/contact/", include("apps.contact.urls")),
-    # API documentation
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
-    path("api/swagger/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
-    path("api/redoc/", SpectacularRedocView.as_view(url_name="schema"), name="redoc"),
+    # API documentation (drf-spectacular is imported on the first request)
+    path("api/schema/", lazy_view("apps.api.schema.CachedSpectacularAPIView"), name="schema"),
+    path(
+        "api/swagger/",
+        lazy_view("drf_spectacular.views.SpectacularSwaggerView", url_name="schema"),
+        name="swagger-ui",
+    ),
+    path(
+        "api/redoc/",
+        lazy_view("drf_spectacular.views.SpectacularRedocView", url_name="schema"),
+        name="redoc",
+    ),
 ]
 
+# Prometheus metrics
+if settings.PROMETHEUS_METRICS_ENABLED:
+    from apps.core.metrics import metrics_view
+
+    urlpatterns += [path("metrics", metrics_view, name="prometheus-metrics")]
+
 # Development-specific URLs
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
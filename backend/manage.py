@@ -15,6 +15,15 @@ def main():
             "available on your PYTHONPATH environment variable? Did you "
             "forget to activate a virtual environment?"
         ) from exc
+    from django.core.exceptions import ImproperlyConfigured
+
+    from config.sentry import init_sentry
+
+    try:
+        # Report errors in bootstrap, cron jobs and other commands too
+        init_sentry()
+    except ImproperlyConfigured:
+        pass  # execute_from_command_line() reports broken settings itself
     execute_from_command_line(sys.argv)
 
 
@@ -40,7 +40,24 @@ raw_env = [
     "DJANGO_SETTINGS_MODULE=config.settings.production",
 ]
 
+# Server hooks: Prometheus multiprocess metrics, worker recycle counting,
+# (with preload_app) warming the app and freezing the GC before each fork, and
+# warming each new worker with requests before it takes connections
+import sys
+
+sys.path.insert(0, "/opt/apps/template/backend")
+from config import gunicorn_hooks  # noqa: E402
+
+gunicorn_hooks.prepare_multiprocess_dir()
+worker_exit = gunicorn_hooks.worker_exit
+child_exit = gunicorn_hooks.child_exit
+when_ready = gunicorn_hooks.when_ready
+pre_fork = gunicorn_hooks.pre_fork
+post_worker_init = gunicorn_hooks.post_worker_init
+
 # Preload application
+# Off here: auto-reload restarts workers from the master's already-imported
+# code, so edits would not be picked up
 preload_app = False
 
 # AUTO-RELOAD ENABLED FOR DEVELOPMENT
@@ -191,8 +191,19 @@ EOF
 echo -e "${GREEN}✓ Django .env generated: $ENV_OUTPUT${NC}"
 
 # Generate gunicorn configuration
-echo -e "${YELLOW}Generating gunicorn configuration...${NC}"
-if [[ -f "gunicorn.conf.template" ]]; then
+# SERVER_INTERFACE="asgi" serves config.asgi with uvicorn workers (async views),
+# "wsgi" (default) serves config.wsgi with GUNICORN_WORKER_CLASS
+SERVER_INTERFACE="${SERVER_INTERFACE:-wsgi}"
+if [[ "${SERVER_INTERFACE}" == "asgi" ]]; then
+    GUNICORN_TEMPLATE="gunicorn-asgi.conf.template"
+    export GUNICORN_APP="config.asgi:application"
+else
+    GUNICORN_TEMPLATE="gunicorn.conf.template"
+    export GUNICORN_APP="config.wsgi:application"
+fi
+
+echo -e "${YELLOW}Generating gunicorn configuration (${SERVER_INTERFACE})...${NC}"
+if [[ -f "${GUNICORN_TEMPLATE}" ]]; then
     GUNICORN_OUTPUT="$OUTPUT_DIR/gunicorn_config.py"
 
     # Set defaults for optional variables
@@ -213,10 +224,24 @@ if [[ -f "gunicorn.conf.template" ]]; then
     export GUNICORN_LIMIT_REQUEST_FIELDS="${GUNICORN_LIMIT_REQUEST_FIELDS:-100}"
     export GUNICORN_LIMIT_REQUEST_FIELD_SIZE="${GUNICORN_LIMIT_REQUEST_FIELD_SIZE:-8190}"
 
-    replace_vars "gunicorn.conf.template" "$GUNICORN_OUTPUT"
+    replace_vars "${GUNICORN_TEMPLATE}" "$GUNICORN_OUTPUT"
     echo -e "${GREEN}✓ Gunicorn config generated: $GUNICORN_OUTPUT${NC}"
+
+    # GUNICORN_SIZING="measure": replace the configured worker class, workers,
+    # threads and max_requests with ones measured on this host (with ASGI the
+    # uvicorn worker class stays; only workers and max_requests are sized)
+    # (manage.py size_workers; needs the app installed in ${APP_DIR}/venv)
+    if [[ "${GUNICORN_SIZING:-static}" == "measure" ]]; then
+        GUNICORN_OUTPUT_PATH="$(cd "$(dirname "$GUNICORN_OUTPUT")" && pwd)/$(basename "$GUNICORN_OUTPUT")"
+        if (cd "${APP_DIR}/backend" && "${APP_DIR}/venv/bin/python" manage.py size_workers \
+                --write "$GUNICORN_OUTPUT_PATH"); then
+            echo -e "${GREEN}✓ Gunicorn workers sized for this host${NC}"
+        else
+            echo -e "${YELLOW}Warning: size_workers failed, keeping the configured GUNICORN_* values${NC}"
+        fi
+    fi
 else
-    echo -e "${RED}Warning: gunicorn.conf.template not found${NC}"
+    echo -e "${RED}Warning: ${GUNICORN_TEMPLATE} not found${NC}"
 fi
 
 # Generate systemd files
@@ -235,6 +260,7 @@ if [[ -n "${URL_PREFIX}" ]]; then
     if [[ -f "systemd-service-socket.template" ]]; then
         SERVICE_OUTPUT="$OUTPUT_DIR/${APP_NAME}.service"
         replace_vars "systemd-service-socket.template" "$SERVICE_OUTPUT"
+        sed -i "s|\${GUNICORN_APP}|${GUNICORN_APP}|g" "$SERVICE_OUTPUT"
         echo -e "${GREEN}✓ Systemd service (socket activation) generated: $SERVICE_OUTPUT${NC}"
     fi
 else
@@ -253,13 +279,17 @@ Group=${APP_GROUP}
 WorkingDirectory=${APP_DIR}/backend
 Environment="PATH=${APP_DIR}/venv/bin"
 Environment="PYTHONPATH=${APP_DIR}/backend"
+RuntimeDirectory=${APP_NAME}
+Environment="GUNICORN_READY_DIR=/run/${APP_NAME}"
+Environment="PROMETHEUS_MULTIPROC_DIR=/run/${APP_NAME}/prometheus"
 ExecStart=${APP_DIR}/venv/bin/gunicorn \\
     --config ${APP_DIR}/gunicorn_config.py \\
     --error-logfile ${LOG_DIR}/error.log \\
     --access-logfile ${LOG_DIR}/access.log \\
-    config.wsgi:application
+    ${GUNICORN_APP}
 
-ExecReload=/bin/kill -s HUP \$MAINPID
+# Rolling reload: one worker at a time, each replaced once the new one is warm
+ExecReload=${APP_DIR}/venv/bin/python -m config.rolling_reload \$MAINPID
 ExecStop=/bin/kill -s TERM \$MAINPID
 Restart=on-failure
 RestartSec=10
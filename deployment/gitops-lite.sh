@@ -28,6 +28,13 @@ STATE_FILE="/tmp/gitops-lite-state-$APP_NAME"
 EMAIL_STATE_FILE="/tmp/gitops-lite-email-state-$APP_NAME"
 LOG_FILE="/tmp/gitops-lite-$APP_NAME.log"
 BUILD_FRONTEND="${GITOPS_BUILD_FRONTEND:-true}"
+# How the running app picks up a deploy:
+#   hot     - gunicorn --reload notices the changed files (dev services)
+#   rolling - systemctl reload: workers are replaced one at a time, each once
+#             its replacement has warmed up (ExecReload in the generated unit);
+#             falls back to a restart if the reload fails or is refused (preload)
+# "rolling" needs a sudoers rule for systemctl reload/restart of the service.
+RELOAD_MODE="${GITOPS_RELOAD:-hot}"
 
 # Email configuration (optional)
 EMAIL_ADMIN="${GITOPS_EMAIL_TO:-}"  # Admin email (always notified)
@@ -293,6 +300,8 @@ rsync -aq --delete \
     --exclude='.env*' \
     --exclude='media/' \
     --exclude='logs/' \
+    --exclude='schema-cache/' \
+    --exclude='prometheus-multiproc/' \
     --exclude='*.sqlite3' \
     --exclude='db.sqlite3' \
     backend/ "$DEPLOY_DIR/backend/"
@@ -432,14 +441,22 @@ else
 fi
 
 # Collect static files (always run to ensure frontend build is collected)
+# No --clear: the static storage recompresses only changed files and prunes
+# its own stale outputs (apps/core/staticfiles.py)
 log "Collecting static files..."
 set +e
-"$DEPLOY_DIR/venv/bin/python" manage.py collectstatic --noinput --clear > /tmp/collectstatic-$APP_NAME.log 2>&1
+"$DEPLOY_DIR/venv/bin/python" manage.py collectstatic --noinput > /tmp/collectstatic-$APP_NAME.log 2>&1
 COLLECT_EXIT=$?
 set -e
 if [ $COLLECT_EXIT -eq 0 ]; then
     STATIC_ROOT=$("$DEPLOY_DIR/venv/bin/python" manage.py shell -c "from django.conf import settings; print(settings.STATIC_ROOT)" 2>/dev/null || echo "$DEPLOY_DIR/static")
     log "✓ Static files collected to $STATIC_ROOT"
+    # Pre-generate the OpenAPI schema so no request pays for it
+    if "$DEPLOY_DIR/venv/bin/python" manage.py generate_schema > /tmp/schema-$APP_NAME.log 2>&1; then
+        log "✓ OpenAPI schema generated"
+    else
+        log "⚠️ OpenAPI schema generation failed (see /tmp/schema-$APP_NAME.log)"
+    fi
 else
     log "⚠️ Collectstatic failed (see /tmp/collectstatic-$APP_NAME.log)"
     cat /tmp/collectstatic-$APP_NAME.log | tail -10
@@ -454,6 +471,19 @@ if [ $SYNTAX_CHECK -ne 0 ]; then
     log "⚠️ Python syntax warnings detected (see /tmp/py_compile_error-$APP_NAME.log)"
 fi
 
+# Bring the new code into the running app
+if [[ "$RELOAD_MODE" == "rolling" ]]; then
+    log "Reloading $APP_NAME workers one at a time..."
+    if sudo -n systemctl reload "$APP_NAME" > /tmp/reload-$APP_NAME.log 2>&1; then
+        log "✓ Workers replaced"
+    else
+        log "⚠️ Rolling reload failed (see /tmp/reload-$APP_NAME.log), restarting instead"
+        if ! sudo -n systemctl restart "$APP_NAME" >> /tmp/reload-$APP_NAME.log 2>&1; then
+            log "❌ Restart failed (see /tmp/reload-$APP_NAME.log)"
+        fi
+    fi
+fi
+
 # Mark as deployed
 echo "$CURRENT" > "$STATE_FILE"
 
@@ -462,7 +492,11 @@ if [[ "$FIRST_TIME_SETUP" == "true" ]]; then
     log "🎉 [$BRANCH → $APP_NAME] Initial deployment completed successfully!"
     send_email "Initial Deployment Complete: $APP_NAME" "success"
 else
-    log "✓ [$BRANCH → $APP_NAME] Deployed successfully (hot-reload will handle restart)"
+    if [[ "$RELOAD_MODE" == "rolling" ]]; then
+        log "✓ [$BRANCH → $APP_NAME] Deployed successfully"
+    else
+        log "✓ [$BRANCH → $APP_NAME] Deployed successfully (hot-reload will handle restart)"
+    fi
     send_email "Deployment Update Complete: $APP_NAME" "success"
 fi
 
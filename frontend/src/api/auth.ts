@@ -65,21 +65,27 @@ const authApi = {
     apiClient.post<{ message: string }>(API_ENDPOINTS.AUTH.RESEND_VERIFICATION, { email }),
 }
 
+// Startup data is embedded in index.html by Django, so the first render needs no API calls.
+// undefined (e.g. on the Vite dev server) means "not embedded": the hooks fetch as usual.
+
 // React Query hooks
 export const useAuthConfig = () => {
   return useQuery({
     queryKey: QUERY_KEYS.AUTH_CONFIG,
     queryFn: authApi.getConfig,
+    initialData: () => window.__DJANGO_CONTEXT__?.authConfig,
     staleTime: Infinity,
   })
 }
 
 export const useCurrentUser = () => {
-  return useQuery({
+  return useQuery<User | null>({
     queryKey: QUERY_KEYS.CURRENT_USER,
     queryFn: authApi.getCurrentUser,
+    // null means the page was served to a signed-out visitor
+    initialData: () => window.__DJANGO_CONTEXT__?.currentUser,
     retry: false,
-    // Always attempt to fetch user - backend will return 403 if no valid session
+    // Without bootstrap data, fetch the user - backend will return 403 if no valid session
   })
 }
 
@@ -18,6 +18,7 @@ export const API_ENDPOINTS = {
     PASSWORD_RESET_REQUEST: '/auth/password-reset/',
     PASSWORD_RESET_CONFIRM: '/auth/password-reset/confirm/',
     USERS: '/auth/users/',
+    USER_EVENTS: '/auth/users/events/',
     USER_DETAIL: (id: number) => `/auth/users/${id}/`,
   },
   CONTACT: '/contact/',
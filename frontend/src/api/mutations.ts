@@ -3,10 +3,10 @@
  *
  * Reduces boilerplate for mutations that follow the pattern:
  * 1. Call API function
- * 2. Invalidate query cache on success
+ * 2. Invalidate (or refresh) query cache on success
  */
 
-import { useMutation, useQueryClient } from '@tanstack/react-query'
+import { useMutation, useQueryClient, type QueryClient } from '@tanstack/react-query'
 
 /**
  * Creates a mutation hook that invalidates specified query keys on success.
@@ -28,11 +28,15 @@ import { useMutation, useQueryClient } from '@tanstack/react-query'
  *   usersApi.createUser,
  *   { invalidates: QUERY_KEYS.USERS }
  * )
+ *
+ * // Or update the cache in place rather than refetching (see syncUsers):
+ * export const useCreateUser = createMutation(usersApi.createUser, { refresh: syncUsers })
  */
 export function createMutation<TData, TVariables>(
   mutationFn: (variables: TVariables) => Promise<TData>,
   options?: {
     invalidates?: readonly unknown[]
+    refresh?: (queryClient: QueryClient) => Promise<unknown>
   }
 ) {
   return () => {
@@ -44,6 +48,9 @@ export function createMutation<TData, TVariables>(
         if (options?.invalidates) {
           queryClient.invalidateQueries({ queryKey: options.invalidates })
         }
+        if (options?.refresh) {
+          return options.refresh(queryClient)
+        }
       },
     })
   }
@@ -0,0 +1,125 @@
+/**
+ * Test file for merging user list deltas and pushed events into the cached list
+ */
+
+import { describe, test, expect } from 'vitest';
+import { applyUserEvent, mergeUserChanges, type UserListItem, type UsersSnapshot } from './users';
+
+const user = (id: number, username: string, extra: Partial<UserListItem> = {}): UserListItem => ({
+  id,
+  username,
+  email: `${username}@purdue.edu`,
+  first_name: '',
+  last_name: '',
+  is_active: true,
+  is_staff: false,
+  is_superuser: false,
+  is_email_verified: true,
+  date_joined: '2025-01-01T00:00:00Z',
+  last_login: null,
+  ...extra,
+});
+
+const snapshot: UsersSnapshot = {
+  count: 3,
+  next: null,
+  previous: null,
+  results: [user(1, 'alice'), user(2, 'bob'), user(3, 'dave')],
+  sync_cursor: '100',
+};
+
+describe('mergeUserChanges', () => {
+  test('replaces changed users, adds new ones and drops deleted ones in the server order', () => {
+    const merged = mergeUserChanges(snapshot, {
+      count: 3,
+      results: [user(1, 'alice', { first_name: 'Alice' }), user(4, 'carol')],
+      deleted: [2],
+      page_ids: [1, 4, 3],
+      sync_cursor: '200',
+    });
+
+    expect(merged?.results.map(u => u.username)).toEqual(['alice', 'carol', 'dave']);
+    expect(merged?.results[0].first_name).toBe('Alice');
+    expect(merged?.count).toBe(3);
+    expect(merged?.sync_cursor).toBe('200');
+  });
+
+  test('is a no-op for an empty delta apart from the cursor', () => {
+    const merged = mergeUserChanges(snapshot, {
+      count: 3,
+      results: [],
+      deleted: [],
+      page_ids: [1, 2, 3],
+      sync_cursor: '300',
+    });
+
+    expect(merged?.results).toEqual(snapshot.results);
+    expect(merged?.sync_cursor).toBe('300');
+  });
+
+  test('keeps the server order rather than comparing usernames', () => {
+    // A case-insensitive collation puts 'Bob' after 'alice'; code units wouldn't
+    const merged = mergeUserChanges(snapshot, {
+      count: 4,
+      results: [user(5, 'Bob')],
+      deleted: [],
+      page_ids: [1, 2, 5, 3],
+      sync_cursor: '200',
+    });
+
+    expect(merged?.results.map(u => u.username)).toEqual(['alice', 'bob', 'Bob', 'dave']);
+  });
+});
+
+// The first of two pages: 'erin' and later are on page 2
+const firstPage: UsersSnapshot = {
+  ...snapshot,
+  count: 5,
+  next: 'http://testserver/api/auth/users/?page=2',
+};
+
+describe('mergeUserChanges on the first of several pages', () => {
+  test('leaves out changed users the server puts on later pages', () => {
+    const merged = mergeUserChanges(firstPage, {
+      count: 6,
+      results: [user(5, 'zed', { first_name: 'Zed' }), user(6, 'carol')],
+      deleted: [],
+      page_ids: [1, 2, 6],
+      sync_cursor: '200',
+    });
+
+    expect(merged?.results.map(u => u.username)).toEqual(['alice', 'bob', 'carol']);
+    expect(merged?.count).toBe(6);
+    expect(merged?.sync_cursor).toBe('200');
+  });
+
+  test('asks for a refetch when a user moves up from a later page', () => {
+    const deleted = { count: 4, results: [], deleted: [1], page_ids: [2, 3, 7], sync_cursor: '200' };
+
+    expect(mergeUserChanges(firstPage, deleted)).toBeNull();
+  });
+});
+
+describe('applyUserEvent', () => {
+  test('replaces updated users and removes deleted ones', () => {
+    const updated = applyUserEvent(snapshot, {
+      type: 'updated',
+      user: user(2, 'bob', { is_active: false }),
+    })!;
+    const deleted = applyUserEvent(updated, { type: 'deleted', id: 1 })!;
+    const again = applyUserEvent(deleted, { type: 'deleted', id: 1 })!;
+
+    expect(again.results.map(u => [u.username, u.is_active])).toEqual([
+      ['bob', false],
+      ['dave', true],
+    ]);
+    expect(again.count).toBe(2);
+    expect(again.sync_cursor).toBe('100');
+  });
+
+  test('leaves changes that need the server order to a sync', () => {
+    expect(applyUserEvent(snapshot, { type: 'created', user: user(4, 'carol') })).toBeNull();
+    expect(applyUserEvent(snapshot, { type: 'updated', user: user(2, 'zoe') })).toBeNull();
+    expect(applyUserEvent(firstPage, { type: 'deleted', id: 1 })).toBeNull();
+  });
+});
@@ -1,4 +1,5 @@
-import { useQuery } from '@tanstack/react-query'
+import { useEffect } from 'react'
+import { useQuery, useQueryClient, type QueryClient } from '@tanstack/react-query'
 import apiClient from './client'
 import { API_ENDPOINTS, QUERY_KEYS } from './endpoints'
 import { createMutation } from './mutations'
@@ -16,6 +17,26 @@ export interface PaginatedResponse<T> {
   results: T[]
 }
 
+// The cached user list: the first page, plus the cursor to sync changes from
+export interface UsersSnapshot extends PaginatedResponse<UserListItem> {
+  sync_cursor?: string
+}
+
+// Changes since a cursor (GET /auth/users/?since=<cursor>)
+export interface UsersDelta {
+  count: number
+  results: UserListItem[]
+  deleted: number[]
+  // Ids on the first page, in the server's order
+  page_ids: number[]
+  sync_cursor: string
+}
+
+// Pushed over Server-Sent Events (GET /auth/users/events/) as users change
+export type UserEvent =
+  | { type: 'created' | 'updated'; user: UserListItem }
+  | { type: 'deleted'; id: number }
+
 export interface CreateUserData {
   username: string
   email: string
@@ -28,11 +49,11 @@ export interface CreateUserData {
 
 // API functions
 const usersApi = {
-  getUsers: async () => {
-    const response = await apiClient.get<PaginatedResponse<UserListItem>>(API_ENDPOINTS.AUTH.USERS)
-    // Return just the results array for simpler component usage
-    return response.results || []
-  },
+  getUsers: () =>
+    apiClient.get<UsersSnapshot>(API_ENDPOINTS.AUTH.USERS),
+
+  getUserChanges: (since: string) =>
+    apiClient.get<UsersDelta>(`${API_ENDPOINTS.AUTH.USERS}?since=${encodeURIComponent(since)}`),
 
   createUser: (data: CreateUserData) =>
     apiClient.post<UserListItem>(API_ENDPOINTS.AUTH.USERS, data),
@@ -44,14 +65,138 @@ const usersApi = {
     apiClient.delete(API_ENDPOINTS.AUTH.USER_DETAIL(id)),
 }
 
+/**
+ * Apply a delta to the cached list: rebuild the page from page_ids, the
+ * server's order (its database collation, which string comparison here
+ * can't reproduce), taking changed users from the delta and the rest from
+ * the cache, and take the new cursor. Returns null when the page needs a
+ * user we don't have, one that moved up from a later page: fetch it again.
+ */
+export function mergeUserChanges(snapshot: UsersSnapshot, delta: UsersDelta): UsersSnapshot | null {
+  const byId = new Map(snapshot.results.map(user => [user.id, user]))
+  delta.results.forEach(user => byId.set(user.id, user))
+  const results = delta.page_ids.map(id => byId.get(id))
+  if (results.some(user => user === undefined)) return null
+  return {
+    ...snapshot,
+    count: delta.count,
+    results: results as UserListItem[],
+    sync_cursor: delta.sync_cursor,
+  }
+}
+
+/**
+ * Apply one pushed event to the cached list where that can't change the
+ * order: an update to a user on the page that keeps its username, or a
+ * deletion from a list we hold all of. Safe to repeat, since our own
+ * mutations also reach the cache through syncUsers. Returns null when
+ * placing the change needs the server's order: sync the changes then.
+ */
+export function applyUserEvent(snapshot: UsersSnapshot, event: UserEvent): UsersSnapshot | null {
+  const complete = snapshot.count <= snapshot.results.length
+  if (event.type === 'deleted') {
+    const known = snapshot.results.some(user => user.id === event.id)
+    if (!complete) return null
+    if (!known) return snapshot
+    return {
+      ...snapshot,
+      count: snapshot.count - 1,
+      results: snapshot.results.filter(user => user.id !== event.id),
+    }
+  }
+  const index = snapshot.results.findIndex(user => user.id === event.user.id)
+  if (index === -1 || snapshot.results[index].username !== event.user.username) return null
+  const results = [...snapshot.results]
+  results[index] = event.user
+  return { ...snapshot, results }
+}
+
+/**
+ * Bring the cached user list up to date by fetching only what changed.
+ * Falls back to a full reload without a cursor, or when the server refuses
+ * it (410 Gone once deletions that old are forgotten).
+ */
+export async function syncUsers(queryClient: QueryClient) {
+  const snapshot = queryClient.getQueryData<UsersSnapshot>(QUERY_KEYS.USERS)
+  if (!snapshot?.sync_cursor) {
+    return queryClient.invalidateQueries({ queryKey: QUERY_KEYS.USERS })
+  }
+  try {
+    const delta = await usersApi.getUserChanges(snapshot.sync_cursor)
+    const current = queryClient.getQueryData<UsersSnapshot>(QUERY_KEYS.USERS)
+    if (!current) return
+    const merged = mergeUserChanges(current, delta)
+    if (merged === null) {
+      return queryClient.invalidateQueries({ queryKey: QUERY_KEYS.USERS })
+    }
+    queryClient.setQueryData<UsersSnapshot>(QUERY_KEYS.USERS, merged)
+  } catch {
+    return queryClient.invalidateQueries({ queryKey: QUERY_KEYS.USERS })
+  }
+}
+
 // React Query hooks
 export const useUsers = () => {
   return useQuery({
     queryKey: QUERY_KEYS.USERS,
     queryFn: usersApi.getUsers,
+    // Components get the array; the cache keeps the cursor alongside it
+    select: (snapshot: UsersSnapshot) => snapshot.results || [],
   })
 }
 
-export const useUpdateUser = createMutation(usersApi.updateUser, { invalidates: QUERY_KEYS.USERS })
-export const useCreateUser = createMutation(usersApi.createUser, { invalidates: QUERY_KEYS.USERS })
-export const useDeleteUser = createMutation(usersApi.deleteUser, { invalidates: QUERY_KEYS.USERS })
+/**
+ * Keep the cached user list live while mounted: apply changes other admins
+ * make as the server pushes them, delta-syncing for those that need the
+ * server's order, and after a reconnect to pick up anything missed. Without
+ * the ASGI server the stream is refused and the list simply refreshes as
+ * before.
+ */
+export const useUserEvents = (enabled = true) => {
+  const queryClient = useQueryClient()
+
+  useEffect(() => {
+    if (!enabled || typeof EventSource === 'undefined') return
+
+    const source = new EventSource(`/api${API_ENDPOINTS.AUTH.USER_EVENTS}`, { withCredentials: true })
+    let connected = false
+    // One delta sync at a time; events arriving meanwhile ask for one more
+    let syncing = false
+    let again = false
+    const sync = async () => {
+      if (syncing) {
+        again = true
+        return
+      }
+      syncing = true
+      try {
+        do {
+          again = false
+          await syncUsers(queryClient)
+        } while (again)
+      } finally {
+        syncing = false
+      }
+    }
+    source.onopen = () => {
+      if (connected) void sync()
+      connected = true
+    }
+    source.onmessage = (message: MessageEvent<string>) => {
+      const event = JSON.parse(message.data) as UserEvent
+      const current = queryClient.getQueryData<UsersSnapshot>(QUERY_KEYS.USERS)
+      if (!current) return
+      const applied = applyUserEvent(current, event)
+      if (applied === null) {
+        void sync()
+      } else {
+        queryClient.setQueryData<UsersSnapshot>(QUERY_KEYS.USERS, applied)
+      }
+    }
+    return () => source.close()
+  }, [enabled, queryClient])
+}
+
+export const useUpdateUser = createMutation(usersApi.updateUser, { refresh: syncUsers })
+export const useCreateUser = createMutation(usersApi.createUser, { refresh: syncUsers })
+export const useDeleteUser = createMutation(usersApi.deleteUser, { refresh: syncUsers })
@@ -1,5 +1,5 @@
 import { useState } from 'react'
-import { useUsers, useUpdateUser, useDeleteUser, type UserListItem } from '@/api/users'
+import { useUsers, useUserEvents, useUpdateUser, useDeleteUser, type UserListItem } from '@/api/users'
 import { useAuth } from '@/hooks/useAuth'
 import { formatTimeAgo } from '@/utils/date'
 import Card from '@/components/Card'
@@ -30,6 +30,9 @@ export default function ManageUsersPage() {
   // Check if current user is admin
   const isAdmin = currentUser?.is_staff || currentUser?.is_superuser
 
+  // Apply other admins' changes as they happen instead of polling
+  useUserEvents(Boolean(isAdmin))
+
   if (!isAdmin) {
     return (
       <PageLayout>
@@ -14,6 +14,9 @@ declare global {
       debug: boolean
       authMethod: 'email' | 'saml'
       csrfToken: string
+      // Startup data embedded by Django's ReactAppView (absent on the Vite dev server)
+      authConfig?: import('./api/auth').AuthConfig
+      currentUser?: import('./api/auth').User | null
     }
   }
 }
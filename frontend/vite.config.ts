@@ -1,9 +1,33 @@
-import { defineConfig } from 'vite'
+import { defineConfig, type Plugin } from 'vite'
 import react from '@vitejs/plugin-react'
+import fs from 'fs'
 import path from 'path'
+import { brotliCompressSync, constants, gzipSync } from 'zlib'
+
+// Write .br and .gz next to each hashed asset at maximum quality; Django's
+// static storage keeps them as-is and WhiteNoise serves them directly
+function precompress(): Plugin {
+  return {
+    name: 'precompress',
+    apply: 'build',
+    writeBundle(options, bundle) {
+      for (const fileName of Object.keys(bundle)) {
+        if (!fileName.startsWith('assets/') || !/\.(js|css|svg|json)$/.test(fileName)) continue
+        const file = path.join(options.dir!, fileName)
+        const content = fs.readFileSync(file)
+        if (content.length < 1024) continue
+        fs.writeFileSync(
+          `${file}.br`,
+          brotliCompressSync(content, { params: { [constants.BROTLI_PARAM_QUALITY]: 11 } }),
+        )
+        fs.writeFileSync(`${file}.gz`, gzipSync(content, { level: 9 }))
+      }
+    },
+  }
+}
 
 export default defineConfig({
-  plugins: [react()],
+  plugins: [react(), precompress()],
   clearScreen: false,
   resolve: {
     alias: {
@@ -41,6 +65,9 @@ export default defineConfig({
     outDir: 'dist',
     assetsDir: 'assets',
     emptyOutDir: true,
+    // dist/manifest.json maps entries to hashed chunks for Django's vite_assets tags
+    // (not the default .vite/ directory, which collectstatic ignores)
+    manifest: 'manifest.json',
     rollupOptions: {
       output: {
         manualChunks: {